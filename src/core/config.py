@@ -184,6 +184,10 @@ class PerformanceConfig(BaseModel):
         le=1024, 
         description="解析缓存大小(MB)"
     )
+    meta_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Meta解析缓存文件目录，为空时不启用"
+    )
 
     @field_validator('max_workers')
     @classmethod
@@ -17,7 +17,7 @@ from pathlib import Path
 
 from ..models.asset import Asset, AssetType
 from ..models.dependency import Dependency, DependencyType, DependencyStrength
-from ..utils.file_watcher import FileChangeDetector
+from ..utils.file_watcher import FileChangeDetector, FileChanges
 
 
 logger = logging.getLogger(__name__)
@@ -41,6 +41,14 @@ class UpdateStatus(Enum):
     ROLLED_BACK = "rolled_back"
 
 
+class UpdateErrorCode(Enum):
+    """更新失败原因"""
+    CONFLICT = "conflict"
+    CIRCULAR_DEPENDENCY = "circular_dependency"
+    EXECUTION_FAILED = "execution_failed"
+    EXCEPTION = "exception"
+
+
 @dataclass
 class UpdateOperation:
     """更新操作记录"""
@@ -52,6 +60,7 @@ class UpdateOperation:
     timestamp: datetime = field(default_factory=datetime.utcnow)
     status: UpdateStatus = UpdateStatus.PENDING
     error_message: Optional[str] = None
+    error_code: Optional[UpdateErrorCode] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -63,7 +72,8 @@ class UpdateOperation:
             'old_data': self.old_data,
             'timestamp': self.timestamp.isoformat(),
             'status': self.status.value,
-            'error_message': self.error_message
+            'error_message': self.error_message,
+            'error_code': self.error_code.value if self.error_code else None
         }
 
 
@@ -149,7 +159,15 @@ class GraphUpdateManager:
         self._current_transaction: Optional[BatchUpdateTransaction] = None
         
         # 性能统计
-        self.stats = {
+        self.stats = self._new_stats()
+        
+        # 注册默认的冲突检测器
+        self._register_default_conflict_detectors()
+    
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        """创建初始的统计信息字典"""
+        return {
             'total_operations': 0,
             'successful_operations': 0,
             'failed_operations': 0,
@@ -157,9 +175,6 @@ class GraphUpdateManager:
             'conflicts_detected': 0,
             'cache_invalidations': 0
         }
-        
-        # 注册默认的冲突检测器
-        self._register_default_conflict_detectors()
     
     def _register_default_conflict_detectors(self):
         """注册默认的冲突检测器"""
@@ -433,6 +448,10 @@ class GraphUpdateManager:
                 conflicts = self._detect_conflicts([operation])
                 if conflicts:
                     operation.status = UpdateStatus.FAILED
+                    if any(c.conflict_type == ConflictType.CIRCULAR_DEPENDENCY for c in conflicts):
+                        operation.error_code = UpdateErrorCode.CIRCULAR_DEPENDENCY
+                    else:
+                        operation.error_code = UpdateErrorCode.CONFLICT
                     operation.error_message = f"检测到冲突: {[c.description for c in conflicts]}"
                     self.logger.warning(f"操作 {operation.operation_id} 失败: {operation.error_message}")
                     self.stats['conflicts_detected'] += len(conflicts)
@@ -458,6 +477,7 @@ class GraphUpdateManager:
                 self.logger.debug(f"操作 {operation.operation_id} 成功应用")
             else:
                 operation.status = UpdateStatus.FAILED
+                operation.error_code = UpdateErrorCode.EXECUTION_FAILED
                 operation.error_message = "操作执行失败"
                 self.stats['failed_operations'] += 1
                 self.logger.warning(f"操作 {operation.operation_id} 执行失败")
@@ -467,6 +487,7 @@ class GraphUpdateManager:
             
         except Exception as e:
             operation.status = UpdateStatus.FAILED
+            operation.error_code = UpdateErrorCode.EXCEPTION
             operation.error_message = str(e)
             self.stats['failed_operations'] += 1
             self.stats['total_operations'] += 1
@@ -983,6 +1004,16 @@ class GraphUpdateManager:
                 self.transaction_history = self.transaction_history[-keep_recent:]
         
         self.logger.info(f"历史记录已清理，保留最近 {keep_recent} 条记录")
+    
+    def reset(self):
+        """重置更新历史、事务历史和统计信息
+        
+        直接替换为新的容器，不逐条清理。
+        """
+        with self._lock:
+            self.update_history = []
+            self.transaction_history = []
+            self.stats = self._new_stats()
 
 
 class FileChangeGraphUpdater:
@@ -1004,6 +1035,9 @@ class FileChangeGraphUpdater:
         self.file_change_detector = file_change_detector
         self.logger = logging.getLogger(__name__)
         
+        # Meta解析器在首次解析时创建，之后所有文件复用同一个实例和缓存
+        self._meta_parser = None
+        
         # 文件变更处理器映射
         self.change_handlers = {
             'new': self._handle_new_files,
@@ -1018,18 +1052,26 @@ class FileChangeGraphUpdater:
             'failed_updates': 0
         }
     
-    def process_file_changes(self, changes: Dict[str, List[Path]]) -> Dict[str, Any]:
+    def process_file_changes(self, 
+                             changes: Union[FileChanges, Dict[str, List[Path]]]) -> Dict[str, Any]:
         """处理文件变更
         
         Args:
-            changes: 文件变更信息，包含'new'、'modified'、'deleted'键
+            changes: 文件变更信息，FileChanges或包含'new'、'modified'、'deleted'键的字典
             
         Returns:
             Dict[str, Any]: 处理结果统计
         """
-        self.logger.info(f"开始处理文件变更: 新增 {len(changes.get('new', []))} 个，"
-                        f"修改 {len(changes.get('modified', []))} 个，"
-                        f"删除 {len(changes.get('deleted', []))} 个文件")
+        # 字典按调用方给出的键顺序处理，FileChanges按字段顺序处理
+        if isinstance(changes, FileChanges):
+            change_items = list(zip(FileChanges._fields, changes))
+        else:
+            change_items = list(changes.items())
+            changes = FileChanges.from_dict(changes)
+        
+        self.logger.info(f"开始处理文件变更: 新增 {len(changes.new)} 个，"
+                        f"修改 {len(changes.modified)} 个，"
+                        f"删除 {len(changes.deleted)} 个文件")
         
         results = {
             'new': {'processed': 0, 'successful': 0, 'failed': 0},
@@ -1040,13 +1082,14 @@ class FileChangeGraphUpdater:
         # 使用批量更新处理所有变更
         try:
             with self.update_manager.batch_update() as batch:
-                for change_type, file_paths in changes.items():
-                    if change_type in self.change_handlers:
-                        handler_results = self.change_handlers[change_type](file_paths, batch)
-                        results[change_type] = handler_results
-                        self.processing_stats['processed_changes'] += handler_results['processed']
-                        self.processing_stats['successful_updates'] += handler_results['successful']
-                        self.processing_stats['failed_updates'] += handler_results['failed']
+                for change_type, file_paths in change_items:
+                    if change_type not in self.change_handlers:
+                        continue
+                    handler_results = self.change_handlers[change_type](file_paths, batch)
+                    results[change_type] = handler_results
+                    self.processing_stats['processed_changes'] += handler_results['processed']
+                    self.processing_stats['successful_updates'] += handler_results['successful']
+                    self.processing_stats['failed_updates'] += handler_results['failed']
             
             self.logger.info("文件变更处理完成")
             
@@ -1165,6 +1208,18 @@ class FileChangeGraphUpdater:
         
         return {'processed': processed, 'successful': successful, 'failed': failed}
     
+    def _get_meta_parser(self):
+        """获取Meta解析器，首次调用时按performance.meta_cache_dir配置创建
+        
+        Returns:
+            MetaParser: 复用的Meta解析器实例
+        """
+        if self._meta_parser is None:
+            from ..parsers.meta_parser import MetaParser
+            from .config import get_config
+            self._meta_parser = MetaParser(cache_dir=get_config().performance.meta_cache_dir)
+        return self._meta_parser
+    
     def _parse_asset_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """解析资源文件
         
@@ -1180,18 +1235,16 @@ class FileChangeGraphUpdater:
             
             if file_path.suffix == '.meta':
                 # 解析.meta文件
-                from ..parsers.meta_parser import MetaParser
-                parser = MetaParser()
-                meta_data = parser.parse_file(file_path)
+                result = self._get_meta_parser().parse(file_path)
                 
-                if meta_data and meta_data.guid:
+                if result.is_success and result.guid:
                     return {
-                        'guid': meta_data.guid,
+                        'guid': result.guid,
                         'data': {
-                            'asset_type': meta_data.asset_type,
+                            'asset_type': result.asset_type,
                             'file_path': str(file_path),
-                            'file_id': meta_data.file_id,
-                            'import_settings': meta_data.import_settings
+                            'importer_type': result.data['importer_type'],
+                            'import_settings': result.data['importer_data']
                         },
                         'dependencies': []  # Meta文件通常不包含依赖信息
                     }
@@ -0,0 +1,57 @@
+"""Prefab/Scene文件GUID引用扫描内核
+
+在原始字节缓冲区（bytes、mmap、memoryview）上查找
+"{fileID: <id>, guid: <32位十六进制>, type: <n>}" 形式的引用，
+不构建YAML文档，也不把文件解码为Python字符串。
+"""
+
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Pattern, Set, Union
+
+# Unity YAML中内联引用的GUID，形式与PrefabParser解析引用时一致，不区分大小写
+GUID_REF_RE = re.compile(
+    rb'\{fileID:\s*-?\d+,\s*guid:\s*([0-9a-f]{32}),\s*type:\s*\d+\}',
+    re.IGNORECASE
+)
+
+# 全零GUID表示文件内部引用
+NULL_GUID = b'0' * 32
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def find_guids(buf: Buffer, pattern: Pattern[bytes] = GUID_REF_RE) -> Set[bytes]:
+    """扫描缓冲区中引用的全部GUID
+    
+    findall只返回捕获组，循环完全在正则引擎的C代码中完成，
+    不会为每个匹配创建Match对象。
+    
+    Args:
+        buf: 文件内容缓冲区
+        pattern: 以第一个捕获组匹配GUID的字节模式，默认匹配所有GUID引用
+        
+    Returns:
+        GUID字节串集合（包含全零GUID，由调用方决定是否过滤）
+    """
+    return set(pattern.findall(buf))
+
+
+def scan_file(file_path: Path, pattern: Pattern[bytes] = GUID_REF_RE) -> Set[bytes]:
+    """通过mmap扫描文件中的GUID引用
+    
+    Args:
+        file_path: 文件路径
+        pattern: 以第一个捕获组匹配GUID的字节模式，默认匹配所有GUID引用
+        
+    Returns:
+        GUID字节串集合
+    """
+    with open(file_path, 'rb') as file:
+        # 空文件无法映射
+        if os.fstat(file.fileno()).st_size == 0:
+            return set()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return find_guids(mapped, pattern)
@@ -4,15 +4,81 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Type, Callable
 from pathlib import Path
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import logging
+import multiprocessing
+import os
+import pickle
 from enum import Enum
 import re
 
 logger = logging.getLogger(__name__)
 
+# 工作进程内复用的解析器实例，由_init_batch_worker创建
+_worker_parser: Optional['BaseParser'] = None
+
+
+def _init_batch_worker(parser_class: Type['BaseParser'], init_kwargs: Dict[str, Any]) -> None:
+    """进程池初始化函数：每个工作进程只创建一次解析器"""
+    global _worker_parser
+    _worker_parser = parser_class(**init_kwargs)
+
+
+def _parse_in_worker(file_path: Path) -> 'ParseResult':
+    """在工作进程中解析单个文件"""
+    return _worker_parser._parse_one(file_path)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """批量解析进程池的启动方式
+    
+    调用方进程可能持有监视线程和锁（如GraphUpdateManager），fork会把
+    锁的状态复制到子进程中，可能导致死锁。因此使用forkserver（不支持时
+    使用spawn），工作进程从干净的解释器启动。
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def cached_parse(
+    parse_method: Callable[['BaseParser', Path], 'ParseResult']
+) -> Callable[..., 'ParseResult']:
+    """解析结果缓存装饰器
+    
+    以(绝对路径, mtime_ns, 文件大小)为键缓存成功的解析结果，文件被修改后
+    键自然失效。被装饰的parse方法增加use_cache参数，传入False时跳过缓存，
+    也不计算缓存键。
+    
+    缓存中保存的是结果的pickle快照，每次命中都反序列化出独立的副本，
+    调用方修改返回的data、warnings等不会影响缓存和后续的解析结果。
+    反序列化比copy.deepcopy快数倍，结果本身也要能pickle才能从进程池传回。
+    """
+    @functools.wraps(parse_method)
+    def wrapper(self: 'BaseParser', file_path: Path, use_cache: bool = True) -> 'ParseResult':
+        if not use_cache:
+            return parse_method(self, file_path)
+        
+        key = self._parse_cache_key(file_path)
+        if key is None:
+            return parse_method(self, file_path)
+        
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            return pickle.loads(cached)
+        
+        result = parse_method(self, file_path)
+        self._store_cached_result(key, result)
+        return result
+    
+    # 批量解析据此判断工作进程的结果是否写回缓存
+    wrapper.uses_parse_cache = True
+    return wrapper
+
 
 class ParseResultType(Enum):
     """解析结果类型枚举"""
@@ -78,6 +144,18 @@ class BaseParser(ABC):
     定义所有解析器必须实现的通用接口。
     """
     
+    # 是否默认使用多进程批量解析。进程池需要显式开启：子类覆盖该属性，
+    # 或调用parse_batch时传入parallel=True
+    PARALLEL_BATCH = False
+    
+    # 开启多进程且非严格模式时，未命中缓存的文件数超过该阈值（至少两个）、
+    # 且总大小不小于PARALLEL_BATCH_MIN_BYTES时才使用进程池
+    PARALLEL_BATCH_THRESHOLD = 64
+    PARALLEL_BATCH_MIN_BYTES = 0
+    
+    # 解析结果缓存的最大条目数
+    PARSE_CACHE_SIZE = 4096
+    
     def __init__(self, strict_mode: bool = False):
         """初始化解析器
         
@@ -86,6 +164,7 @@ class BaseParser(ABC):
         """
         self.strict_mode = strict_mode
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._parse_cache: Dict[Tuple[str, int, int], bytes] = {}
     
     @abstractmethod
     def can_parse(self, file_path: Path) -> bool:
@@ -209,15 +288,38 @@ class BaseParser(ABC):
             error_message=reason
         )
     
-    def parse_batch(self, file_paths: List[Path]) -> List[ParseResult]:
+    def parse_batch(
+        self,
+        file_paths: List[Path],
+        strict: Optional[bool] = None,
+        parallel: Optional[bool] = None
+    ) -> List[ParseResult]:
         """批量解析文件
         
         Args:
             file_paths: 文件路径列表
+            strict: 本次批量解析是否遇错即停，None时使用解析器的strict_mode
+            parallel: 本次批量解析是否允许使用进程池，None时使用PARALLEL_BATCH
             
         Returns:
             解析结果列表
         """
+        file_paths = list(file_paths)
+        if strict is None:
+            strict = self.strict_mode
+        if parallel is None:
+            parallel = self.PARALLEL_BATCH
+        
+        # 严格模式需要遇错即停，只能串行解析：解析器处于严格模式时，即使本次
+        # 传入strict=False也不使用进程池。已经在子进程中时不再嵌套进程池
+        if (parallel and not strict and not self.strict_mode
+                and len(file_paths) > max(self.PARALLEL_BATCH_THRESHOLD, 1)
+                and multiprocessing.parent_process() is None):
+            try:
+                return self._parse_batch_parallel(file_paths)
+            except Exception as e:
+                self.logger.warning(f"多进程批量解析失败，回退到串行解析: {e}")
+        
         results = []
         for file_path in file_paths:
             try:
@@ -227,11 +329,128 @@ class BaseParser(ABC):
                 self.logger.error(f"解析文件时发生异常 {file_path}: {e}")
                 results.append(self.create_failed_result(file_path, str(e)))
                 
-                if self.strict_mode:
+                if strict:
                     break
                     
         return results
     
+    def _parse_batch_parallel(self, file_paths: List[Path]) -> List[ParseResult]:
+        """使用进程池并行解析文件，结果顺序与输入一致
+        
+        缓存命中的文件在当前进程直接取结果，只有未命中的文件交给进程池，
+        工作进程的结果再写回当前进程的缓存。未命中的文件数不超过
+        PARALLEL_BATCH_THRESHOLD或总大小小于PARALLEL_BATCH_MIN_BYTES时，
+        进程池的启动开销抵不上并行的收益，直接在当前进程串行解析。
+        只有一个文件未命中时总是串行解析。
+        
+        Args:
+            file_paths: 文件路径列表
+            
+        Returns:
+            解析结果列表
+        """
+        results: List[Optional[ParseResult]] = [None] * len(file_paths)
+        
+        # (结果下标, 文件路径, 缓存键)
+        misses = []
+        for index, file_path in enumerate(file_paths):
+            key = self._parse_cache_key(file_path)
+            cached = self._parse_cache.get(key) if key is not None else None
+            if cached is not None:
+                results[index] = pickle.loads(cached)
+            else:
+                misses.append((index, file_path, key))
+        
+        miss_bytes = sum(key[2] for _, _, key in misses if key is not None)
+        if (len(misses) <= max(self.PARALLEL_BATCH_THRESHOLD, 1)
+                or miss_bytes < self.PARALLEL_BATCH_MIN_BYTES):
+            for index, file_path, _ in misses:
+                results[index] = self._parse_one(file_path)
+            return results
+        
+        workers = min(os.cpu_count() or 1, len(misses))
+        chunksize = max(1, len(misses) // (4 * workers))
+        store = getattr(type(self).parse, 'uses_parse_cache', False)
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_pool_context(),
+            initializer=_init_batch_worker,
+            initargs=(type(self), self._worker_init_kwargs())
+        ) as executor:
+            parsed = executor.map(
+                _parse_in_worker, [file_path for _, file_path, _ in misses], chunksize=chunksize
+            )
+            for (index, _, key), result in zip(misses, parsed):
+                if store and key is not None:
+                    self._store_cached_result(key, result)
+                results[index] = result
+        return results
+    
+    def _worker_init_kwargs(self) -> Dict[str, Any]:
+        """获取在工作进程中重建解析器所需的构造参数
+        
+        Returns:
+            构造参数字典，子类有额外构造参数时需要覆盖
+        """
+        return {"strict_mode": self.strict_mode}
+    
+    def _parse_one(self, file_path: Path) -> ParseResult:
+        """解析单个文件，异常转换为失败结果
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            解析结果
+        """
+        try:
+            return self.parse(file_path)
+        except Exception as e:
+            self.logger.error(f"解析文件时发生异常 {file_path}: {e}")
+            return self.create_failed_result(file_path, str(e))
+    
+    def _parse_cache_key(self, file_path: Path) -> Optional[Tuple[str, int, int]]:
+        """计算解析缓存键
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            (绝对路径, mtime_ns, 文件大小)元组，文件无法访问时返回None
+        """
+        # 只做一次stat；绝对路径由字符串拼接得到，不像resolve()那样逐级访问文件系统
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _store_cached_result(self, key: Tuple[str, int, int], result: ParseResult) -> None:
+        """把成功的解析结果以pickle快照写入缓存
+        
+        Args:
+            key: _parse_cache_key计算的缓存键
+            result: 解析结果，失败或跳过的结果不缓存
+        """
+        if not result.is_success:
+            return
+        
+        try:
+            snapshot = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.debug(f"解析结果无法序列化，不写入缓存 {result.file_path}: {e}")
+            return
+        
+        if len(self._parse_cache) >= self.PARSE_CACHE_SIZE:
+            # 淘汰最早写入的条目
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[key] = snapshot
+    
+    def clear_cache(self) -> None:
+        """清空解析结果缓存"""
+        self._parse_cache.clear()
+    
     def get_parser_info(self) -> Dict[str, Any]:
         """获取解析器信息
         
@@ -3,17 +3,33 @@
 专门处理Unity .meta文件的解析，提取GUID信息和各种导入设置。
 """
 
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, IO, Tuple, Union
 from pathlib import Path
+import hashlib
+import pickle
 import re
 import logging
 from enum import Enum
+from dataclasses import dataclass
+from functools import lru_cache
 
-from .base_parser import BaseParser, ParseResult, ParseResultType
+from .base_parser import BaseParser, ParseResult, ParseResultType, cached_parse
 from ..utils.yaml_utils import YAMLParser
 
 logger = logging.getLogger(__name__)
 
+# GUID格式验证正则表达式（32位十六进制字符），模块级编译一次供所有解析器实例复用
+_GUID_RE = re.compile(r'^[0-9a-fA-F]{32}$')
+
+# 在文件头部字节中定位guid行，供extract_guid_only快速路径使用
+_GUID_LINE_RE = re.compile(rb'^guid:[ \t]*([0-9a-fA-F]{32})[ \t]*\r?$', re.M)
+
+# guid字段位于Unity Meta文件的前几行，快速路径只读取这么多字节
+_GUID_HEAD_BYTES = 512
+
+# 解析缓存文件格式版本，缓存内容结构变化时递增
+_CACHE_FORMAT_VERSION = 2
+
 
 class ImporterType(Enum):
     """Unity导入器类型枚举"""
@@ -37,32 +53,72 @@ class ImporterType(Enum):
     @classmethod
     def from_string(cls, importer_str: str) -> 'ImporterType':
         """从字符串创建导入器类型"""
-        for importer_type in cls:
-            if importer_type.value == importer_str:
-                return importer_type
-        return cls.UNKNOWN
+        return _IMPORTER_TYPES_BY_VALUE.get(importer_str, cls.UNKNOWN)
+
+
+# 导入器类型值到枚举成员的映射，from_string时O(1)查找
+_IMPORTER_TYPES_BY_VALUE = {importer_type.value: importer_type for importer_type in ImporterType}
+
+# 已知导入器字段名集合（不含UNKNOWN），supported_importers的默认值
+_IMPORTER_KEYS = frozenset(
+    value for value, importer_type in _IMPORTER_TYPES_BY_VALUE.items()
+    if importer_type != ImporterType.UNKNOWN
+)
+
+# _scan_fields的结果：(导入器类型, 导入器数据, 未知字段列表)
+_FieldScan = Tuple[ImporterType, Dict[str, Any], List[str]]
+
+# 导入器之外的已知Meta字段
+_KNOWN_META_FIELDS = frozenset({
+    'fileFormatVersion', 'guid', 'userData',
+    'assetBundleName', 'assetBundleVariant'
+})
+
+
+@lru_cache(maxsize=1024)
+def _warnings_for_signature(
+    signature: Tuple[ImporterType, Any, bool, Tuple[Any, ...]]
+) -> Tuple[str, ...]:
+    """根据结构签名生成警告信息
+    
+    Args:
+        signature: (导入器类型, 文件格式版本, 导入器数据是否非空, 未知字段)
+        
+    Returns:
+        警告信息元组
+    """
+    importer_type, file_format_version, has_importer_data, unknown_fields = signature
+    warnings = []
+    
+    # 检查未知导入器类型
+    if importer_type == ImporterType.UNKNOWN:
+        warnings.append("未能识别导入器类型")
+    
+    # 检查空的导入器数据
+    if not has_importer_data:
+        warnings.append("导入器数据为空")
+    
+    # 检查旧版本文件格式
+    if file_format_version < 2:
+        warnings.append(f"文件格式版本较旧: {file_format_version}")
+    
+    # 检查是否有未处理的字段
+    if unknown_fields:
+        warnings.append(f"发现未知字段: {', '.join(unknown_fields)}")
+    
+    return tuple(warnings)
 
 
+@dataclass(slots=True)
 class MetaFileInfo:
     """Meta文件信息类"""
-    
-    def __init__(
-        self,
-        guid: str,
-        file_format_version: int,
-        importer_type: ImporterType,
-        importer_data: Dict[str, Any],
-        user_data: Optional[str] = None,
-        asset_bundle_name: Optional[str] = None,
-        asset_bundle_variant: Optional[str] = None
-    ):
-        self.guid = guid
-        self.file_format_version = file_format_version
-        self.importer_type = importer_type
-        self.importer_data = importer_data
-        self.user_data = user_data
-        self.asset_bundle_name = asset_bundle_name
-        self.asset_bundle_variant = asset_bundle_variant
+    guid: str
+    file_format_version: int
+    importer_type: ImporterType
+    importer_data: Dict[str, Any]
+    user_data: Optional[str] = None
+    asset_bundle_name: Optional[str] = None
+    asset_bundle_variant: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -101,25 +157,25 @@ class MetaParser(BaseParser):
     """Unity Meta文件解析器"""
     
     # GUID格式验证正则表达式（32位十六进制字符）
-    GUID_PATTERN = re.compile(r'^[0-9a-fA-F]{32}$')
+    GUID_PATTERN = _GUID_RE
     
     # 必需的Meta文件字段
     REQUIRED_FIELDS = ['fileFormatVersion', 'guid']
     
-    def __init__(self, strict_mode: bool = False):
+    def __init__(self, strict_mode: bool = False, cache_dir: Optional[Union[str, Path]] = None):
         """初始化Meta解析器
         
         Args:
             strict_mode: 严格模式，遇到错误时立即失败
+            cache_dir: 解析缓存文件目录，为None或空字符串时不读写缓存文件
         """
         super().__init__(strict_mode)
-        self.yaml_parser = YAMLParser(preserve_quotes=True)
+        # Meta文件只读不写回，不需要保持引号，使用libyaml后端
+        self.yaml_parser = YAMLParser(preserve_quotes=False)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         
-        # 支持的导入器类型
-        self.supported_importers: Set[str] = {
-            importer_type.value for importer_type in ImporterType 
-            if importer_type != ImporterType.UNKNOWN
-        }
+        # 支持的导入器类型，_scan_fields据此识别导入器字段
+        self.supported_importers: Set[str] = set(_IMPORTER_KEYS)
     
     def can_parse(self, file_path: Path) -> bool:
         """判断是否可以解析指定文件
@@ -143,6 +199,7 @@ class MetaParser(BaseParser):
         """
         return ['.meta']
     
+    @cached_parse
     def parse(self, file_path: Path) -> ParseResult:
         """解析Meta文件
         
@@ -155,36 +212,16 @@ class MetaParser(BaseParser):
         if not self.can_parse(file_path):
             return self.create_skipped_result(file_path, "不支持的文件类型或文件不存在")
         
+        cached = self._load_cache_file(file_path)
+        if cached is not None:
+            return cached
+        
         try:
             # 加载YAML数据
             yaml_data = self.yaml_parser.load_from_file(file_path)
-            if yaml_data is None:
-                return self.create_failed_result(file_path, "无法解析YAML内容")
-            
-            # 验证必需字段
-            validation_result = self._validate_meta_structure(yaml_data)
-            if not validation_result[0]:
-                return self.create_failed_result(file_path, validation_result[1])
-            
-            # 解析Meta信息
-            meta_info = self._parse_meta_info(yaml_data)
-            if meta_info is None:
-                return self.create_failed_result(file_path, "无法解析Meta信息")
-            
-            # 创建成功结果
-            result = self.create_success_result(
-                file_path=file_path,
-                guid=meta_info.guid,
-                asset_type=meta_info.get_asset_type(),
-                data=meta_info.to_dict()
-            )
-            
-            # 添加警告信息
-            warnings = self._check_potential_issues(meta_info, yaml_data)
-            for warning in warnings:
-                result.add_warning(warning)
-            
-            self.logger.debug(f"成功解析Meta文件: {file_path}, GUID: {meta_info.guid}")
+            result = self._parse_yaml_data(yaml_data, file_path)
+            if result.is_success:
+                self._store_cache_file(file_path, result)
             return result
             
         except Exception as e:
@@ -192,6 +229,152 @@ class MetaParser(BaseParser):
             self.logger.error(f"{error_msg} - 文件: {file_path}")
             return self.create_failed_result(file_path, error_msg)
     
+    def parse_stream(self, stream: IO[str], virtual_name: str = '<memory>') -> ParseResult:
+        """从文件对象解析Meta内容
+        
+        不访问文件系统，也不做扩展名检查，适合内存中的数据。
+        
+        Args:
+            stream: 可读的文本文件对象
+            virtual_name: 写入解析结果file_path的名称
+            
+        Returns:
+            解析结果
+        """
+        try:
+            yaml_data = self.yaml_parser.load_from_string(stream.read())
+            return self._parse_yaml_data(yaml_data, virtual_name)
+            
+        except Exception as e:
+            error_msg = f"解析Meta文件时发生异常: {e}"
+            self.logger.error(f"{error_msg} - 文件: {virtual_name}")
+            return self.create_failed_result(virtual_name, error_msg)
+    
+    def _parse_yaml_data(self, yaml_data: Optional[Dict[str, Any]], source: Union[Path, str]) -> ParseResult:
+        """从已加载的YAML数据构建解析结果
+        
+        Args:
+            yaml_data: YAML解析后的数据
+            source: 数据来源（文件路径或虚拟名称）
+            
+        Returns:
+            解析结果
+        """
+        if yaml_data is None:
+            return self.create_failed_result(source, "无法解析YAML内容")
+        
+        # 验证必需字段
+        validation_result = self._validate_meta_structure(yaml_data)
+        if not validation_result[0]:
+            return self.create_failed_result(source, validation_result[1])
+        
+        # 一次遍历字段，同时检测导入器和收集未知字段，结果供后续步骤共用
+        scan = self._scan_fields(yaml_data)
+        importer_type, importer_data = self._detect_importer_type(yaml_data, scan)
+        
+        # 解析Meta信息
+        meta_info = self._build_meta_info(yaml_data, importer_type, importer_data)
+        if meta_info is None:
+            return self.create_failed_result(source, "无法解析Meta信息")
+        
+        # 创建成功结果
+        result = self.create_success_result(
+            file_path=source,
+            guid=meta_info.guid,
+            asset_type=meta_info.get_asset_type(),
+            data=meta_info.to_dict()
+        )
+        
+        # 添加警告信息
+        warnings = self._check_potential_issues(meta_info, yaml_data, scan)
+        for warning in warnings:
+            result.add_warning(warning)
+        
+        self.logger.debug(f"成功解析Meta文件: {source}, GUID: {meta_info.guid}")
+        return result
+    
+    def _worker_init_kwargs(self) -> Dict[str, Any]:
+        """获取在工作进程中重建解析器所需的构造参数"""
+        kwargs = super()._worker_init_kwargs()
+        kwargs["cache_dir"] = self.cache_dir
+        return kwargs
+    
+    def _cache_file_path(self, file_path: Path) -> Path:
+        """获取Meta文件对应的缓存文件路径
+        
+        缓存文件放在独立目录中，避免在Assets下产生会被Unity导入的文件。
+        """
+        digest = hashlib.sha1(str(file_path.resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.pickle"
+    
+    def _load_cache_file(self, file_path: Path) -> Optional[ParseResult]:
+        """读取仍然有效的解析缓存文件
+        
+        缓存使用pickle格式，ModelImporter中的整数键、日期等值都能原样还原，
+        命中缓存与重新解析得到的数据一致。
+        
+        Args:
+            file_path: Meta文件路径
+            
+        Returns:
+            缓存的解析结果，未启用、不存在或已过期时返回None
+        """
+        if self.cache_dir is None:
+            return None
+        
+        try:
+            stat = file_path.stat()
+            payload = pickle.loads(self._cache_file_path(file_path).read_bytes())
+            if (payload.get('version') != _CACHE_FORMAT_VERSION
+                    or payload.get('mtime_ns') != stat.st_mtime_ns
+                    or payload.get('size') != stat.st_size):
+                return None
+            
+            cached = payload['result']
+            return ParseResult(
+                result_type=ParseResultType.SUCCESS,
+                file_path=str(file_path),
+                guid=cached['guid'],
+                asset_type=cached['asset_type'],
+                data=cached['data'],
+                warnings=cached['warnings']
+            )
+            
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, KeyError,
+                TypeError, AttributeError):
+            return None
+    
+    def _store_cache_file(self, file_path: Path, result: ParseResult) -> None:
+        """写入解析缓存文件，失败时只记录日志
+        
+        Args:
+            file_path: Meta文件路径
+            result: 成功的解析结果
+        """
+        if self.cache_dir is None:
+            return
+        
+        try:
+            stat = file_path.stat()
+            payload = {
+                'version': _CACHE_FORMAT_VERSION,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'result': {
+                    'guid': result.guid,
+                    'asset_type': result.asset_type,
+                    'data': result.data,
+                    'warnings': result.warnings
+                }
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_file_path(file_path).write_bytes(
+                pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            
+        except (OSError, pickle.PicklingError, TypeError, ValueError) as e:
+            self.logger.debug(f"写入解析缓存失败 {file_path}: {e}")
+    
     def _validate_meta_structure(self, data: Dict[str, Any]) -> tuple[bool, str]:
         """验证Meta文件结构
         
@@ -230,114 +413,169 @@ class MetaParser(BaseParser):
         Returns:
             GUID格式有效返回True，否则返回False
         """
-        if not isinstance(guid, str):
+        if not isinstance(guid, str) or len(guid) != 32:
             return False
-        return bool(self.GUID_PATTERN.match(guid))
+        # int()会接受空白、下划线、正负号、非ASCII数字和0x前缀，需先排除
+        if not guid.isascii() or not guid.isalnum() or guid[1] in 'xX':
+            return False
+        try:
+            int(guid, 16)
+        except ValueError:
+            return False
+        return True
     
-    def _parse_meta_info(self, data: Dict[str, Any]) -> Optional[MetaFileInfo]:
-        """解析Meta文件信息
+    def _scan_fields(
+        self, 
+        data: Dict[str, Any]
+    ) -> _FieldScan:
+        """单次遍历Meta字段
+        
+        同时完成导入器类型检测和未知字段收集，避免多次遍历字典。
+        导入器键以supported_importers为准，不记录日志。
+        
+        Args:
+            data: YAML解析后的数据
+            
+        Returns:
+            (导入器类型, 导入器数据, 未知字段列表)
+        """
+        importer_type = ImporterType.UNKNOWN
+        importer_data: Dict[str, Any] = {}
+        unknown_fields = []
+        supported_importers = self.supported_importers
+        
+        for key, value in data.items():
+            if key in _KNOWN_META_FIELDS:
+                continue
+            if key in supported_importers:
+                if importer_type is ImporterType.UNKNOWN and isinstance(value, dict):
+                    importer_type = ImporterType.from_string(key)
+                    importer_data = value
+            else:
+                unknown_fields.append(key)
+        
+        return importer_type, importer_data, unknown_fields
+    
+    def _build_meta_info(
+        self,
+        data: Dict[str, Any],
+        importer_type: ImporterType,
+        importer_data: Dict[str, Any]
+    ) -> Optional[MetaFileInfo]:
+        """根据已检测的导入器构建Meta文件信息
         
         Args:
             data: YAML解析后的数据
+            importer_type: 导入器类型
+            importer_data: 导入器数据
             
         Returns:
             Meta文件信息对象，解析失败返回None
         """
         try:
-            guid = data['guid']
-            file_format_version = data['fileFormatVersion']
-            
-            # 检测导入器类型
-            importer_type, importer_data = self._detect_importer_type(data)
-            
-            # 提取其他信息
-            user_data = data.get('userData')
-            asset_bundle_name = data.get('assetBundleName')
-            asset_bundle_variant = data.get('assetBundleVariant')
-            
             return MetaFileInfo(
-                guid=guid,
-                file_format_version=file_format_version,
+                guid=data['guid'],
+                file_format_version=data['fileFormatVersion'],
                 importer_type=importer_type,
                 importer_data=importer_data,
-                user_data=user_data,
-                asset_bundle_name=asset_bundle_name,
-                asset_bundle_variant=asset_bundle_variant
+                user_data=data.get('userData'),
+                asset_bundle_name=data.get('assetBundleName'),
+                asset_bundle_variant=data.get('assetBundleVariant')
             )
             
         except Exception as e:
             self.logger.error(f"解析Meta信息时发生错误: {e}")
             return None
     
-    def _detect_importer_type(self, data: Dict[str, Any]) -> tuple[ImporterType, Dict[str, Any]]:
+    def _parse_meta_info(self, data: Dict[str, Any], scan: Optional[_FieldScan] = None) -> Optional[MetaFileInfo]:
+        """解析Meta文件信息
+        
+        Args:
+            data: YAML解析后的数据
+            scan: 已有的_scan_fields结果，None时重新遍历
+            
+        Returns:
+            Meta文件信息对象，解析失败返回None
+        """
+        importer_type, importer_data = self._detect_importer_type(data, scan)
+        return self._build_meta_info(data, importer_type, importer_data)
+    
+    def _detect_importer_type(
+        self,
+        data: Dict[str, Any],
+        scan: Optional[_FieldScan] = None
+    ) -> tuple[ImporterType, Dict[str, Any]]:
         """检测导入器类型
         
         Args:
             data: YAML解析后的数据
+            scan: 已有的_scan_fields结果，None时重新遍历
             
         Returns:
             (导入器类型, 导入器数据)
         """
-        importer_data = {}
+        importer_type, importer_data, _ = scan if scan is not None else self._scan_fields(data)
         
-        # 检查已知的导入器类型
-        for key, value in data.items():
-            if key in self.supported_importers and isinstance(value, dict):
-                importer_type = ImporterType.from_string(key)
-                importer_data = value
-                self.logger.debug(f"检测到导入器类型: {key}")
-                return importer_type, importer_data
-        
-        # 如果没有找到已知导入器，返回未知类型
-        self.logger.warning("未能检测到已知的导入器类型")
-        return ImporterType.UNKNOWN, {}
+        if importer_type is ImporterType.UNKNOWN:
+            self.logger.warning("未能检测到已知的导入器类型")
+        else:
+            self.logger.debug(f"检测到导入器类型: {importer_type.value}")
+        
+        return importer_type, importer_data
     
     def _check_potential_issues(
         self, 
         meta_info: MetaFileInfo, 
-        raw_data: Dict[str, Any]
+        raw_data: Dict[str, Any],
+        scan: Optional[_FieldScan] = None
     ) -> List[str]:
         """检查潜在问题
         
         Args:
             meta_info: Meta文件信息
             raw_data: 原始YAML数据
+            scan: 已有的_scan_fields结果，None时重新遍历
             
         Returns:
             警告信息列表
         """
-        warnings = []
-        
-        # 检查未知导入器类型
-        if meta_info.importer_type == ImporterType.UNKNOWN:
-            warnings.append("未能识别导入器类型")
-        
-        # 检查空的导入器数据
-        if not meta_info.importer_data:
-            warnings.append("导入器数据为空")
-        
-        # 检查旧版本文件格式
-        if meta_info.file_format_version < 2:
-            warnings.append(f"文件格式版本较旧: {meta_info.file_format_version}")
-        
-        # 检查是否有未处理的字段
-        known_fields = {
-            'fileFormatVersion', 'guid', 'userData', 
-            'assetBundleName', 'assetBundleVariant'
-        }
-        known_fields.update(self.supported_importers)
+        _, _, unknown_fields = scan if scan is not None else self._scan_fields(raw_data)
+        return self._collect_warnings(meta_info, unknown_fields)
+    
+    def _collect_warnings(self, meta_info: MetaFileInfo, unknown_fields: List[str]) -> List[str]:
+        """根据已收集的信息生成警告
         
-        unknown_fields = set(raw_data.keys()) - known_fields
-        if unknown_fields:
-            warnings.append(f"发现未知字段: {', '.join(unknown_fields)}")
+        警告只取决于导入器类型、格式版本、导入器数据是否为空和未知字段，
+        同一项目中的Meta文件大多共享这几项，结果按该签名缓存。
         
-        return warnings
+        Args:
+            meta_info: Meta文件信息
+            unknown_fields: 未知字段列表
+            
+        Returns:
+            警告信息列表
+        """
+        signature = (
+            meta_info.importer_type,
+            meta_info.file_format_version,
+            bool(meta_info.importer_data),
+            tuple(unknown_fields)
+        )
+        try:
+            return list(_warnings_for_signature(signature))
+        except TypeError:
+            # 字段值不可哈希时不走缓存
+            return list(_warnings_for_signature.__wrapped__(signature))
     
-    def extract_guid_only(self, file_path: Path) -> Optional[str]:
+    def extract_guid_only(self, file_path: Path, full: bool = False) -> Optional[str]:
         """快速提取GUID（不进行完整解析）
         
+        默认只读取文件开头的少量字节并用正则定位guid行；头部未找到时
+        才回退到逐行扫描整个文件。
+        
         Args:
             file_path: Meta文件路径
+            full: 为True时直接逐行扫描整个文件
             
         Returns:
             GUID字符串，失败时返回None
@@ -346,6 +584,15 @@ class MetaParser(BaseParser):
             if not self.validate_file_path(file_path):
                 return None
             
+            if not full:
+                with open(file_path, 'rb') as file:
+                    head = file.read(_GUID_HEAD_BYTES)
+                match = _GUID_LINE_RE.search(head)
+                if match:
+                    return match.group(1).decode('ascii')
+                if len(head) < _GUID_HEAD_BYTES:
+                    return None
+            
             with open(file_path, 'r', encoding='utf-8') as file:
                 for line in file:
                     line = line.strip()
@@ -4,17 +4,33 @@
 """
 
 import re
-from typing import Dict, Any, Optional, List, Set, Tuple
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, List, Set, Tuple, IO, Union, Iterator
 from pathlib import Path
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
-from .base_parser import BaseParser, ParseResult, ParseResultType
+from .base_parser import BaseParser, ParseResult, ParseResultType, cached_parse
+from ._prefab_scan import NULL_GUID, scan_file
 from ..utils.yaml_utils import YAMLParser
 
 logger = logging.getLogger(__name__)
 
+# 引用扫描用的正则表达式，模块加载时编译一次
+_REFERENCE_PATTERN = re.compile(
+    r'\{fileID:\s*(-?\d+),\s*guid:\s*([a-f0-9]{32}),\s*type:\s*(\d+)\}',
+    re.IGNORECASE
+)
+
+# Unity多文档YAML的文档头，如 "--- !u!1 &1234567890"（可能带有stripped等后缀）
+_DOC_HEADER_RE = re.compile(r'^[ \t]*--- !u!(\d+) &(\d+)[^\n]*\n?', re.M)
+
+# 需要完整解析的文档类型：GameObject以及Transform/RectTransform
+_GAME_OBJECT_CLASS_IDS = frozenset({'1'})
+_TRANSFORM_CLASS_IDS = frozenset({'4', '224'})
+
 
 class ComponentType(Enum):
     """Unity组件类型枚举"""
@@ -55,7 +71,7 @@ class ComponentType(Enum):
         return class_id_map.get(class_id, cls.UNKNOWN)
 
 
-@dataclass
+@dataclass(slots=True)
 class ReferenceInfo:
     """引用信息数据类"""
     file_id: str
@@ -64,11 +80,21 @@ class ReferenceInfo:
     property_path: str
     reference_type: str = "unknown"
     
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "file_id": self.file_id,
+            "guid": self.guid,
+            "type": self.type,
+            "property_path": self.property_path,
+            "reference_type": self.reference_type
+        }
+    
     def __str__(self) -> str:
         return f"Ref({self.guid}:{self.file_id})"
 
 
-@dataclass
+@dataclass(slots=True)
 class GameObjectInfo:
     """GameObject信息数据类"""
     file_id: str
@@ -80,10 +106,134 @@ class GameObjectInfo:
     tag: str = "Untagged"
     active: bool = True
     
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "file_id": self.file_id,
+            "name": self.name,
+            "components": self.components,
+            "children": self.children,
+            "parent": self.parent,
+            "layer": self.layer,
+            "tag": self.tag,
+            "active": self.active
+        }
+    
     def __str__(self) -> str:
         return f"GameObject({self.name})"
 
 
+class GameObjectView(Mapping):
+    """GameObjectTable中单行的只读字典视图
+    
+    不复制数据，按列名读取表中对应位置的值，支持obj['name']、obj.get()等用法。
+    """
+    
+    __slots__ = ('_table', '_index')
+    
+    FIELDS = ('file_id', 'name', 'components', 'children', 'parent', 'layer', 'tag', 'active')
+    
+    def __init__(self, table: 'GameObjectTable', index: int):
+        self._table = table
+        self._index = index
+    
+    def __getitem__(self, key: str) -> Any:
+        table, i = self._table, self._index
+        if key == 'file_id':
+            return str(table.file_ids[i])
+        if key == 'name':
+            return table.names[i]
+        if key == 'components':
+            return table.components[i]
+        if key == 'children':
+            return table.children[i]
+        if key == 'parent':
+            return table.parents[i]
+        if key == 'layer':
+            return table.layers[i]
+        if key == 'tag':
+            return table.tags[i]
+        if key == 'active':
+            return bool(table.active[i])
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+    
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+    
+    def __repr__(self) -> str:
+        return f"GameObjectView({dict(self)!r})"
+
+
+@dataclass
+class GameObjectTable:
+    """GameObject列式存储（SoA）
+    
+    每个字段一列，避免每个GameObject一个字典的开销；按名称查找只需扫描names列。
+    迭代时返回GameObjectView，兼容原先list-of-dict的读取方式。
+    """
+    # Unity的fileID是有符号64位整数，剥离（stripped）对象和Prefab实例对象的fileID可能为负
+    file_ids: array = field(default_factory=lambda: array('q'))
+    names: List[str] = field(default_factory=list)
+    components: List[List[Dict[str, Any]]] = field(default_factory=list)
+    children: List[List[str]] = field(default_factory=list)
+    parents: List[Optional[str]] = field(default_factory=list)
+    layers: array = field(default_factory=lambda: array('i'))
+    tags: List[str] = field(default_factory=list)
+    active: bytearray = field(default_factory=bytearray)
+    
+    @classmethod
+    def from_objects(cls, game_objects: List[GameObjectInfo]) -> 'GameObjectTable':
+        """从GameObjectInfo列表构建表"""
+        table = cls()
+        for obj in game_objects:
+            table.append(obj)
+        return table
+    
+    def append(self, obj: GameObjectInfo) -> GameObjectView:
+        """追加一个GameObject，返回新行的视图"""
+        self.file_ids.append(int(obj.file_id))
+        self.names.append(obj.name)
+        self.components.append(obj.components)
+        self.children.append(obj.children)
+        self.parents.append(obj.parent)
+        self.layers.append(obj.layer)
+        self.tags.append(obj.tag)
+        self.active.append(1 if obj.active else 0)
+        return GameObjectView(self, len(self.names) - 1)
+    
+    def index_of_name(self, name: str) -> int:
+        """返回第一个同名GameObject的位置，不存在时返回-1"""
+        try:
+            return self.names.index(name)
+        except ValueError:
+            return -1
+    
+    def find_by_name(self, name: str) -> Optional[GameObjectView]:
+        """按名称查找第一个GameObject"""
+        index = self.index_of_name(name)
+        return GameObjectView(self, index) if index >= 0 else None
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """转换为list-of-dict格式，用于序列化"""
+        return [dict(view) for view in self]
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __iter__(self) -> Iterator[GameObjectView]:
+        return (GameObjectView(self, i) for i in range(len(self.names)))
+    
+    def __getitem__(self, index: int) -> GameObjectView:
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError(index)
+        return GameObjectView(self, index)
+
+
 class PrefabParser(BaseParser):
     """Unity Prefab文件解析器
     
@@ -99,17 +249,8 @@ class PrefabParser(BaseParser):
         super().__init__(strict_mode)
         self.yaml_parser = YAMLParser()
         
-        # 编译正则表达式模式
-        self.guid_pattern = re.compile(r'guid:\s*([a-f0-9]{32})', re.IGNORECASE)
-        self.file_id_pattern = re.compile(r'fileID:\s*(-?\d+)', re.IGNORECASE)
-        self.reference_pattern = re.compile(
-            r'\{fileID:\s*(-?\d+),\s*guid:\s*([a-f0-9]{32}),\s*type:\s*(\d+)\}',
-            re.IGNORECASE
-        )
-        self.component_reference_pattern = re.compile(
-            r'component:\s*\{fileID:\s*(-?\d+)\}',
-            re.IGNORECASE
-        )
+        # 正则表达式模式（模块级预编译）
+        self.reference_pattern = _REFERENCE_PATTERN
         
         logger.info("Prefab解析器初始化完成")
     
@@ -132,6 +273,7 @@ class PrefabParser(BaseParser):
         """
         return ['.prefab']
     
+    @cached_parse
     def parse(self, file_path: Path) -> ParseResult:
         """解析Prefab文件
         
@@ -149,41 +291,135 @@ class PrefabParser(BaseParser):
             
             # 读取并解析YAML内容
             file_content = file_path.read_text(encoding='utf-8')
-            yaml_documents = self._parse_unity_yaml(file_content)
-            if not yaml_documents:
-                return self.create_failed_result(file_path, "无法解析YAML文档")
+            return self._parse_content(file_content, file_path)
             
-            # 解析GameObject层次结构
-            game_objects = self._extract_game_objects(yaml_documents)
+        except Exception as e:
+            error_msg = f"解析Prefab文件时发生错误: {str(e)}"
+            logger.error(error_msg)
+            return self.create_failed_result(file_path, error_msg)
+    
+    def parse_stream(self, stream: IO[str], virtual_name: str = '<memory>') -> ParseResult:
+        """从文件对象解析Prefab内容
+        
+        不访问文件系统，也不做扩展名检查，适合内存中的数据。
+        
+        Args:
+            stream: 可读的文本文件对象
+            virtual_name: 写入解析结果file_path的名称
             
-            # 提取所有引用关系
-            references = self._extract_references(file_content)
+        Returns:
+            解析结果
+        """
+        try:
+            return self._parse_content(stream.read(), virtual_name)
             
-            # 提取组件引用
-            component_references = self._extract_component_references(yaml_documents)
+        except Exception as e:
+            error_msg = f"解析Prefab文件时发生错误: {str(e)}"
+            logger.error(error_msg)
+            return self.create_failed_result(virtual_name, error_msg)
+    
+    def _parse_content(self, file_content: str, source: Union[Path, str]) -> ParseResult:
+        """解析Prefab文本内容
+        
+        Args:
+            file_content: Prefab文件内容
+            source: 内容来源（文件路径或虚拟名称）
             
-            # 构建解析数据
-            data = {
-                'game_objects': [obj.__dict__ for obj in game_objects],
-                'references': [ref.__dict__ for ref in references],
-                'component_references': component_references,
-                'total_objects': len(game_objects),
-                'total_references': len(references),
-                'root_objects': self._find_root_objects(game_objects)
-            }
+        Returns:
+            解析结果
+        """
+        raw_documents = self._split_documents(file_content)
+        if not raw_documents:
+            return self.create_failed_result(source, "无法解析YAML文档")
+        
+        # 解析GameObject层次结构（只解析GameObject文档）
+        game_objects = self._extract_game_objects(
+            self._load_documents(raw_documents, _GAME_OBJECT_CLASS_IDS)
+        )
+        
+        # 提取所有引用关系
+        references = self._extract_references(file_content)
+        
+        # 提取组件引用（只解析Transform类文档）
+        component_references = self._extract_component_references(
+            self._load_documents(raw_documents, _TRANSFORM_CLASS_IDS)
+        )
+        
+        # 解析数据中只放可序列化的普通值：GameObject表转换为字典列表，
+        # 同一遍循环中建立按名称和file ID的索引，索引与列表共享同一批字典。
+        # Unity中GameObject名称可以重复，按名称索引的值为列表
+        game_object_dicts = GameObjectTable.from_objects(game_objects).to_list()
+        game_objects_by_name: Dict[str, List[Dict[str, Any]]] = {}
+        game_objects_by_file_id: Dict[str, Dict[str, Any]] = {}
+        for obj in game_object_dicts:
+            game_objects_by_name.setdefault(obj['name'], []).append(obj)
+            game_objects_by_file_id[obj['file_id']] = obj
+        
+        # 构建解析数据
+        data = {
+            'game_objects': game_object_dicts,
+            'game_objects_by_name': game_objects_by_name,
+            'game_objects_by_file_id': game_objects_by_file_id,
+            'references': [ref.to_dict() for ref in references],
+            'component_references': component_references,
+            'total_objects': len(game_objects),
+            'total_references': len(references),
+            'root_objects': self._find_root_objects(game_objects)
+        }
+        
+        logger.info(f"Prefab解析完成: {len(game_objects)}个GameObject, {len(references)}个引用")
+        
+        return self.create_success_result(
+            file_path=source,
+            asset_type="Prefab",
+            data=data
+        )
+    
+    def _split_documents(self, content: str) -> List[Tuple[str, str, str]]:
+        """按文档头切分Unity多文档YAML，不解析文档内容
+        
+        Args:
+            content: 文件内容
             
-            logger.info(f"Prefab解析完成: {len(game_objects)}个GameObject, {len(references)}个引用")
+        Returns:
+            (class_id, file_id, 文档内容)元组列表
+        """
+        headers = list(_DOC_HEADER_RE.finditer(content))
+        documents = []
+        
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            documents.append((header.group(1), header.group(2), content[header.end():end]))
+        
+        return documents
+    
+    def _load_documents(
+        self,
+        raw_documents: List[Tuple[str, str, str]],
+        class_ids: frozenset
+    ) -> List[Dict[str, Any]]:
+        """按需解析指定类型的文档
+        
+        Args:
+            raw_documents: _split_documents返回的文档列表
+            class_ids: 需要解析的Unity class ID集合
             
-            return self.create_success_result(
-                file_path=file_path,
-                asset_type="Prefab",
-                data=data
-            )
+        Returns:
+            解析后的文档列表，格式与_parse_unity_yaml一致
+        """
+        documents = []
+        
+        for class_id, file_id, body in raw_documents:
+            if class_id not in class_ids:
+                continue
             
-        except Exception as e:
-            error_msg = f"解析Prefab文件时发生错误: {str(e)}"
-            logger.error(error_msg)
-            return self.create_failed_result(file_path, error_msg)
+            doc_data = self._parse_yaml_content(body)
+            if doc_data:
+                doc_data['_unity_class_id'] = class_id
+                doc_data['_unity_file_id'] = file_id
+                documents.append(doc_data)
+        
+        return documents
     
     def _extract_game_objects(self, yaml_documents: List[Dict[str, Any]]) -> List[GameObjectInfo]:
         """从YAML文档中提取GameObject信息
@@ -472,21 +708,19 @@ class PrefabParser(BaseParser):
         Returns:
             GUID列表
         """
-        result = self.parse(file_path)
-        if not result.is_success or not result.data:
+        if not self.validate_file_path(file_path):
             return []
         
-        references = result.data.get('references', [])
-        guids = set()
+        # 只需要GUID时直接扫描文件字节，无需构建完整的YAML文档
+        try:
+            guids = scan_file(file_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"读取Prefab文件时发生错误 {file_path}: {e}")
+            return []
         
-        for ref in references:
-            if isinstance(ref, dict) and ref.get('guid'):
-                # 过滤掉内部引用（guid为全零）
-                guid = ref['guid']
-                if guid and guid != '00000000000000000000000000000000':
-                    guids.add(guid)
+        guids.discard(NULL_GUID)
         
-        return list(guids)
+        return [guid.decode('ascii') for guid in guids]
 
 
 def create_prefab_parser(strict_mode: bool = False) -> PrefabParser:
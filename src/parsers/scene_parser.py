@@ -4,19 +4,254 @@
 """
 
 import re
-from typing import Dict, Any, Optional, List, Set, Tuple
+import sys
+from collections import deque
+from typing import Dict, Any, IO, Iterator, Optional, List, Tuple, Union
 from pathlib import Path
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from .base_parser import BaseParser, ParseResult, ParseResultType
+import yaml
+from yaml.events import (
+    DocumentStartEvent, Event, MappingEndEvent, MappingStartEvent,
+    ScalarEvent, SequenceEndEvent, SequenceStartEvent
+)
+
+from .base_parser import BaseParser, ParseResult, ParseResultType, cached_parse
 from .prefab_parser import GameObjectInfo, ReferenceInfo, ComponentType
-from ..utils.yaml_utils import YAMLParser
+from ._prefab_scan import NULL_GUID, scan_file
+from ..utils.yaml_utils import YAML_SNIFF_SIZE, SafeLoader, looks_like_yaml
 
 logger = logging.getLogger(__name__)
 
+# Unity在%TAG指令中把!u!映射到该前缀，文档根节点的标签为前缀加class ID
+_UNITY_TAG_PREFIX = 'tag:unity3d.com,2011:'
+
+# 文档头改写规则：%TAG指令按YAML规范只作用于第一个文档，把!u!改写为
+# 不依赖指令的完整标签；同时去掉不是合法YAML的stripped标记
+_DOCUMENT_HEADER_RE = re.compile(r'^--- !u!(-?\d+) (&-?\d+)(?: stripped)?[ \t]*$', re.M)
+_DOCUMENT_HEADER_REPL = r'--- !<' + _UNITY_TAG_PREFIX + r'\1> \2'
+
+# 文档头中的class ID，用于在解析前切分文档
+_DOCUMENT_CLASS_RE = re.compile(r'^--- !u!(-?\d+) ', re.M)
+
+# 任意文档分隔行，严格模式下用于确认所有文档都能被识别
+_DOCUMENT_SEPARATOR_RE = re.compile(r'^---', re.M)
+
+# 场景解析用到的对象类型：GameObject、Transform、OcclusionCullingSettings
+# （旧版本中名为SceneSettings）、MonoBehaviour、RectTransform、PrefabInstance
+_SCENE_CLASS_IDS = frozenset({'1', '4', '29', '114', '224', '1001'})
+
+# 引用扫描用到的模式，在模块导入时编译一次
+_REFERENCE_PATTERN = re.compile(
+    r'\{fileID:\s*(-?\d+),\s*guid:\s*([a-f0-9]{32}),\s*type:\s*(\d+)\}',
+    re.IGNORECASE
+)
+
+# PrefabInstance引用的源Prefab GUID（m_SourcePrefab是单行的流式映射）
+_SOURCE_PREFAB_GUID_RE = re.compile(
+    rb'm_SourcePrefab:[ \t]*\{[^}\n]*guid:[ \t]*([0-9a-fA-F]{32})'
+)
+
+# 场景解析需要的对象字段，其余字段在事件流中直接跳过，不构建Python对象
+_SCENE_FIELDS = frozenset({
+    'm_Name', 'm_GameObject', 'm_Father', 'm_Children', 'm_Component',
+    'm_Script', 'm_Modification', 'm_SourcePrefab', 'm_IsActive',
+    'm_TagString', 'm_Layer', 'm_BuildIndex'
+})
+
+# 只驻留短的ASCII字符串：键名、类型名、fileID、GUID、标签等在场景中大量重复，
+# 驻留后共享同一个对象，字典查找和比较也可以走身份比较的快速分支
+_INTERN_MAX_LENGTH = 32
+
+# 常用的枚举式取值
+_TAG_UNTAGGED = sys.intern('Untagged')
+_NAME_UNNAMED = sys.intern('Unnamed')
+
+# 开始/结束一个嵌套节点的事件
+_COLLECTION_START_EVENTS = (MappingStartEvent, SequenceStartEvent)
+_COLLECTION_END_EVENTS = (MappingEndEvent, SequenceEndEvent)
+
+
+def _intern(value: Any) -> Any:
+    """驻留短的ASCII字符串，其他值原样返回"""
+    if type(value) is str and len(value) <= _INTERN_MAX_LENGTH and value.isascii():
+        return sys.intern(value)
+    return value
+
+
+def _build_node(event: Event, events: Iterator[Event]) -> Any:
+    """从节点的起始事件构建完整的值
+    
+    标量保持字符串（不做类型推断），空的普通标量视为None。
+    
+    Args:
+        event: 节点的起始事件
+        events: 事件迭代器，读取到节点结束为止
+        
+    Returns:
+        节点值
+    """
+    if isinstance(event, ScalarEvent):
+        if not event.value and event.implicit[0]:
+            return None
+        return _intern(event.value)
+    
+    if isinstance(event, MappingStartEvent):
+        mapping = {}
+        for key_event in events:
+            if isinstance(key_event, MappingEndEvent):
+                break
+            key = _build_node(key_event, events)
+            mapping[key] = _build_node(next(events), events)
+        return mapping
+    
+    if isinstance(event, SequenceStartEvent):
+        sequence = []
+        for item_event in events:
+            if isinstance(item_event, SequenceEndEvent):
+                break
+            sequence.append(_build_node(item_event, events))
+        return sequence
+    
+    # Unity文件不使用别名
+    return None
+
+
+def _skip_node(event: Event, events: Iterator[Event]) -> None:
+    """跳过一个节点，只计数嵌套深度不构建任何值
+    
+    Args:
+        event: 节点的起始事件
+        events: 事件迭代器，读取到节点结束为止
+    """
+    if not isinstance(event, _COLLECTION_START_EVENTS):
+        return
+    
+    depth = 1
+    for nested in events:
+        if isinstance(nested, _COLLECTION_START_EVENTS):
+            depth += 1
+        elif isinstance(nested, _COLLECTION_END_EVENTS):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def split_documents(content: str) -> List[Tuple[str, int, int]]:
+    """按"--- !u!<class>"文档头切分内容，不解析文档
+    
+    Args:
+        content: 场景文件内容
+        
+    Returns:
+        (class_id, 起始位置, 结束位置)列表，切片包含文档头行
+    """
+    headers = list(_DOCUMENT_CLASS_RE.finditer(content))
+    ends = [header.start() for header in headers[1:]] + [len(content)]
+    return [
+        (header.group(1), header.start(), end)
+        for header, end in zip(headers, ends)
+    ]
+
+
+def select_documents(content: str, class_ids: frozenset, strict: bool = False) -> str:
+    """只保留指定类型的文档，其余文档在YAML解析前丢弃
+    
+    第一个文档头之前的%YAML/%TAG指令保持不变。
+    
+    Args:
+        content: 场景文件内容
+        class_ids: 需要保留的Unity class ID集合
+        strict: 为True时，存在无法识别的文档分隔行就返回完整内容
+        
+    Returns:
+        过滤后的内容
+    """
+    documents = split_documents(content)
+    if not documents:
+        return content
+    
+    if strict and len(_DOCUMENT_SEPARATOR_RE.findall(content)) != len(documents):
+        return content
+    
+    parts = [content[:documents[0][1]]]
+    parts.extend(
+        content[start:end]
+        for class_id, start, end in documents
+        if class_id in class_ids
+    )
+    return ''.join(parts)
+
 
-@dataclass
+def load_scene_documents(content: str) -> List[Dict[str, Any]]:
+    """以事件流方式解析Unity场景YAML，只保留需要的字段
+    
+    每个"--- !u!<class> &<fileID>"文档转换为一个字典：对象字段直接放在
+    字典中，另加_unity_class_id、_unity_file_id和_unity_type（对象类型名）。
+    字段只保留_SCENE_FIELDS中的键，其余子树在事件层面跳过。
+    
+    Args:
+        content: 场景文件内容
+        
+    Returns:
+        文档列表，顺序与文件中一致
+        
+    Raises:
+        yaml.YAMLError: 内容不是合法的YAML
+    """
+    content = _DOCUMENT_HEADER_RE.sub(_DOCUMENT_HEADER_REPL, content)
+    events = yaml.parse(content, Loader=SafeLoader)
+    documents = []
+    
+    for event in events:
+        if not isinstance(event, DocumentStartEvent):
+            continue
+        
+        # 只处理带Unity标签的映射根节点
+        root = next(events)
+        tag = getattr(root, 'tag', None)
+        if (not isinstance(root, MappingStartEvent) or not tag
+                or not tag.startswith(_UNITY_TAG_PREFIX)):
+            _skip_node(root, events)
+            continue
+        
+        document = {
+            '_unity_class_id': sys.intern(tag[len(_UNITY_TAG_PREFIX):]),
+            '_unity_file_id': _intern(root.anchor)
+        }
+        
+        # 根映射只有一个键：对象类型名，值为对象字段
+        for key_event in events:
+            if isinstance(key_event, MappingEndEvent):
+                break
+            document['_unity_type'] = _build_node(key_event, events)
+            body = next(events)
+            if not isinstance(body, MappingStartEvent):
+                _skip_node(body, events)
+                continue
+            
+            for field_event in events:
+                if isinstance(field_event, MappingEndEvent):
+                    break
+                field_name = _build_node(field_event, events)
+                value_event = next(events)
+                if field_name in _SCENE_FIELDS:
+                    document[field_name] = _build_node(value_event, events)
+                else:
+                    _skip_node(value_event, events)
+        
+        documents.append(document)
+    
+    return documents
+
+
+def _object_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    """去掉文档中的_unity_元数据键，返回对象字段"""
+    return {k: v for k, v in document.items() if not k.startswith('_unity_')}
+
+
+@dataclass(slots=True, frozen=True)
 class SceneInfo:
     """场景信息数据类"""
     name: str
@@ -25,21 +260,36 @@ class SceneInfo:
     scene_settings: Optional[Dict[str, Any]] = None
     lighting_settings: Optional[Dict[str, Any]] = None
     
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "name": self.name,
+            "build_index": self.build_index,
+            "is_loading_scene": self.is_loading_scene,
+            "scene_settings": self.scene_settings,
+            "lighting_settings": self.lighting_settings
+        }
+    
     def __str__(self) -> str:
         return f"Scene({self.name})"
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class PrefabInstanceInfo:
     """Prefab实例信息数据类"""
     file_id: str
     prefab_asset_guid: str
     source_prefab: Optional[str] = None
-    modifications: List[Dict[str, Any]] = None
+    modifications: List[Dict[str, Any]] = field(default_factory=list)
     
-    def __post_init__(self):
-        if self.modifications is None:
-            self.modifications = []
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "file_id": self.file_id,
+            "prefab_asset_guid": self.prefab_asset_guid,
+            "source_prefab": self.source_prefab,
+            "modifications": self.modifications
+        }
     
     def __str__(self) -> str:
         return f"PrefabInstance({self.prefab_asset_guid})"
@@ -51,6 +301,16 @@ class SceneParser(BaseParser):
     解析.scene/.unity文件的YAML结构，提取场景中的GameObject和组件引用。
     """
     
+    # 场景文件通常很大，批量解析默认使用进程池。forkserver启动进程池约需
+    # 数百毫秒，按约2MB/s的解析速度，未命中缓存的文件至少两个且合计4MB
+    # 以上时并行才划算
+    PARALLEL_BATCH = True
+    PARALLEL_BATCH_THRESHOLD = 1
+    PARALLEL_BATCH_MIN_BYTES = 4 * 1024 * 1024
+    
+    # 支持的扩展名（小写），扫描时对每个文件调用can_parse，用集合做O(1)查找
+    SUPPORTED_EXTENSIONS = frozenset({'.scene', '.unity'})
+    
     def __init__(self, strict_mode: bool = False):
         """初始化Scene解析器
         
@@ -58,19 +318,9 @@ class SceneParser(BaseParser):
             strict_mode: 严格模式，遇到错误时立即失败
         """
         super().__init__(strict_mode)
-        self.yaml_parser = YAMLParser()
-        
-        # 编译正则表达式模式
-        self.guid_pattern = re.compile(r'guid:\s*([a-f0-9]{32})', re.IGNORECASE)
-        self.file_id_pattern = re.compile(r'fileID:\s*(-?\d+)', re.IGNORECASE)
-        self.reference_pattern = re.compile(
-            r'\{fileID:\s*(-?\d+),\s*guid:\s*([a-f0-9]{32}),\s*type:\s*(\d+)\}',
-            re.IGNORECASE
-        )
-        self.scene_object_pattern = re.compile(
-            r'--- !u!(\d+)\s+&(\d+)',
-            re.IGNORECASE
-        )
+        
+        # 正则表达式在模块导入时编译，实例属性只是引用
+        self.reference_pattern = _REFERENCE_PATTERN
         
         logger.info("Scene解析器初始化完成")
     
@@ -83,16 +333,17 @@ class SceneParser(BaseParser):
         Returns:
             可以解析返回True，否则返回False
         """
-        return file_path.suffix.lower() in ['.scene', '.unity']
+        return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
     
     def get_supported_extensions(self) -> List[str]:
         """获取支持的文件扩展名列表
         
         Returns:
-            支持的扩展名列表
+            支持的扩展名列表（按字母排序）
         """
-        return ['.scene', '.unity']
+        return sorted(self.SUPPORTED_EXTENSIONS)
     
+    @cached_parse
     def parse(self, file_path: Path) -> ParseResult:
         """解析Scene文件
         
@@ -109,151 +360,238 @@ class SceneParser(BaseParser):
             logger.debug(f"开始解析Scene文件: {file_path}")
             
             # 读取文件内容
-            file_content = file_path.read_text(encoding='utf-8')
-            
-            # 解析YAML文档
-            yaml_documents = self._parse_unity_yaml(file_content)
-            if not yaml_documents:
-                return self.create_failed_result(file_path, "无法解析YAML文档")
-            
-            # 提取场景信息
-            scene_info = self._extract_scene_info(yaml_documents)
-            
-            # 提取GameObject
-            game_objects = self._extract_game_objects(yaml_documents)
-            
-            # 提取Prefab实例
-            prefab_instances = self._extract_prefab_instances(yaml_documents)
-            
-            # 提取所有引用关系
-            references = self._extract_references(file_content)
-            
-            # 提取组件引用
-            component_references = self._extract_component_references(yaml_documents)
-            
-            # 分析场景结构
-            scene_hierarchy = self._build_scene_hierarchy(game_objects, prefab_instances)
-            
-            # 构建解析数据
-            data = {
-                'scene_info': scene_info.__dict__ if scene_info else None,
-                'game_objects': [obj.__dict__ for obj in game_objects],
-                'prefab_instances': [inst.__dict__ for inst in prefab_instances],
-                'references': [ref.__dict__ for ref in references],
-                'component_references': component_references,
-                'scene_hierarchy': scene_hierarchy,
-                'statistics': {
-                    'total_objects': len(game_objects),
-                    'total_prefab_instances': len(prefab_instances),
-                    'total_references': len(references),
-                    'root_objects': len(scene_hierarchy.get('root_objects', [])),
-                    'max_depth': scene_hierarchy.get('max_depth', 0)
-                }
-            }
+            return self._parse_from_bytes(file_path.read_bytes(), file_path)
             
-            logger.info(f"Scene解析完成: {len(game_objects)}个GameObject, "
-                       f"{len(prefab_instances)}个Prefab实例, {len(references)}个引用")
+        except Exception as e:
+            error_msg = f"解析Scene文件时发生错误: {str(e)}"
+            logger.error(error_msg)
+            return self.create_failed_result(file_path, error_msg)
+    
+    def parse_stream(self, stream: Union[IO[str], IO[bytes]], virtual_name: str = '<memory>') -> ParseResult:
+        """从文件对象解析Scene内容
+        
+        不访问文件系统，也不做扩展名检查，适合内存中的数据。
+        
+        Args:
+            stream: 可读的文本或二进制文件对象，二进制内容按UTF-8解码
+            virtual_name: 写入解析结果file_path的名称
             
-            return self.create_success_result(
-                file_path=file_path,
-                asset_type="Scene",
-                data=data
-            )
+        Returns:
+            解析结果
+        """
+        try:
+            content = stream.read()
+            if not isinstance(content, str):
+                return self._parse_from_bytes(content, virtual_name)
+            
+            if not looks_like_yaml(content[:YAML_SNIFF_SIZE].encode('utf-8')):
+                return self.create_failed_result(virtual_name, "文件为空或不是YAML格式")
+            return self._parse_content(content, virtual_name)
             
         except Exception as e:
             error_msg = f"解析Scene文件时发生错误: {str(e)}"
             logger.error(error_msg)
-            return self.create_failed_result(file_path, error_msg)
+            return self.create_failed_result(virtual_name, error_msg)
     
-    def _extract_scene_info(self, yaml_documents: List[Dict[str, Any]]) -> Optional[SceneInfo]:
-        """从YAML文档中提取场景信息
+    def parse_bytes(self, data: Union[bytes, bytearray, memoryview], source: str = '<bytes>') -> ParseResult:
+        """直接解析内存中的Scene字节内容
+        
+        不做路径验证、扩展名检查和文件读取，也不经过解析缓存，
+        适合导入管线等已经持有文件内容的调用方。
         
         Args:
-            yaml_documents: YAML文档列表
+            data: UTF-8编码的Scene内容，支持任意字节缓冲区
+            source: 写入解析结果file_path的名称
             
         Returns:
-            SceneInfo对象或None
+            解析结果
         """
-        for doc in yaml_documents:
-            if not isinstance(doc, dict):
-                continue
+        try:
+            return self._parse_from_bytes(data, source)
             
-            # 查找SceneSettings
-            for key, value in doc.items():
-                if 'SceneSettings' in key and isinstance(value, dict):
-                    return SceneInfo(
-                        name=value.get('m_Name', 'Untitled Scene'),
-                        build_index=value.get('m_BuildIndex', -1),
-                        scene_settings=value
-                    )
+        except Exception as e:
+            error_msg = f"解析Scene文件时发生错误: {str(e)}"
+            logger.error(error_msg)
+            return self.create_failed_result(source, error_msg)
+    
+    def _parse_from_bytes(self, data: Union[bytes, bytearray, memoryview], source: Union[Path, str]) -> ParseResult:
+        """嗅探并解码字节内容后解析，明显不是YAML的内容不进入解析器
+        
+        Args:
+            data: UTF-8编码的Scene内容
+            source: 内容来源（文件路径或虚拟名称）
+            
+        Returns:
+            解析结果
+        """
+        if not looks_like_yaml(bytes(data[:YAML_SNIFF_SIZE])):
+            return self.create_failed_result(source, "文件为空或不是YAML格式")
+        
+        # str()直接从缓冲区解码，memoryview等不需要先复制为bytes
+        return self._parse_content(str(data, 'utf-8'), source)
+    
+    def _parse_content(self, file_content: str, source: Union[Path, str]) -> ParseResult:
+        """解析Scene文本内容
+        
+        Args:
+            file_content: Scene文件内容
+            source: 内容来源（文件路径或虚拟名称）
+            
+        Returns:
+            解析结果
+        """
+        # 与read_text()的通用换行一致：Windows检出的\r\n换行统一为\n，
+        # 否则文档头改写规则匹配不到以\r结尾的行
+        if '\r' in file_content:
+            file_content = file_content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # 丢弃用不到的文档（渲染、光照、导航等设置），再以事件流解析
+        # 剩余文档，只保留需要的字段
+        scene_content = select_documents(
+            file_content, _SCENE_CLASS_IDS, strict=self.strict_mode
+        )
+        yaml_documents = load_scene_documents(scene_content)
+        if not yaml_documents:
+            return self.create_failed_result(source, "无法解析YAML文档")
+        
+        # 一次遍历文档，同时提取场景信息、GameObject、Prefab实例和组件引用
+        scene_info, game_objects, prefab_instances, component_references = \
+            self._extract_scene_objects(yaml_documents)
+        
+        # 提取所有引用关系
+        references = self._extract_references(file_content)
+        
+        # 分析场景结构
+        scene_hierarchy = self._build_scene_hierarchy(game_objects, prefab_instances)
+        
+        # 构建解析数据。解析缓存保存pickle快照，命中时返回独立副本，这里
+        # 不再做防御性拷贝。不使用MappingProxyType，因为缓存和多进程批量
+        # 解析都需要能pickle结果
+        data = {
+            'scene_info': scene_info.to_dict() if scene_info else None,
+            'game_objects': tuple(obj.to_dict() for obj in game_objects),
+            'prefab_instances': tuple(inst.to_dict() for inst in prefab_instances),
+            'references': tuple(ref.to_dict() for ref in references),
+            'component_references': tuple(component_references),
+            'scene_hierarchy': scene_hierarchy,
+            'statistics': {
+                'total_objects': len(game_objects),
+                'total_prefab_instances': len(prefab_instances),
+                'total_references': len(references),
+                'root_objects': len(scene_hierarchy.get('root_objects', [])),
+                'max_depth': scene_hierarchy.get('max_depth', 0)
+            }
+        }
+        
+        logger.info(f"Scene解析完成: {len(game_objects)}个GameObject, "
+                   f"{len(prefab_instances)}个Prefab实例, {len(references)}个引用")
         
-        return SceneInfo(name="Unknown Scene")
+        return self.create_success_result(
+            file_path=source,
+            asset_type="Scene",
+            data=data
+        )
     
-    def _extract_game_objects(self, yaml_documents: List[Dict[str, Any]]) -> List[GameObjectInfo]:
-        """从YAML文档中提取GameObject信息
+    def _extract_scene_objects(
+        self, yaml_documents: List[Dict[str, Any]]
+    ) -> Tuple[SceneInfo, List[GameObjectInfo], List[PrefabInstanceInfo], List[Dict[str, Any]]]:
+        """一次遍历YAML文档，提取场景信息、GameObject、Prefab实例和组件引用
         
         Args:
             yaml_documents: YAML文档列表
             
         Returns:
-            GameObject信息列表
+            (场景信息, GameObject列表, Prefab实例列表, 组件引用列表)
         """
+        scene_info = None
         game_objects = []
+        prefab_instances = []
+        component_refs = []
         
         for doc in yaml_documents:
-            if not isinstance(doc, dict):
-                continue
+            if scene_info is None:
+                scene_info = self._scene_info_from_document(doc)
             
-            # 检查是否是GameObject (Unity class ID 1)
-            class_id = doc.get('_unity_class_id')
-            file_id = doc.get('_unity_file_id')
-            
-            if class_id == '1':  # GameObject的Unity class ID是1
-                try:
-                    # 在Unity YAML中，GameObject数据直接在文档中
-                    # 我们需要过滤掉Unity特定的键
-                    gameobject_data = {k: v for k, v in doc.items() 
-                                     if not k.startswith('_unity_')}
-                    
-                    if gameobject_data and file_id:
-                        game_obj = self._parse_game_object(file_id, gameobject_data)
-                        if game_obj:
-                            game_objects.append(game_obj)
-                except Exception as e:
-                    logger.warning(f"解析GameObject时出错: {e}")
-                    continue
-        
-        return game_objects
-    
-    def _extract_prefab_instances(self, yaml_documents: List[Dict[str, Any]]) -> List[PrefabInstanceInfo]:
-        """从YAML文档中提取Prefab实例信息
+            game_obj = self._game_object_from_document(doc)
+            if game_obj:
+                game_objects.append(game_obj)
+            
+            prefab_inst = self._prefab_instance_from_document(doc)
+            if prefab_inst:
+                prefab_instances.append(prefab_inst)
+            
+            self._collect_component_references(doc, component_refs)
+        
+        if scene_info is None:
+            scene_info = SceneInfo(name="Unknown Scene")
+        return scene_info, game_objects, prefab_instances, component_refs
+    
+    def _scene_info_from_document(self, doc: Dict[str, Any]) -> Optional[SceneInfo]:
+        """从SceneSettings文档构建场景信息
         
         Args:
-            yaml_documents: YAML文档列表
+            doc: YAML文档
             
         Returns:
-            Prefab实例信息列表
+            SceneInfo对象，文档不是SceneSettings时返回None
         """
-        prefab_instances = []
+        if 'SceneSettings' not in (doc.get('_unity_type') or ''):
+            return None
         
-        for doc in yaml_documents:
-            if not isinstance(doc, dict):
-                continue
+        settings = _object_fields(doc)
+        build_index = settings.get('m_BuildIndex')
+        return SceneInfo(
+            name=settings.get('m_Name') or 'Untitled Scene',
+            build_index=int(build_index) if build_index is not None else -1,
+            scene_settings=settings
+        )
+    
+    def _game_object_from_document(self, doc: Dict[str, Any]) -> Optional[GameObjectInfo]:
+        """从GameObject文档构建GameObject信息
+        
+        Args:
+            doc: YAML文档
+            
+        Returns:
+            GameObjectInfo对象，文档不是GameObject或解析失败时返回None
+        """
+        # GameObject的Unity class ID是1
+        if not isinstance(doc, dict) or doc.get('_unity_class_id') != '1':
+            return None
+        
+        file_id = doc.get('_unity_file_id')
+        try:
+            # 在Unity YAML中，GameObject数据直接在文档中
+            # 我们需要过滤掉Unity特定的键
+            gameobject_data = _object_fields(doc)
             
-            # 查找PrefabInstance条目
-            for key, value in doc.items():
-                if 'PrefabInstance' in key and isinstance(value, dict):
-                    try:
-                        file_id = self._extract_file_id(key)
-                        if file_id:
-                            prefab_inst = self._parse_prefab_instance(file_id, value)
-                            if prefab_inst:
-                                prefab_instances.append(prefab_inst)
-                    except Exception as e:
-                        logger.warning(f"解析PrefabInstance时出错: {e}")
-                        continue
-        
-        return prefab_instances
+            if gameobject_data and file_id:
+                return self._parse_game_object(file_id, gameobject_data)
+        except Exception as e:
+            logger.warning(f"解析GameObject时出错: {e}")
+        return None
+    
+    def _prefab_instance_from_document(self, doc: Dict[str, Any]) -> Optional[PrefabInstanceInfo]:
+        """从PrefabInstance文档构建Prefab实例信息
+        
+        Args:
+            doc: YAML文档
+            
+        Returns:
+            PrefabInstanceInfo对象，文档不是PrefabInstance或解析失败时返回None
+        """
+        if 'PrefabInstance' not in (doc.get('_unity_type') or ''):
+            return None
+        
+        file_id = doc.get('_unity_file_id')
+        if not file_id:
+            return None
+        
+        try:
+            return self._parse_prefab_instance(file_id, _object_fields(doc))
+        except Exception as e:
+            logger.warning(f"解析PrefabInstance时出错: {e}")
+            return None
     
     def _parse_game_object(self, file_id: str, data: Dict[str, Any]) -> Optional[GameObjectInfo]:
         """解析单个GameObject数据
@@ -266,10 +604,11 @@ class SceneParser(BaseParser):
             GameObjectInfo对象或None
         """
         try:
-            name = data.get('m_Name', 'Unnamed')
+            name = data.get('m_Name', _NAME_UNNAMED)
             layer = int(data.get('m_Layer', 0)) if data.get('m_Layer') is not None else 0
-            tag = data.get('m_TagString', 'Untagged')
-            active = bool(data.get('m_IsActive', True)) if data.get('m_IsActive') is not None else True
+            tag = _intern(data.get('m_TagString', _TAG_UNTAGGED))
+            # 事件流解析不做类型推断，m_IsActive是"0"/"1"字符串
+            active = bool(int(data['m_IsActive'])) if data.get('m_IsActive') is not None else True
             
             # 解析组件列表
             components = []
@@ -369,64 +708,54 @@ class SceneParser(BaseParser):
         
         return references
     
-    def _extract_component_references(self, yaml_documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """提取组件之间的引用关系
+    def _collect_component_references(self, doc: Dict[str, Any], component_refs: List[Dict[str, Any]]) -> None:
+        """收集单个文档中的组件引用关系
         
         Args:
-            yaml_documents: YAML文档列表
-            
-        Returns:
-            组件引用信息列表
+            doc: YAML文档
+            component_refs: 追加引用信息的列表
         """
-        component_refs = []
-        
-        for doc in yaml_documents:
-            if not isinstance(doc, dict):
-                continue
-            
-            for key, value in doc.items():
-                # 检查Transform和RectTransform组件
-                if ('Transform' in key or 'RectTransform' in key) and isinstance(value, dict):
-                    file_id = self._extract_file_id(key)
-                    if file_id:
-                        # 提取父子关系
-                        parent_ref = value.get('m_Father', {})
-                        children_refs = value.get('m_Children', [])
-                        
-                        if parent_ref and isinstance(parent_ref, dict):
-                            component_refs.append({
-                                'source_file_id': file_id,
-                                'target_file_id': parent_ref.get('fileID'),
-                                'relationship': 'parent',
-                                'component_type': 'Transform'
-                            })
-                        
-                        if children_refs and isinstance(children_refs, list):
-                            for child_ref in children_refs:
-                                if isinstance(child_ref, dict):
-                                    component_refs.append({
-                                        'source_file_id': file_id,
-                                        'target_file_id': child_ref.get('fileID'),
-                                        'relationship': 'child',
-                                        'component_type': 'Transform'
-                                    })
-                
-                # 检查其他组件类型的引用
-                elif ('MonoBehaviour' in key or 'Component' in key) and isinstance(value, dict):
-                    file_id = self._extract_file_id(key)
-                    if file_id:
-                        # 提取脚本引用
-                        script_ref = value.get('m_Script', {})
-                        if script_ref and isinstance(script_ref, dict):
-                            component_refs.append({
-                                'source_file_id': file_id,
-                                'target_file_id': script_ref.get('fileID'),
-                                'target_guid': script_ref.get('guid'),
-                                'relationship': 'script_reference',
-                                'component_type': 'MonoBehaviour'
-                            })
-        
-        return component_refs
+        object_type = doc.get('_unity_type') or ''
+        file_id = doc.get('_unity_file_id')
+        if not file_id:
+            return
+        
+        # 检查Transform和RectTransform组件
+        if 'Transform' in object_type:
+            # 提取父子关系
+            parent_ref = doc.get('m_Father', {})
+            children_refs = doc.get('m_Children', [])
+            
+            if parent_ref and isinstance(parent_ref, dict):
+                component_refs.append({
+                    'source_file_id': file_id,
+                    'target_file_id': parent_ref.get('fileID'),
+                    'relationship': 'parent',
+                    'component_type': 'Transform'
+                })
+            
+            if children_refs and isinstance(children_refs, list):
+                for child_ref in children_refs:
+                    if isinstance(child_ref, dict):
+                        component_refs.append({
+                            'source_file_id': file_id,
+                            'target_file_id': child_ref.get('fileID'),
+                            'relationship': 'child',
+                            'component_type': 'Transform'
+                        })
+        
+        # 检查其他组件类型的引用
+        elif 'MonoBehaviour' in object_type or 'Component' in object_type:
+            # 提取脚本引用
+            script_ref = doc.get('m_Script', {})
+            if script_ref and isinstance(script_ref, dict):
+                component_refs.append({
+                    'source_file_id': file_id,
+                    'target_file_id': script_ref.get('fileID'),
+                    'target_guid': script_ref.get('guid'),
+                    'relationship': 'script_reference',
+                    'component_type': 'MonoBehaviour'
+                })
     
     def _build_scene_hierarchy(
         self, 
@@ -455,29 +784,21 @@ class SceneParser(BaseParser):
             if obj.file_id not in all_children:
                 root_objects.append(obj.file_id)
         
-        # 计算最大深度
-        def calculate_depth(obj_id: str, visited: Set[str] = None) -> int:
-            if visited is None:
-                visited = set()
-            
-            if obj_id in visited:  # 防止循环引用
-                return 0
-            
-            visited.add(obj_id)
+        # 从根对象出发逐层遍历计算最大深度（根为第1层），不使用递归，
+        # 深层级场景不会触发递归深度限制；已访问的对象不再入队，防止循环引用
+        depth = {root_id: 1 for root_id in root_objects}
+        queue = deque(depth.items())
+        while queue:
+            obj_id, obj_depth = queue.popleft()
             obj = object_map.get(obj_id)
-            if not obj or not obj.children:
-                return 1
-            
-            max_child_depth = max(
-                calculate_depth(child_id, visited.copy()) 
-                for child_id in obj.children
-            )
-            return 1 + max_child_depth
+            if obj is None:
+                continue
+            for child_id in obj.children:
+                if child_id not in depth:
+                    depth[child_id] = obj_depth + 1
+                    queue.append((child_id, obj_depth + 1))
         
-        max_depth = 0
-        for root_id in root_objects:
-            depth = calculate_depth(root_id)
-            max_depth = max(max_depth, depth)
+        max_depth = max(depth.values(), default=0)
         
         return {
             'root_objects': root_objects,
@@ -486,22 +807,6 @@ class SceneParser(BaseParser):
             'prefab_guids': list(set(inst.prefab_asset_guid for inst in prefab_instances))
         }
     
-    def _extract_file_id(self, key: str) -> Optional[str]:
-        """从YAML key中提取file ID
-        
-        Args:
-            key: YAML key，格式如 "GameObject &1234567890"
-            
-        Returns:
-            file ID字符串或None
-        """
-        # 匹配格式: "GameObject &1234567890" 或其他组件
-        match = re.search(r'&(\d+)', key)
-        if match:
-            return match.group(1)
-        
-        return None
-    
     def _determine_reference_type(self, type_id: int) -> str:
         """根据类型ID确定引用类型
         
@@ -595,20 +900,19 @@ class SceneParser(BaseParser):
         Returns:
             Prefab GUID列表
         """
-        result = self.parse(file_path)
-        if not result.is_success or not result.data:
+        if not self.validate_file_path(file_path):
             return []
         
-        prefab_instances = result.data.get('prefab_instances', [])
-        guids = set()
+        # 只需要m_SourcePrefab的GUID，直接扫描文件字节，无需解析YAML
+        try:
+            guids = scan_file(file_path, _SOURCE_PREFAB_GUID_RE)
+        except (OSError, ValueError) as e:
+            logger.error(f"读取Scene文件时发生错误 {file_path}: {e}")
+            return []
         
-        for instance in prefab_instances:
-            if isinstance(instance, dict) and instance.get('prefab_asset_guid'):
-                guid = instance['prefab_asset_guid']
-                if guid and guid != '00000000000000000000000000000000':
-                    guids.add(guid)
+        guids.discard(NULL_GUID)
         
-        return list(guids)
+        return [guid.decode('ascii') for guid in guids]
 
 
 def create_scene_parser(strict_mode: bool = False) -> SceneParser:
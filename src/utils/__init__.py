@@ -3,10 +3,11 @@
 包含各种工具函数和助手类。
 """
 
-from .yaml_utils import YAMLParser, load_yaml_file, validate_yaml_keys
+from .yaml_utils import YAMLParser, load_yaml_file, missing_keys, validate_yaml_keys
 
 __all__ = [
     "YAMLParser",
     "load_yaml_file", 
+    "missing_keys",
     "validate_yaml_keys",
 ]
@@ -23,6 +23,22 @@ class FileInfo(NamedTuple):
     checksum: Optional[str] = None
 
 
+class FileChanges(NamedTuple):
+    """文件变更集合"""
+    new: List[Path]
+    modified: List[Path]
+    deleted: List[Path]
+    
+    @classmethod
+    def from_dict(cls, changes: Dict[str, List[Path]]) -> 'FileChanges':
+        """从包含'new'、'modified'、'deleted'键的字典创建"""
+        return cls(
+            new=changes.get('new', []),
+            modified=changes.get('modified', []),
+            deleted=changes.get('deleted', [])
+        )
+
+
 @dataclass
 class ScanSession:
     """扫描会话信息"""
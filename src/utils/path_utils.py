@@ -26,31 +26,49 @@ class PathMatcher:
         self.patterns = patterns
         self.case_sensitive = case_sensitive
         self.compiled_patterns: List[Pattern] = []
+        self.combined_pattern: Optional[Pattern] = None
+        self.separate_patterns: List[Pattern] = []
         self._compile_patterns()
     
     def _compile_patterns(self) -> None:
         """编译匹配模式"""
         self.compiled_patterns = []
+        self.combined_pattern = None
+        self.separate_patterns = []
+        flags = 0 if self.case_sensitive else re.IGNORECASE
         
         for pattern in self.patterns:
             try:
                 # 尝试作为正则表达式编译
                 if pattern.startswith('regex:'):
                     regex_pattern = pattern[6:]  # 移除'regex:'前缀
-                    flags = 0 if self.case_sensitive else re.IGNORECASE
                     compiled = re.compile(regex_pattern, flags)
                     self.compiled_patterns.append(compiled)
                 else:
                     # 作为glob模式处理
                     # 将glob模式转换为正则表达式
                     regex_pattern = self._glob_to_regex(pattern)
-                    flags = 0 if self.case_sensitive else re.IGNORECASE
                     compiled = re.compile(regex_pattern, flags)
                     self.compiled_patterns.append(compiled)
                     
             except re.error as e:
                 logger.warning(f"无效的匹配模式 '{pattern}': {e}")
                 continue
+        
+        # 不含捕获组的模式合并为单个正则，每个路径只需一次匹配而不是逐个模式尝试。
+        # 含捕获组的模式单独匹配：合并后组号会顺延，后面模式中的\1等
+        # 数字反向引用会指向别的模式的组
+        combinable = [p for p in self.compiled_patterns if not p.groups]
+        self.separate_patterns = [p for p in self.compiled_patterns if p.groups]
+        if combinable:
+            try:
+                self.combined_pattern = re.compile(
+                    '|'.join(f'(?:{p.pattern})' for p in combinable),
+                    flags
+                )
+            except re.error as e:
+                logger.debug(f"无法合并匹配模式，回退到逐个匹配: {e}")
+                self.separate_patterns = self.compiled_patterns
     
     def _glob_to_regex(self, glob_pattern: str) -> str:
         """将glob模式转换为正则表达式
@@ -91,7 +109,10 @@ class PathMatcher:
         # 标准化路径分隔符
         path_str = path_str.replace('\\', '/')
         
-        for pattern in self.compiled_patterns:
+        if self.combined_pattern is not None and self.combined_pattern.match(path_str):
+            return True
+        
+        for pattern in self.separate_patterns:
             if pattern.match(path_str):
                 return True
                 
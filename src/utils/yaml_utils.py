@@ -3,14 +3,163 @@
 提供YAML文件的读取、解析和验证功能，针对Unity文件格式进行优化。
 """
 
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, FrozenSet, IO, Iterable, Optional, Union
 from pathlib import Path
+from functools import lru_cache
 import logging
+import mmap
+import os
+import threading
+import yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.error import YAMLError
 
+try:
+    # 优先使用libyaml的C实现，解析/输出速度远高于纯Python状态机
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# YAML解析错误类型（ruamel与PyYAML各有一套异常）
+_YAML_ERRORS = (YAMLError, yaml.YAMLError)
+
+
+# looks_like_yaml检查的文件头长度
+YAML_SNIFF_SIZE = 4096
+
+_UTF8_BOM = b'\xef\xbb\xbf'
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+
+def looks_like_yaml(head: bytes) -> bool:
+    """通过文件头快速判断内容是否可能是YAML映射或序列
+    
+    只检查是否为空、是否含NUL字节以及文件头中是否出现":"或"---"，
+    用于在调用完整解析器之前排除空文件、二进制文件和明显的非YAML内容。
+    不按首字节做白名单：$、<、~、+、(等开头的普通标量也可以是合法的键。
+    head不足YAML_SNIFF_SIZE时视为完整内容；更长的内容无法仅凭文件头
+    判断是否缺少":"，按可能是YAML处理。
+    
+    Args:
+        head: 内容开头的字节，通常取前YAML_SNIFF_SIZE字节
+        
+    Returns:
+        可能是YAML返回True，确定不是返回False
+    """
+    head = head[:YAML_SNIFF_SIZE]
+    if head.startswith(_UTF16_BOMS):
+        # UTF-16内容交给libyaml识别
+        return True
+    if head.startswith(_UTF8_BOM):
+        head = head[len(_UTF8_BOM):]
+    
+    if b'\x00' in head:
+        return False
+    
+    stripped = head.lstrip()
+    if not stripped:
+        return False
+    
+    # 序列和流式集合不需要":"
+    if stripped[0] in b'-[{' or b':' in head or b'---' in head:
+        return True
+    return len(head) >= YAML_SNIFF_SIZE
+
+
+class SafeYAMLBackend:
+    """基于PyYAML SafeLoader/SafeDumper的YAML后端
+    
+    有libyaml时使用C实现，接口与ruamel.yaml的YAML对象的load/dump一致。
+    只产生内置类型（dict、list、str等），不保留引号和注释。
+    """
+    
+    preserve_quotes = False
+    default_flow_style = False
+    width = 4096
+    
+    def load(self, stream: Union[str, bytes, IO[str], IO[bytes]]) -> Any:
+        """解析YAML字符串、字节或文件对象"""
+        return yaml.load(stream, Loader=SafeLoader)
+    
+    def load_file(self, path: Path) -> Any:
+        """通过mmap把文件字节直接交给libyaml解析
+        
+        libyaml自行识别BOM和编码，省去Python层的解码和str分配。
+        """
+        with open(path, 'rb') as file:
+            # 空文件无法映射
+            if os.fstat(file.fileno()).st_size == 0:
+                return self.load(file.read())
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return self.load(mapped)
+    
+    def dump(self, data: Any, stream: IO[str]) -> None:
+        """将数据输出到文件对象"""
+        yaml.dump(
+            data,
+            stream,
+            Dumper=SafeDumper,
+            default_flow_style=self.default_flow_style,
+            allow_unicode=True,
+            sort_keys=False,
+            width=self.width
+        )
+
+
+# 每个线程各自持有的ruamel.yaml实例，键为(default_flow_style, width)
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _safe_backend(default_flow_style: bool, width: int) -> SafeYAMLBackend:
+    """按配置创建并缓存SafeYAMLBackend
+    
+    SafeYAMLBackend每次调用都新建Loader/Dumper，不保存解析状态，
+    可以在线程和解析器之间共享。
+    """
+    backend = SafeYAMLBackend()
+    backend.default_flow_style = default_flow_style
+    backend.width = width
+    return backend
+
+
+def _yaml_instance(preserve_quotes: bool, default_flow_style: bool, width: int) -> Union[YAML, SafeYAMLBackend]:
+    """按配置获取YAML后端
+    
+    ruamel.yaml的YAML()构造时要注册解析器、构造器等，开销不小，但它的
+    load不可重入，多个线程同时使用同一实例会得到错误的数据。因此ruamel
+    实例按线程缓存：同一线程内相同配置的YAMLParser共享一个实例，
+    不同线程互不干扰。无状态的SafeYAMLBackend在全进程共享。
+    
+    Args:
+        preserve_quotes: 是否保持引号格式，为True时使用ruamel.yaml
+        default_flow_style: 输出时是否使用流式风格
+        width: 输出的最大行宽
+        
+    Returns:
+        YAML后端实例，调用方不应修改其配置
+    """
+    if not preserve_quotes:
+        return _safe_backend(default_flow_style, width)
+    
+    instances = getattr(_thread_local, 'instances', None)
+    if instances is None:
+        instances = _thread_local.instances = {}
+    
+    key = (default_flow_style, width)
+    backend = instances.get(key)
+    if backend is None:
+        backend = YAML()
+        backend.preserve_quotes = preserve_quotes
+        backend.default_flow_style = default_flow_style
+        backend.width = width
+        instances[key] = backend
+    return backend
+
 
 class YAMLParser:
     """YAML解析器类，专门处理Unity格式的YAML文件"""
@@ -18,13 +167,20 @@ class YAMLParser:
     def __init__(self, preserve_quotes: bool = True):
         """初始化YAML解析器
         
+        只有需要保持引号格式（往返编辑）时才使用ruamel.yaml，
+        否则使用SafeYAMLBackend。后端实例按配置在解析器之间共享，
+        ruamel.yaml实例按线程区分，同一个解析器可以在多个线程中使用。
+        
         Args:
             preserve_quotes: 是否保持引号格式，默认True
         """
-        self.yaml = YAML()
-        self.yaml.preserve_quotes = preserve_quotes
-        self.yaml.default_flow_style = False
-        self.yaml.width = 4096  # 避免长行被折断
+        self.preserve_quotes = preserve_quotes
+    
+    @property
+    def yaml(self) -> Union[YAML, SafeYAMLBackend]:
+        """当前线程使用的YAML后端"""
+        # 宽度4096避免长行被折断
+        return _yaml_instance(self.preserve_quotes, False, 4096)
         
     def load_from_file(self, file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
         """从文件加载YAML内容
@@ -44,27 +200,37 @@ class YAMLParser:
             if not path.is_file():
                 logger.error(f"路径不是文件: {file_path}")
                 return None
+            
+            with open(path, 'rb') as file:
+                head = file.read(YAML_SNIFF_SIZE)
+            if not looks_like_yaml(head):
+                logger.warning(f"文件为空或不是YAML格式: {file_path}")
+                return None
                 
-            with open(path, 'r', encoding='utf-8') as file:
-                data = self.yaml.load(file)
-                logger.debug(f"成功解析YAML文件: {file_path}")
-                return data
+            if isinstance(self.yaml, SafeYAMLBackend):
+                # libyaml后端直接解析文件字节
+                data = self.yaml.load_file(path)
+            else:
+                with open(path, 'r', encoding='utf-8') as file:
+                    data = self.yaml.load(file)
+            logger.debug(f"成功解析YAML文件: {file_path}")
+            return data
                 
         except UnicodeDecodeError as e:
             logger.error(f"YAML文件编码错误 {file_path}: {e}")
             return None
-        except YAMLError as e:
+        except _YAML_ERRORS as e:
             logger.error(f"YAML解析错误 {file_path}: {e}")
             return None
         except Exception as e:
             logger.error(f"读取YAML文件时发生未知错误 {file_path}: {e}")
             return None
     
-    def load_from_string(self, yaml_string: str) -> Optional[Dict[str, Any]]:
+    def load_from_string(self, yaml_string: Union[str, bytes]) -> Optional[Dict[str, Any]]:
         """从字符串加载YAML内容
         
         Args:
-            yaml_string: YAML格式字符串
+            yaml_string: YAML格式字符串，也可以是未解码的UTF-8/UTF-16字节
             
         Returns:
             解析后的字典数据，失败时返回None
@@ -78,13 +244,66 @@ class YAMLParser:
             logger.debug("成功解析YAML字符串")
             return data
             
-        except YAMLError as e:
+        except _YAML_ERRORS as e:
             logger.error(f"YAML字符串解析错误: {e}")
             return None
         except Exception as e:
             logger.error(f"解析YAML字符串时发生未知错误: {e}")
             return None
     
+    def load_from_bytes(self, data: Union[bytes, bytearray, memoryview]) -> Optional[Dict[str, Any]]:
+        """从内存中的字节内容加载YAML
+        
+        不访问文件系统，字节直接交给YAML后端，由后端识别BOM和编码。
+        
+        Args:
+            data: 未解码的UTF-8/UTF-16字节，支持任意字节缓冲区
+            
+        Returns:
+            解析后的字典数据，失败时返回None
+        """
+        if not looks_like_yaml(bytes(data[:YAML_SNIFF_SIZE])):
+            logger.warning("YAML字节内容为空或不是YAML格式")
+            return None
+        
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        
+        try:
+            result = self.yaml.load(data)
+            logger.debug("成功解析YAML字节内容")
+            return result
+            
+        except _YAML_ERRORS as e:
+            logger.error(f"YAML字节内容解析错误: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"解析YAML字节内容时发生未知错误: {e}")
+            return None
+    
+    def load_from_stream(self, stream: Union[IO[str], IO[bytes]]) -> Optional[Dict[str, Any]]:
+        """从文件对象加载YAML内容
+        
+        不访问文件系统，适合内存中的数据（如io.BytesIO）。
+        
+        Args:
+            stream: 可读的文本或二进制文件对象
+            
+        Returns:
+            解析后的字典数据，失败时返回None
+        """
+        try:
+            data = self.yaml.load(stream)
+            logger.debug("成功解析YAML数据流")
+            return data
+            
+        except _YAML_ERRORS as e:
+            logger.error(f"YAML数据流解析错误: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"解析YAML数据流时发生未知错误: {e}")
+            return None
+    
     def save_to_file(self, data: Dict[str, Any], file_path: Union[str, Path]) -> bool:
         """将数据保存为YAML文件
         
@@ -108,12 +327,12 @@ class YAMLParser:
             logger.error(f"保存YAML文件时发生错误 {file_path}: {e}")
             return False
     
-    def validate_structure(self, data: Dict[str, Any], required_keys: list) -> bool:
+    def validate_structure(self, data: Dict[str, Any], required_keys: Iterable[str]) -> bool:
         """验证YAML数据结构
         
         Args:
             data: 要验证的数据
-            required_keys: 必需的键列表
+            required_keys: 必需的键，可以是任意可迭代对象
             
         Returns:
             验证通过返回True，失败返回False
@@ -122,14 +341,36 @@ class YAMLParser:
             logger.error("YAML数据不是字典格式")
             return False
             
-        missing_keys = [key for key in required_keys if key not in data]
-        if missing_keys:
-            logger.error(f"YAML数据缺少必需的键: {missing_keys}")
+        missing = missing_keys(data, required_keys)
+        if missing:
+            logger.error(f"YAML数据缺少必需的键: {sorted(missing, key=str)}")
             return False
             
         return True
 
 
+def missing_keys(data: Dict[str, Any], required_keys: Iterable[str]) -> FrozenSet[str]:
+    """返回数据中缺少的必需键
+    
+    必需键只物化为集合一次，与字典的键视图做集合差。
+    
+    Args:
+        data: 要检查的数据，不是字典时视为缺少全部键
+        required_keys: 必需的键，可以是任意可迭代对象
+        
+    Returns:
+        缺少的键集合，没有缺少时为空集合
+    """
+    required = frozenset(required_keys)
+    if not isinstance(data, dict):
+        return required
+    return required.difference(data)
+
+
+# 便捷函数共用的解析器
+_DEFAULT_PARSER = YAMLParser()
+
+
 def load_yaml_file(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
     """便捷函数：加载YAML文件
     
@@ -139,19 +380,17 @@ def load_yaml_file(file_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
     Returns:
         解析后的字典数据，失败时返回None
     """
-    parser = YAMLParser()
-    return parser.load_from_file(file_path)
+    return _DEFAULT_PARSER.load_from_file(file_path)
 
 
-def validate_yaml_keys(data: Dict[str, Any], required_keys: list) -> bool:
+def validate_yaml_keys(data: Dict[str, Any], required_keys: Iterable[str]) -> bool:
     """便捷函数：验证YAML数据键
     
     Args:
         data: 要验证的数据
-        required_keys: 必需的键列表
+        required_keys: 必需的键，可以是任意可迭代对象
         
     Returns:
         验证通过返回True，失败返回False
     """
-    parser = YAMLParser()
-    return parser.validate_structure(data, required_keys)
+    return _DEFAULT_PARSER.validate_structure(data, required_keys)
@@ -0,0 +1,79 @@
+"""测试用的轻量级替身对象
+
+提供基于真实NetworkX图的依赖图实现，供只关心图状态、不关心调用次数的测试使用。
+"""
+
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+
+
+class RealDependencyGraph:
+    """基于nx.DiGraph的依赖图替身
+
+    只实现GraphUpdateManager和FileChangeGraphUpdater实际调用的方法，
+    行为与DependencyGraph保持一致。
+    """
+
+    def __init__(self):
+        """初始化空的有向图"""
+        self.graph = nx.DiGraph()
+
+    def has_asset_node(self, guid: str) -> bool:
+        """检查节点是否存在"""
+        return guid in self.graph
+
+    def add_asset_node(self, guid: str, asset_data: Optional[Dict[str, Any]] = None) -> bool:
+        """添加资源节点"""
+        self.graph.add_node(guid, **(asset_data or {}))
+        return True
+
+    def remove_asset_node(self, guid: str) -> bool:
+        """移除资源节点"""
+        if guid not in self.graph:
+            return False
+        self.graph.remove_node(guid)
+        return True
+
+    def add_dependency_edge(self,
+                            source_guid: str,
+                            target_guid: str,
+                            dependency_data: Optional[Dict[str, Any]] = None) -> bool:
+        """添加依赖边"""
+        self.graph.add_edge(source_guid, target_guid, **(dependency_data or {}))
+        return True
+
+    def remove_dependency_edge(self, source_guid: str, target_guid: str) -> bool:
+        """移除依赖边"""
+        if not self.graph.has_edge(source_guid, target_guid):
+            return False
+        self.graph.remove_edge(source_guid, target_guid)
+        return True
+
+    def has_edge(self, source_guid: str, target_guid: str) -> bool:
+        """检查边是否存在"""
+        return self.graph.has_edge(source_guid, target_guid)
+
+    def get_node_data(self, guid: str) -> Optional[Dict[str, Any]]:
+        """获取节点数据"""
+        return self.graph.nodes.get(guid)
+
+    def get_edge_data(self, source_guid: str, target_guid: str) -> Optional[Dict[str, Any]]:
+        """获取边数据"""
+        return self.graph.get_edge_data(source_guid, target_guid)
+
+    def get_predecessors(self, guid: str) -> List[str]:
+        """获取前驱节点"""
+        if guid not in self.graph:
+            return []
+        return list(self.graph.predecessors(guid))
+
+    def get_successors(self, guid: str) -> List[str]:
+        """获取后继节点"""
+        if guid not in self.graph:
+            return []
+        return list(self.graph.successors(guid))
+
+    def find_circular_dependencies(self) -> List[List[str]]:
+        """查找循环依赖"""
+        return [list(cycle) for cycle in nx.simple_cycles(self.graph)]
@@ -3,30 +3,44 @@
 测试FileScanner和IncrementalFileScanner的功能。
 """
 
+import os
 import pytest
 import tempfile
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List
 from unittest.mock import Mock, patch
 
 from src.core.config import ScanConfig
 from src.core.scanner import FileScanner, IncrementalFileScanner, ScanResult, ProgressReporter
+from src.utils.path_utils import PathMatcher
+
+
+# 扫描配置是只读数据，模块内共享同一实例，避免每个测试重复构建和校验
+TEST_CONFIG = ScanConfig(
+    paths=["Assets", "Packages"],
+    file_extensions=[".prefab", ".scene", ".asset"],
+    exclude_paths=["Library/**", "Temp/**", "*.log"],
+    max_file_size_mb=50,
+    ignore_hidden_files=True
+)
+
+INCREMENTAL_TEST_CONFIG = ScanConfig(
+    paths=["Assets"],
+    file_extensions=[".prefab", ".scene"],
+    exclude_paths=["Library/**"],
+    max_file_size_mb=50,
+    ignore_hidden_files=True
+)
+
+# 固定时间点，时间相关断言不依赖系统时钟
+FIXED_START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
 
 class TestFileScanner:
     """FileScanner测试类"""
     
-    @pytest.fixture
-    def test_config(self):
-        """测试配置"""
-        return ScanConfig(
-            paths=["Assets", "Packages"],
-            file_extensions=[".prefab", ".scene", ".asset"],
-            exclude_paths=["Library/**", "Temp/**", "*.log"],
-            max_file_size_mb=50,
-            ignore_hidden_files=True
-        )
-    
     @pytest.fixture
     def temp_unity_project(self):
         """创建临时Unity项目结构"""
@@ -64,19 +78,19 @@ class TestFileScanner:
             
             yield project_path
     
-    def test_scanner_initialization(self, test_config):
+    def test_scanner_initialization(self):
         """测试扫描器初始化"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
-        assert scanner.config == test_config
+        assert scanner.config == TEST_CONFIG
         assert ".prefab" in scanner.file_extensions
         assert ".scene" in scanner.file_extensions
         assert ".asset" in scanner.file_extensions
         assert scanner.max_file_size == 50 * 1024 * 1024
     
-    def test_should_scan_file(self, test_config, temp_unity_project):
+    def test_should_scan_file(self, temp_unity_project):
         """测试文件过滤逻辑"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
         # 应该扫描的文件
         assert scanner._should_scan_file(temp_unity_project / "Assets" / "test.prefab")
@@ -87,12 +101,12 @@ class TestFileScanner:
         assert not scanner._should_scan_file(temp_unity_project / "Assets" / "test.txt")
         
         # 隐藏文件
-        if test_config.ignore_hidden_files:
+        if TEST_CONFIG.ignore_hidden_files:
             assert not scanner._should_scan_file(temp_unity_project / "Assets" / ".hidden.prefab")
     
-    def test_should_exclude_path(self, test_config, temp_unity_project):
+    def test_should_exclude_path(self, temp_unity_project):
         """测试路径排除逻辑"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
         # 应该排除的路径
         assert scanner._should_exclude_path(
@@ -110,9 +124,46 @@ class TestFileScanner:
             temp_unity_project
         )
     
-    def test_scan_project(self, test_config, temp_unity_project):
+    def test_should_exclude_path_many_paths(self):
+        """测试合并后的排除正则与逐个模式匹配结果一致"""
+        scanner = FileScanner(TEST_CONFIG)
+        base_path = Path("/project")
+        paths = [base_path / f"Assets/f{i}.prefab" for i in range(10000)]
+        paths += [base_path / f"Library/f{i}.prefab" for i in range(100)]
+        paths += [base_path / f"Assets/Logs/f{i}.log" for i in range(100)]
+        
+        matcher = scanner.exclude_matcher
+        assert matcher.combined_pattern is not None
+        
+        for path in paths:
+            relative = str(path.relative_to(base_path))
+            expected = any(p.match(relative) for p in matcher.compiled_patterns)
+            assert scanner._should_exclude_path(path, base_path) == expected
+        
+        excluded = [p for p in paths if scanner._should_exclude_path(p, base_path)]
+        assert len(excluded) == 200
+    
+    def test_path_matcher_backreferences(self):
+        """测试带数字反向引用的正则模式不参与合并，引用的仍是自身的组"""
+        matcher = PathMatcher([
+            "regex:(Temp)/.*",
+            "regex:Assets/(\\w+)/\\1\\.prefab",
+            "*.log",
+        ])
+        
+        assert matcher.matches("Assets/Hero/Hero.prefab")
+        assert not matcher.matches("Assets/Hero/Enemy.prefab")
+        assert matcher.matches("Temp/cache.bin")
+        assert matcher.matches("Logs/editor.log")
+        assert not matcher.matches("Assets/readme.txt")
+        
+        # 只有不含捕获组的glob模式被合并
+        assert matcher.combined_pattern is not None
+        assert len(matcher.separate_patterns) == 2
+    
+    def test_scan_project(self, temp_unity_project):
         """测试Unity项目扫描"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         result = scanner.scan_project(temp_unity_project)
         
         assert isinstance(result, ScanResult)
@@ -124,7 +175,7 @@ class TestFileScanner:
         assert result.success_rate > 0
         
         # 检查扫描到的文件
-        file_names = [f.name for f in result.file_paths]
+        file_names = {f.name for f in result.file_paths}
         assert "test.prefab" in file_names
         assert "test.scene" in file_names
         assert "test.asset" in file_names
@@ -136,9 +187,9 @@ class TestFileScanner:
         assert "excluded.prefab" not in file_names
         assert "temp.prefab" not in file_names
     
-    def test_scan_project_invalid_path(self, test_config):
+    def test_scan_project_invalid_path(self):
         """测试扫描无效项目路径"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
         with tempfile.TemporaryDirectory() as temp_dir:
             # 创建非Unity项目目录
@@ -147,9 +198,9 @@ class TestFileScanner:
             with pytest.raises(ValueError, match="不是有效的Unity项目"):
                 scanner.scan_project(invalid_path)
     
-    def test_progress_reporter(self, test_config, temp_unity_project):
+    def test_progress_reporter(self, temp_unity_project):
         """测试进度报告功能"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
         # 记录进度报告
         progress_reports = []
@@ -175,9 +226,9 @@ class TestFileScanner:
         assert last_report['finished']
         assert last_report['progress_percent'] == 100.0
     
-    def test_scan_paths(self, test_config, temp_unity_project):
+    def test_scan_paths(self, temp_unity_project):
         """测试指定路径扫描"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         
         # 扫描特定路径
         scan_paths = [temp_unity_project / "Assets"]
@@ -186,14 +237,14 @@ class TestFileScanner:
         assert isinstance(result, ScanResult)
         assert result.scanned_files > 0
         
-        # 检查所有文件都在Assets目录下，使用resolve()解决路径问题
-        assets_path = (temp_unity_project / "Assets").resolve()
+        # 检查所有文件都在Assets目录下；scan_paths已解析输入路径，只需解析一次前缀
+        assets_prefix = str((temp_unity_project / "Assets").resolve()) + os.sep
         for file_path in result.file_paths:
-            assert str(file_path.resolve()).startswith(str(assets_path))
+            assert str(file_path).startswith(assets_prefix)
     
-    def test_scanner_stats(self, test_config):
+    def test_scanner_stats(self):
         """测试扫描器统计信息"""
-        scanner = FileScanner(test_config)
+        scanner = FileScanner(TEST_CONFIG)
         stats = scanner.get_scanner_stats()
         
         assert 'file_extensions' in stats
@@ -206,6 +257,42 @@ class TestFileScanner:
         assert stats['max_file_size_mb'] == 50
 
 
+@pytest.fixture(scope="module")
+def large_unity_project(tmp_path_factory):
+    """创建包含10000个待扫描文件的Unity项目"""
+    project_path = tmp_path_factory.mktemp("large_unity_project")
+    (project_path / "ProjectSettings").mkdir()
+    (project_path / "ProjectSettings" / "ProjectVersion.txt").write_text("m_EditorVersion: 2022.3.0f1")
+    
+    assets_path = project_path / "Assets"
+    for dir_index in range(100):
+        sub_dir = assets_path / f"Dir{dir_index}"
+        sub_dir.mkdir(parents=True)
+        for file_index in range(100):
+            (sub_dir / f"f{file_index}.prefab").write_text("prefab")
+    
+    return project_path
+
+
+@pytest.mark.slow
+class TestFileScannerPerformance:
+    """FileScanner性能回归测试"""
+    
+    # 扫描10000个文件的时间上限（秒），远高于正常耗时，只用于捕获数量级的性能退化
+    SCAN_TIME_BUDGET = 10.0
+    
+    def test_scan_project_time_budget(self, large_unity_project):
+        """测试大项目扫描在时间预算内完成"""
+        scanner = FileScanner(TEST_CONFIG)
+        
+        start = time.perf_counter()
+        result = scanner.scan_project(large_unity_project)
+        elapsed = time.perf_counter() - start
+        
+        assert result.scanned_files == 10000
+        assert elapsed < self.SCAN_TIME_BUDGET
+
+
 class TestProgressReporter:
     """ProgressReporter测试类"""
     
@@ -246,17 +333,6 @@ class TestProgressReporter:
 class TestIncrementalFileScanner:
     """IncrementalFileScanner测试类"""
     
-    @pytest.fixture
-    def test_config(self):
-        """测试配置"""
-        return ScanConfig(
-            paths=["Assets"],
-            file_extensions=[".prefab", ".scene"],
-            exclude_paths=["Library/**"],
-            max_file_size_mb=50,
-            ignore_hidden_files=True
-        )
-    
     @pytest.fixture
     def temp_unity_project(self):
         """创建临时Unity项目"""
@@ -277,44 +353,36 @@ class TestIncrementalFileScanner:
             
             yield project_path
     
-    def test_incremental_scanner_initialization(self, test_config):
+    def test_incremental_scanner_initialization(self, tmp_path):
         """测试增量扫描器初始化"""
-        with tempfile.NamedTemporaryFile(delete=False) as cache_file:
-            cache_path = Path(cache_file.name)
-        
-        try:
-            scanner = IncrementalFileScanner(
-                test_config, 
-                cache_file=cache_path,
-                enable_checksum=True
-            )
-            
-            assert scanner.config == test_config
-            assert scanner.change_detector is not None
-            assert scanner.file_scanner is not None
-        finally:
-            cache_path.unlink(missing_ok=True)
+        cache_path = tmp_path / "cache.db"
+        
+        scanner = IncrementalFileScanner(
+            INCREMENTAL_TEST_CONFIG, 
+            cache_file=cache_path,
+            enable_checksum=True
+        )
+        
+        assert scanner.config == INCREMENTAL_TEST_CONFIG
+        assert scanner.change_detector is not None
+        assert scanner.file_scanner is not None
     
-    def test_full_scan(self, test_config, temp_unity_project):
+    def test_full_scan(self, temp_unity_project, tmp_path):
         """测试完全扫描"""
-        with tempfile.NamedTemporaryFile(delete=False) as cache_file:
-            cache_path = Path(cache_file.name)
+        cache_path = tmp_path / "cache.db"
         
-        try:
-            scanner = IncrementalFileScanner(test_config, cache_file=cache_path)
-            result = scanner.full_scan(temp_unity_project)
-            
-            assert isinstance(result, ScanResult)
-            assert result.scanned_files > 0
-            
-            # 检查缓存统计
-            cache_stats = scanner.get_cache_stats()
-            assert cache_stats['total_files'] > 0
-        finally:
-            cache_path.unlink(missing_ok=True)
+        scanner = IncrementalFileScanner(INCREMENTAL_TEST_CONFIG, cache_file=cache_path)
+        result = scanner.full_scan(temp_unity_project)
+        
+        assert isinstance(result, ScanResult)
+        assert result.scanned_files > 0
+        
+        # 检查缓存统计
+        cache_stats = scanner.get_cache_stats()
+        assert cache_stats['total_files'] > 0
     
     @patch('src.utils.file_watcher.IncrementalScanner')
-    def test_incremental_scan(self, mock_incremental_scanner, test_config, temp_unity_project):
+    def test_incremental_scan(self, mock_incremental_scanner, temp_unity_project, tmp_path):
         """测试增量扫描"""
         # 模拟增量扫描器
         mock_scanner_instance = Mock()
@@ -326,22 +394,18 @@ class TestIncrementalFileScanner:
         }
         mock_incremental_scanner.return_value = mock_scanner_instance
         
-        with tempfile.NamedTemporaryFile(delete=False) as cache_file:
-            cache_path = Path(cache_file.name)
+        cache_path = tmp_path / "cache.db"
         
-        try:
-            scanner = IncrementalFileScanner(test_config, cache_file=cache_path)
-            changes = scanner.incremental_scan(temp_unity_project)
-            
-            assert 'modified' in changes
-            assert 'new' in changes
-            assert 'deleted' in changes
-            
-            assert len(changes['modified']) == 1
-            assert len(changes['new']) == 1
-            assert len(changes['deleted']) == 0
-        finally:
-            cache_path.unlink(missing_ok=True)
+        scanner = IncrementalFileScanner(INCREMENTAL_TEST_CONFIG, cache_file=cache_path)
+        changes = scanner.incremental_scan(temp_unity_project)
+        
+        assert 'modified' in changes
+        assert 'new' in changes
+        assert 'deleted' in changes
+        
+        assert len(changes['modified']) == 1
+        assert len(changes['new']) == 1
+        assert len(changes['deleted']) == 0
 
 
 class TestScanResult:
@@ -349,10 +413,8 @@ class TestScanResult:
     
     def test_scan_result_properties(self):
         """测试ScanResult属性计算"""
-        from datetime import datetime, timezone
-        
-        start_time = datetime.now(timezone.utc)
-        end_time = datetime.now(timezone.utc)
+        start_time = FIXED_START_TIME
+        end_time = FIXED_START_TIME + timedelta(seconds=1)
         
         result = ScanResult(
             session_id="test_session",
@@ -365,8 +427,7 @@ class TestScanResult:
         )
         
         # 测试持续时间
-        assert result.duration is not None
-        assert result.duration >= 0
+        assert result.duration == 1.0
         
         # 测试成功率
         assert result.success_rate == 85.0  # (90-5)/100*100
@@ -1,8 +1,7 @@
 """测试图增量更新管理器功能"""
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch
-import networkx as nx
+from unittest.mock import Mock, MagicMock
 from datetime import datetime
 from pathlib import Path
 
@@ -11,200 +10,158 @@ from src.core.graph_update_manager import (
     FileChangeGraphUpdater,
     UpdateOperation,
     UpdateOperationType,
+    UpdateErrorCode,
     UpdateStatus,
     BatchUpdateTransaction,
     ConflictType,
     UpdateConflict
 )
+from src.parsers.base_parser import ParseResult, ParseResultType
+from src.parsers.meta_parser import MetaParser
+from src.utils.file_watcher import FileChanges
+from tests.unit.fakes import RealDependencyGraph
 
 
 class TestGraphUpdateManager:
     """图更新管理器测试"""
     
-    def setup_method(self):
-        """测试设置"""
-        # 模拟依赖图
-        self.mock_graph = Mock()
-        self.mock_graph.graph = nx.DiGraph()
+    @pytest.fixture
+    def mock_graph(self):
+        """模拟依赖图"""
+        # networkx只有这个夹具用到，在使用时才导入
+        import networkx as nx
+        
+        mock_graph = Mock()
+        mock_graph.graph = nx.DiGraph()
         
         # 添加一些测试节点和边
-        self.mock_graph.graph.add_node('node1', asset_type='prefab')
-        self.mock_graph.graph.add_node('node2', asset_type='script')
-        self.mock_graph.graph.add_edge('node1', 'node2', dependency_type='component')
+        mock_graph.graph.add_node('node1', asset_type='prefab')
+        mock_graph.graph.add_node('node2', asset_type='script')
+        mock_graph.graph.add_edge('node1', 'node2', dependency_type='component')
         
         # 模拟图方法
-        self.mock_graph.has_asset_node = Mock(side_effect=lambda guid: guid in self.mock_graph.graph.nodes)
-        self.mock_graph.add_asset_node = Mock(return_value=True)
-        self.mock_graph.remove_asset_node = Mock(return_value=True)
-        self.mock_graph.add_dependency_edge = Mock(return_value=True)
-        self.mock_graph.remove_dependency_edge = Mock(return_value=True)
-        self.mock_graph.has_edge = Mock(side_effect=lambda s, t: self.mock_graph.graph.has_edge(s, t))
-        self.mock_graph.get_node_data = Mock(side_effect=lambda n: self.mock_graph.graph.nodes[n] if n in self.mock_graph.graph.nodes else None)
-        self.mock_graph.get_edge_data = Mock(side_effect=lambda s, t: self.mock_graph.graph[s][t] if self.mock_graph.graph.has_edge(s, t) else None)
-        self.mock_graph.get_predecessors = Mock(side_effect=lambda n: list(self.mock_graph.graph.predecessors(n)))
-        self.mock_graph.get_successors = Mock(side_effect=lambda n: list(self.mock_graph.graph.successors(n)))
-        self.mock_graph.find_circular_dependencies = Mock(return_value=[])
-        
-        self.update_manager = GraphUpdateManager(self.mock_graph)
+        mock_graph.has_asset_node = Mock(side_effect=mock_graph.graph.has_node)
+        mock_graph.add_asset_node = Mock(return_value=True)
+        mock_graph.remove_asset_node = Mock(return_value=True)
+        mock_graph.add_dependency_edge = Mock(return_value=True)
+        mock_graph.remove_dependency_edge = Mock(return_value=True)
+        # 只读查询直接绑定到底层DiGraph，避免每次调用都经过Mock分发
+        graph = mock_graph.graph
+        mock_graph.has_edge = graph.has_edge
+        mock_graph.get_node_data = lambda n, g=graph: g.nodes.get(n)
+        mock_graph.get_edge_data = graph.get_edge_data
+        mock_graph.get_predecessors = lambda n, g=graph: list(g.predecessors(n))
+        mock_graph.get_successors = lambda n, g=graph: list(g.successors(n))
+        mock_graph.find_circular_dependencies = Mock(return_value=[])
+        return mock_graph
     
-    def test_add_node_success(self):
-        """测试成功添加节点"""
-        result = self.update_manager.add_node('new_node', {'asset_type': 'texture'})
-        
-        assert result is True
-        assert len(self.update_manager.update_history) == 1
-        
-        operation = self.update_manager.update_history[0]
-        assert operation.operation_type == UpdateOperationType.ADD_NODE
-        assert operation.target_id == 'new_node'
-        assert operation.status == UpdateStatus.APPLIED
-    
-    def test_add_existing_node_conflict(self):
-        """测试添加已存在节点的冲突"""
-        # 清空之前的操作历史和统计
-        self.update_manager.update_history.clear()
-        self.update_manager.stats['conflicts_detected'] = 0
-        self.update_manager.stats['failed_operations'] = 0
-        
-        # 先确保节点存在
-        self.mock_graph.has_asset_node.return_value = True
-        
-        result = self.update_manager.add_node('node1', {'asset_type': 'material'})
-        
-        assert result is False
-        assert len(self.update_manager.update_history) == 1
-        
-        operation = self.update_manager.update_history[0]
-        assert operation.status == UpdateStatus.FAILED
-        assert "检测到冲突" in operation.error_message
+    @pytest.fixture
+    def update_manager(self, mock_graph):
+        """图更新管理器"""
+        return GraphUpdateManager(mock_graph)
     
-    def test_remove_node_success(self):
-        """测试成功删除节点"""
-        result = self.update_manager.remove_node('node1')
+    @pytest.mark.parametrize("op,args,expected_type,expected_target", [
+        ("add_node", ('new_node', {'asset_type': 'texture'}), UpdateOperationType.ADD_NODE, 'new_node'),
+        ("remove_node", ('node1',), UpdateOperationType.REMOVE_NODE, 'node1'),
+        ("update_node", ('node1', {'asset_type': 'updated_prefab'}), UpdateOperationType.UPDATE_NODE, 'node1'),
+        ("add_edge", ('node2', 'node1', {'dependency_type': 'reference'}), UpdateOperationType.ADD_EDGE, 'node2->node1'),
+        ("remove_edge", ('node1', 'node2'), UpdateOperationType.REMOVE_EDGE, 'node1->node2'),
+    ])
+    def test_operation_success(self, update_manager, op, args, expected_type, expected_target):
+        """测试单个操作成功应用"""
+        result = getattr(update_manager, op)(*args)
         
         assert result is True
-        assert len(self.update_manager.update_history) == 1
+        assert len(update_manager.update_history) == 1
         
-        operation = self.update_manager.update_history[0]
-        assert operation.operation_type == UpdateOperationType.REMOVE_NODE
-        assert operation.target_id == 'node1'
+        operation = update_manager.update_history[0]
+        assert operation.operation_type == expected_type
+        assert operation.target_id == expected_target
         assert operation.status == UpdateStatus.APPLIED
     
-    def test_remove_nonexistent_node_conflict(self):
-        """测试删除不存在节点的冲突"""
-        result = self.update_manager.remove_node('nonexistent_node')
+    @pytest.mark.parametrize("op,args,expected_type", [
+        ("remove_node", ('nonexistent_node',), UpdateOperationType.REMOVE_NODE),
+        ("add_edge", ('node1', 'node2', {'dependency_type': 'duplicate'}), UpdateOperationType.ADD_EDGE),
+    ])
+    def test_operation_conflict(self, update_manager, op, args, expected_type):
+        """测试删除不存在节点、添加已存在边等冲突"""
+        result = getattr(update_manager, op)(*args)
         
         assert result is False
-        assert len(self.update_manager.update_history) == 1
+        assert len(update_manager.update_history) == 1
         
-        operation = self.update_manager.update_history[0]
+        operation = update_manager.update_history[0]
+        assert operation.operation_type == expected_type
         assert operation.status == UpdateStatus.FAILED
     
-    def test_update_node_success(self):
-        """测试成功更新节点"""
-        result = self.update_manager.update_node('node1', {'asset_type': 'updated_prefab'})
-        
-        assert result is True
-        assert len(self.update_manager.update_history) == 1
-        
-        operation = self.update_manager.update_history[0]
-        assert operation.operation_type == UpdateOperationType.UPDATE_NODE
-        assert operation.target_id == 'node1'
-        assert operation.status == UpdateStatus.APPLIED
-    
-    def test_add_edge_success(self):
-        """测试成功添加边"""
-        result = self.update_manager.add_edge('node2', 'node1', {'dependency_type': 'reference'})
+    def test_add_existing_node_conflict(self, update_manager, mock_graph):
+        """测试添加已存在节点的冲突"""
+        # 清空之前的操作历史和统计
+        update_manager.reset()
         
-        assert result is True
-        assert len(self.update_manager.update_history) == 1
+        # 先确保节点存在
+        mock_graph.has_asset_node.return_value = True
         
-        operation = self.update_manager.update_history[0]
-        assert operation.operation_type == UpdateOperationType.ADD_EDGE
-        assert operation.target_id == 'node2->node1'
-        assert operation.status == UpdateStatus.APPLIED
-    
-    def test_add_existing_edge_conflict(self):
-        """测试添加已存在边的冲突"""
-        result = self.update_manager.add_edge('node1', 'node2', {'dependency_type': 'duplicate'})
+        result = update_manager.add_node('node1', {'asset_type': 'material'})
         
         assert result is False
-        assert len(self.update_manager.update_history) == 1
+        assert len(update_manager.update_history) == 1
         
-        operation = self.update_manager.update_history[0]
+        operation = update_manager.update_history[0]
         assert operation.status == UpdateStatus.FAILED
+        assert operation.error_code is UpdateErrorCode.CONFLICT
     
-    def test_remove_edge_success(self):
-        """测试成功删除边"""
-        result = self.update_manager.remove_edge('node1', 'node2')
-        
-        assert result is True
-        assert len(self.update_manager.update_history) == 1
-        
-        operation = self.update_manager.update_history[0]
-        assert operation.operation_type == UpdateOperationType.REMOVE_EDGE
-        assert operation.target_id == 'node1->node2'
-        assert operation.status == UpdateStatus.APPLIED
-    
-    def test_batch_update_success(self):
+    def test_batch_update_success(self, update_manager):
         """测试成功的批量更新"""
-        with self.update_manager.batch_update() as batch:
+        with update_manager.batch_update() as batch:
             batch.add_node('batch_node1', {'asset_type': 'material'})
             batch.add_node('batch_node2', {'asset_type': 'shader'})
             batch.add_edge('batch_node1', 'batch_node2', {'dependency_type': 'material'})
         
-        assert len(self.update_manager.transaction_history) == 1
+        assert len(update_manager.transaction_history) == 1
         
-        transaction = self.update_manager.transaction_history[0]
+        transaction = update_manager.transaction_history[0]
         assert transaction.status == UpdateStatus.APPLIED
         assert len(transaction.operations) == 3
         assert len(transaction.applied_operations) == 3
     
-    def test_batch_update_rollback(self):
+    def test_batch_update_rollback(self, update_manager, mock_graph):
         """测试批量更新回滚"""
         # 模拟操作失败
-        self.mock_graph.add_asset_node.side_effect = [True, False, True]  # 第二个操作失败
+        mock_graph.add_asset_node.side_effect = [True, False, True]  # 第二个操作失败
         
         with pytest.raises(RuntimeError):
-            with self.update_manager.batch_update() as batch:
+            with update_manager.batch_update() as batch:
                 batch.add_node('batch_node1', {'asset_type': 'material'})
                 batch.add_node('batch_node2', {'asset_type': 'shader'})  # 这个会失败
                 batch.add_edge('batch_node1', 'batch_node2', {'dependency_type': 'material'})
         
-        assert len(self.update_manager.transaction_history) == 1
+        assert len(update_manager.transaction_history) == 1
         
-        transaction = self.update_manager.transaction_history[0]
+        transaction = update_manager.transaction_history[0]
         assert transaction.status == UpdateStatus.ROLLED_BACK
     
-    def test_circular_dependency_detection(self):
+    def test_circular_dependency_detection(self, update_manager, mock_graph):
         """测试循环依赖检测"""
         # 设置模拟返回循环依赖
-        self.mock_graph.find_circular_dependencies.return_value = [['node2', 'node1', 'node2']]
+        mock_graph.find_circular_dependencies.return_value = [['node2', 'node1', 'node2']]
         
-        result = self.update_manager.add_edge('node2', 'node1', {'dependency_type': 'circular'})
+        result = update_manager.add_edge('node2', 'node1', {'dependency_type': 'circular'})
         
         assert result is False
         
-        operation = self.update_manager.update_history[0]
+        operation = update_manager.update_history[0]
         assert operation.status == UpdateStatus.FAILED
-        assert "循环依赖" in operation.error_message
+        assert operation.error_code is UpdateErrorCode.CIRCULAR_DEPENDENCY
     
-    def test_stats_tracking(self):
+    def test_stats_tracking(self, update_manager, mock_graph):
         """测试统计信息跟踪"""
         # 重置统计
-        self.update_manager.stats = {
-            'total_operations': 0,
-            'successful_operations': 0,
-            'failed_operations': 0,
-            'transactions': 0,
-            'conflicts_detected': 0,
-            'cache_invalidations': 0
-        }
-        self.update_manager.update_history.clear()
+        update_manager.reset()
         
         # 执行一些操作
-        self.mock_graph.has_asset_node.return_value = False
-        self.update_manager.add_node('stat_node1', {'asset_type': 'texture'})
+        mock_graph.has_asset_node.return_value = False
+        update_manager.add_node('stat_node1', {'asset_type': 'texture'})
         
         # 设置特定节点的返回值来产生冲突
         def mock_has_node(guid):
@@ -212,87 +169,96 @@ class TestGraphUpdateManager:
                 return True
             return False
         
-        self.mock_graph.has_asset_node.side_effect = mock_has_node
-        self.update_manager.add_node('existing_node', {'asset_type': 'material'})  # 会失败，因为冲突
+        mock_graph.has_asset_node.side_effect = mock_has_node
+        update_manager.add_node('existing_node', {'asset_type': 'material'})  # 会失败，因为冲突
         
-        self.mock_graph.has_asset_node.return_value = False
-        self.mock_graph.has_edge.return_value = False
-        self.update_manager.add_edge('stat_node1', 'node1', {'dependency_type': 'reference'})
+        mock_graph.has_asset_node.return_value = False
+        update_manager.add_edge('stat_node1', 'node1', {'dependency_type': 'reference'})
         
-        stats = self.update_manager.get_stats()
+        stats = update_manager.get_stats()
         
         assert stats['total_operations'] == 3
         assert stats['successful_operations'] == 2
         assert stats['failed_operations'] == 1
         assert stats['success_rate'] == (2/3) * 100
     
-    def test_update_history(self):
+    def test_update_history(self, update_manager):
         """测试更新历史记录"""
         # 执行一些操作
-        self.update_manager.add_node('history_node1', {'asset_type': 'texture'})
-        self.update_manager.add_edge('history_node1', 'node1', {'dependency_type': 'reference'})
-        self.update_manager.update_node('node1', {'asset_type': 'updated_prefab'})
+        update_manager.add_node('history_node1', {'asset_type': 'texture'})
+        update_manager.add_edge('history_node1', 'node1', {'dependency_type': 'reference'})
+        update_manager.update_node('node1', {'asset_type': 'updated_prefab'})
         
         # 获取所有历史
-        all_history = self.update_manager.get_update_history()
+        all_history = update_manager.get_update_history()
         assert len(all_history) == 3
         
         # 获取限制数量的历史
-        limited_history = self.update_manager.get_update_history(limit=2)
+        limited_history = update_manager.get_update_history(limit=2)
         assert len(limited_history) == 2
         
         # 按类型过滤历史
-        node_operations = self.update_manager.get_update_history(
+        node_operations = update_manager.get_update_history(
             operation_type=UpdateOperationType.ADD_NODE
         )
         assert len(node_operations) == 1
         assert node_operations[0].operation_type == UpdateOperationType.ADD_NODE
 
+    
+    def test_reset(self, update_manager):
+        """测试重置历史和统计信息"""
+        update_manager.add_node('reset_node', {'asset_type': 'texture'})
+        with update_manager.batch_update() as batch:
+            batch.add_node('reset_batch_node', {'asset_type': 'material'})
+        
+        update_manager.reset()
+        
+        assert update_manager.update_history == []
+        assert update_manager.transaction_history == []
+        assert update_manager.get_stats()['total_operations'] == 0
+
 
 class TestFileChangeGraphUpdater:
     """文件变更图更新器测试"""
     
-    def setup_method(self):
-        """测试设置"""
-        # 模拟依赖图
-        self.mock_graph = Mock()
-        self.mock_graph.graph = nx.DiGraph()
-        self.mock_graph.has_asset_node = Mock(return_value=False)
-        self.mock_graph.add_asset_node = Mock(return_value=True)
-        self.mock_graph.remove_asset_node = Mock(return_value=True)
-        self.mock_graph.add_dependency_edge = Mock(return_value=True)
-        self.mock_graph.remove_dependency_edge = Mock(return_value=True)
-        self.mock_graph.has_edge = Mock(return_value=False)
-        self.mock_graph.get_node_data = Mock(return_value={})
-        self.mock_graph.get_edge_data = Mock(return_value={})
-        self.mock_graph.get_predecessors = Mock(return_value=[])
-        self.mock_graph.get_successors = Mock(return_value=[])
-        self.mock_graph.find_circular_dependencies = Mock(return_value=[])
-        
-        self.update_manager = GraphUpdateManager(self.mock_graph)
+    @pytest.fixture(scope="class")
+    @classmethod
+    def base_graph(cls):
+        """真实的依赖图替身，整个测试类共享同一个实例"""
+        return RealDependencyGraph()
+    
+    @pytest.fixture(autouse=True)
+    def setup_updater(self, base_graph):
+        """清空共享的依赖图并创建更新器"""
+        base_graph.graph.clear()
+        
+        self.graph = base_graph
+        self.update_manager = GraphUpdateManager(self.graph)
         self.file_updater = FileChangeGraphUpdater(self.update_manager)
     
-    @patch('src.parsers.meta_parser.MetaParser')
-    def test_process_new_files(self, mock_parser_class):
+    @pytest.fixture(autouse=True)
+    def mock_meta_parser(self, monkeypatch):
+        """模拟Meta解析器，所有测试共享同一个解析器实例"""
+        parser = Mock()
+        monkeypatch.setattr("src.parsers.meta_parser.MetaParser", lambda *args, **kwargs: parser)
+        return parser
+    
+    def test_process_new_files(self, mock_meta_parser):
         """测试处理新文件"""
-        # 模拟解析器
-        mock_parser = Mock()
-        mock_parser_class.return_value = mock_parser
-        
-        mock_meta_data = Mock()
-        mock_meta_data.guid = 'test_guid_123'
-        mock_meta_data.asset_type = 'texture'
-        mock_meta_data.file_id = 12345
-        mock_meta_data.import_settings = {}
-        
-        mock_parser.parse_file.return_value = mock_meta_data
+        mock_meta_parser.parse.return_value = ParseResult(
+            result_type=ParseResultType.SUCCESS,
+            file_path='/project/Assets/test.png.meta',
+            guid='test_guid_123',
+            asset_type='TEXTURE',
+            data={'importer_type': 'TextureImporter', 'importer_data': {}}
+        )
         
         # 处理新文件
-        changes = {
-            'new': [Path('/project/Assets/test.png.meta')],
-            'modified': [],
-            'deleted': []
-        }
+        changes = FileChanges(
+            new=[Path('/project/Assets/test.png.meta')],
+            modified=[],
+            deleted=[]
+        )
         
         result = self.file_updater.process_file_changes(changes)
         
@@ -301,17 +267,64 @@ class TestFileChangeGraphUpdater:
         assert result['new']['successful'] == 1
         assert result['new']['failed'] == 0
     
+    def test_meta_cache_dir_from_config(self, monkeypatch, tmp_path):
+        """测试：解析Meta文件时使用配置中的meta_cache_dir"""
+        from src.core.config import AppConfig
+        
+        config = AppConfig()
+        config.performance.meta_cache_dir = str(tmp_path / "meta_cache")
+        monkeypatch.setattr("src.core.config.get_config", lambda: config)
+        
+        created = []
+        monkeypatch.setattr(
+            "src.parsers.meta_parser.MetaParser",
+            lambda *args, **kwargs: created.append(kwargs) or Mock()
+        )
+        
+        self.file_updater._parse_asset_file(Path('/project/Assets/test.png.meta'))
+        self.file_updater._parse_asset_file(Path('/project/Assets/other.png.meta'))
+        assert created == [{'cache_dir': str(tmp_path / "meta_cache")}]
+    
+    def test_meta_cache_file_reused_by_new_updater(self, monkeypatch, tmp_path):
+        """测试：另一个更新器（如新进程）解析同一Meta文件时命中缓存文件"""
+        from src.core.config import AppConfig
+        
+        config = AppConfig()
+        config.performance.meta_cache_dir = str(tmp_path / "meta_cache")
+        monkeypatch.setattr("src.core.config.get_config", lambda: config)
+        monkeypatch.setattr("src.parsers.meta_parser.MetaParser", MetaParser)
+        
+        meta_path = tmp_path / "test.png.meta"
+        meta_path.write_text(
+            "fileFormatVersion: 2\n"
+            "guid: 3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e\n"
+            "TextureImporter:\n"
+            "  serializedVersion: 12\n",
+            encoding='utf-8'
+        )
+        
+        first = self.file_updater._parse_asset_file(meta_path)
+        assert first['guid'] == '3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e'
+        
+        updater = FileChangeGraphUpdater(self.update_manager)
+        parser = updater._get_meta_parser()
+        
+        def fail_load(path):
+            raise AssertionError("缓存命中时不应解析YAML")
+        
+        monkeypatch.setattr(parser.yaml_parser, "load_from_file", fail_load)
+        assert updater._parse_asset_file(meta_path) == first
+    
     def test_process_deleted_files(self):
         """测试处理删除文件"""
-        # 模拟查找GUID
-        self.file_updater._find_guid_by_path = Mock(return_value='deleted_guid_123')
-        self.mock_graph.has_asset_node.return_value = True
+        # 图中存在与被删除文件对应的节点
+        self.graph.add_asset_node('deleted_guid_123', {'file_path': '/project/Assets/deleted.png'})
         
-        changes = {
-            'new': [],
-            'modified': [],
-            'deleted': [Path('/project/Assets/deleted.png')]
-        }
+        changes = FileChanges(
+            new=[],
+            modified=[],
+            deleted=[Path('/project/Assets/deleted.png')]
+        )
         
         result = self.file_updater.process_file_changes(changes)
         
@@ -320,12 +333,40 @@ class TestFileChangeGraphUpdater:
         assert result['deleted']['successful'] == 1
         assert result['deleted']['failed'] == 0
     
+    def test_process_file_changes_dict(self):
+        """测试兼容字典格式的文件变更"""
+        self.graph.add_asset_node('deleted_guid_123', {'file_path': '/project/Assets/deleted.png'})
+        
+        result = self.file_updater.process_file_changes({
+            'deleted': [Path('/project/Assets/deleted.png')]
+        })
+        
+        assert result['new']['processed'] == 0
+        assert result['deleted']['successful'] == 1
+    
+    def test_process_file_changes_dict_order(self):
+        """测试字典格式的变更按调用方给出的键顺序处理"""
+        calls = []
+        for change_type in ('new', 'modified', 'deleted'):
+            self.file_updater.change_handlers[change_type] = (
+                lambda paths, batch, change_type=change_type: calls.append(change_type)
+                or {'processed': len(paths), 'successful': len(paths), 'failed': 0}
+            )
+        
+        self.file_updater.process_file_changes({
+            'deleted': [Path('/project/Assets/deleted.png')],
+            'new': [],
+            'modified': [Path('/project/Assets/modified.png')]
+        })
+        
+        assert calls == ['deleted', 'new', 'modified']
+    
     def test_find_guid_by_path(self):
         """测试根据路径查找GUID"""
         # 设置图中有节点
         test_path = '/project/Assets/test.png'
-        self.mock_graph.graph.add_node('test_guid', file_path=test_path)
-        self.mock_graph.get_node_data.return_value = {'file_path': test_path}
+        self.graph.add_asset_node('other_guid', {'file_path': '/project/Assets/other.png'})
+        self.graph.add_asset_node('test_guid', {'file_path': test_path})
         
         guid = self.file_updater._find_guid_by_path(Path(test_path))
         
@@ -341,55 +382,4 @@ class TestFileChangeGraphUpdater:
 
 
 if __name__ == "__main__":
-    # 运行简单的测试
-    test_manager = TestGraphUpdateManager()
-    test_manager.setup_method()
-    
-    print("运行图增量更新管理器测试...")
-    
-    # 基本功能测试
-    try:
-        test_manager.test_add_node_success()
-        print("✓ 添加节点测试通过")
-    except Exception as e:
-        print(f"✗ 添加节点测试失败: {e}")
-    
-    try:
-        test_manager.test_add_existing_node_conflict()
-        print("✓ 节点冲突检测测试通过")
-    except AssertionError as e:
-        print(f"✗ 节点冲突检测测试失败: {e}")
-    except Exception as e:
-        print(f"✗ 节点冲突检测测试异常: {e}")
-    
-    try:
-        test_manager.test_batch_update_success()
-        print("✓ 批量更新测试通过")
-    except Exception as e:
-        print(f"✗ 批量更新测试失败: {e}")
-    
-    try:
-        test_manager.test_stats_tracking()
-        print("✓ 统计信息跟踪测试通过")
-    except AssertionError as e:
-        print(f"✗ 统计信息跟踪测试失败: {e}")
-    except Exception as e:
-        print(f"✗ 统计信息跟踪测试异常: {e}")
-    
-    # 文件变更更新器测试
-    test_file_updater = TestFileChangeGraphUpdater()
-    test_file_updater.setup_method()
-    
-    try:
-        test_file_updater.test_find_guid_by_path()
-        print("✓ GUID查找测试通过")
-    except Exception as e:
-        print(f"✗ GUID查找测试失败: {e}")
-    
-    try:
-        test_file_updater.test_processing_stats()
-        print("✓ 处理统计信息测试通过")
-    except Exception as e:
-        print(f"✗ 处理统计信息测试失败: {e}")
-    
-    print("测试完成!")
+    pytest.main([__file__, "-v"])
@@ -3,123 +3,163 @@
 测试Unity Meta文件解析器的各种功能和边界情况。
 """
 
+import copy
+import functools
+import io
+import itertools
 import pytest
-import tempfile
+import yaml
+from datetime import date
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
 from src.parsers.meta_parser import MetaParser, MetaFileInfo, ImporterType
 from src.parsers.base_parser import ParseResultType
 from src.utils.yaml_utils import YAMLParser
 
 
+# 纹理Meta文件测试数据
+_TEXTURE_META_DATA: Dict[str, Any] = {
+    "fileFormatVersion": 2,
+    "guid": "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",
+    "TextureImporter": {
+        "internalIDToNameTable": [],
+        "externalObjects": {},
+        "serializedVersion": 12,
+        "mipmaps": {
+            "mipMapMode": 0,
+            "enableMipMap": 1
+        },
+        "textureFormat": 1,
+        "maxTextureSize": 2048,
+        "userData": "",
+        "assetBundleName": "",
+        "assetBundleVariant": ""
+    }
+}
+
+# 模型Meta文件测试数据
+_MODEL_META_DATA: Dict[str, Any] = {
+    "fileFormatVersion": 2,
+    "guid": "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d",
+    "ModelImporter": {
+        "serializedVersion": 21300,
+        "internalIDToNameTable": [],
+        "materials": {
+            "materialImportMode": 2
+        },
+        "animations": {
+            "legacyGenerateAnimations": 4
+        }
+    },
+    "userData": "test_data",
+    "assetBundleName": "test_bundle"
+}
+
+# 脚本Meta文件测试数据
+_SCRIPT_META_DATA: Dict[str, Any] = {
+    "fileFormatVersion": 2,
+    "guid": "6d4e2f1a8b9c0d3e6f2a5b8c1d4e7f0a",
+    "MonoImporter": {
+        "externalObjects": {},
+        "serializedVersion": 2,
+        "defaultReferences": [],
+        "executionOrder": 0,
+        "icon": {"instanceID": 0}
+    }
+}
+
+# 无效Meta文件测试数据
+_INVALID_META_DATA: Dict[str, Any] = {
+    "fileFormatVersion": 2,
+    "guid": "invalid-guid-format",  # 无效的GUID格式
+    "TextureImporter": {}
+}
+
+
+@pytest.fixture(scope="session")
+def sample_meta_yaml() -> Dict[str, bytes]:
+    """测试数据序列化后的YAML内容，每个测试会话只序列化一次"""
+    return {
+        name: yaml.safe_dump(data, sort_keys=False).encode("utf-8")
+        for name, data in (
+            ("texture", _TEXTURE_META_DATA),
+            ("model", _MODEL_META_DATA),
+            ("script", _SCRIPT_META_DATA),
+            ("invalid", _INVALID_META_DATA),
+        )
+    }
+
+
 class TestMetaParser:
     """Meta解析器测试类"""
     
+    # 写临时文件用的YAML解析器，所有测试共享一个实例
+    _yaml_parser = YAMLParser()
+    
     @pytest.fixture
     def meta_parser(self):
         """创建Meta解析器实例"""
         return MetaParser()
     
-    @pytest.fixture 
-    def strict_meta_parser(self):
-        """创建严格模式的Meta解析器实例"""
-        return MetaParser(strict_mode=True)
+    @pytest.fixture
+    def strict_parse_batch(self, meta_parser):
+        """同一解析器实例上的严格模式批量解析"""
+        return functools.partial(meta_parser.parse_batch, strict=True)
     
     @pytest.fixture
     def sample_texture_meta_data(self) -> Dict[str, Any]:
         """纹理Meta文件测试数据"""
-        return {
-            "fileFormatVersion": 2,
-            "guid": "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",
-            "TextureImporter": {
-                "internalIDToNameTable": [],
-                "externalObjects": {},
-                "serializedVersion": 12,
-                "mipmaps": {
-                    "mipMapMode": 0,
-                    "enableMipMap": 1
-                },
-                "textureFormat": 1,
-                "maxTextureSize": 2048,
-                "userData": "",
-                "assetBundleName": "",
-                "assetBundleVariant": ""
-            }
-        }
+        return copy.deepcopy(_TEXTURE_META_DATA)
     
     @pytest.fixture
     def sample_model_meta_data(self) -> Dict[str, Any]:
         """模型Meta文件测试数据"""
-        return {
-            "fileFormatVersion": 2,
-            "guid": "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d",
-            "ModelImporter": {
-                "serializedVersion": 21300,
-                "internalIDToNameTable": [],
-                "materials": {
-                    "materialImportMode": 2
-                },
-                "animations": {
-                    "legacyGenerateAnimations": 4
-                }
-            },
-            "userData": "test_data",
-            "assetBundleName": "test_bundle"
-        }
+        return copy.deepcopy(_MODEL_META_DATA)
     
     @pytest.fixture
     def sample_script_meta_data(self) -> Dict[str, Any]:
         """脚本Meta文件测试数据"""
-        return {
-            "fileFormatVersion": 2,
-            "guid": "6d4e2f1a8b9c0d3e6f2a5b8c1d4e7f0a",
-            "MonoImporter": {
-                "externalObjects": {},
-                "serializedVersion": 2,
-                "defaultReferences": [],
-                "executionOrder": 0,
-                "icon": {"instanceID": 0}
-            }
-        }
+        return copy.deepcopy(_SCRIPT_META_DATA)
     
     @pytest.fixture
     def invalid_meta_data(self) -> Dict[str, Any]:
         """无效Meta文件测试数据"""
-        return {
-            "fileFormatVersion": 2,
-            "guid": "invalid-guid-format",  # 无效的GUID格式
-            "TextureImporter": {}
-        }
+        return copy.deepcopy(_INVALID_META_DATA)
+    
+    @pytest.fixture(autouse=True)
+    def _temp_dir(self, tmp_path):
+        """每个测试使用独立的临时目录"""
+        self.tmp_path = tmp_path
+        self._temp_ids = itertools.count()
     
-    def create_temp_meta_file(self, data: Dict[str, Any]) -> Path:
-        """创建临时Meta文件"""
-        yaml_parser = YAMLParser()
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.meta', delete=False)
-        temp_path = Path(temp_file.name)
-        temp_file.close()
+    def create_temp_meta_file(self, data: Union[Dict[str, Any], bytes]) -> Path:
+        """创建临时Meta文件
         
-        yaml_parser.save_to_file(data, temp_path)
+        传入已序列化的YAML字节时直接写入，不再重复序列化。
+        """
+        temp_path = self.tmp_path / f"temp_{next(self._temp_ids)}.meta"
+        if isinstance(data, bytes):
+            temp_path.write_bytes(data)
+        else:
+            self._yaml_parser.save_to_file(data, temp_path)
         return temp_path
     
-    def test_can_parse_valid_meta_file(self, meta_parser, sample_texture_meta_data):
+    def create_meta_stream(self, data: Dict[str, Any]) -> io.StringIO:
+        """创建内存中的Meta内容，避免文件系统往返"""
+        return io.StringIO(yaml.safe_dump(data, sort_keys=False))
+    
+    def test_can_parse_valid_meta_file(self, meta_parser, sample_meta_yaml):
         """测试：能否识别有效的Meta文件"""
-        temp_path = self.create_temp_meta_file(sample_texture_meta_data)
-        try:
-            assert meta_parser.can_parse(temp_path) is True
-        finally:
-            temp_path.unlink()
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        assert meta_parser.can_parse(temp_path) is True
     
-    def test_cannot_parse_non_meta_file(self, meta_parser):
+    def test_cannot_parse_non_meta_file(self, meta_parser, tmp_path):
         """测试：不能解析非Meta文件"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
-        temp_path = Path(temp_file.name)
-        temp_file.close()
+        temp_path = tmp_path / "temp.txt"
+        temp_path.touch()
         
-        try:
-            assert meta_parser.can_parse(temp_path) is False
-        finally:
-            temp_path.unlink()
+        assert meta_parser.can_parse(temp_path) is False
     
     def test_cannot_parse_nonexistent_file(self, meta_parser):
         """测试：不能解析不存在的文件"""
@@ -133,59 +173,39 @@ class TestMetaParser:
     
     def test_parse_texture_meta_success(self, meta_parser, sample_texture_meta_data):
         """测试：成功解析纹理Meta文件"""
-        temp_path = self.create_temp_meta_file(sample_texture_meta_data)
-        try:
-            result = meta_parser.parse(temp_path)
-            
-            assert result.is_success is True
-            assert result.guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
-            assert result.asset_type == "TEXTURE"
-            assert result.data is not None
-            assert result.data['importer_type'] == ImporterType.TEXTURE_IMPORTER.value
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse_stream(self.create_meta_stream(sample_texture_meta_data))
+        
+        assert result.is_success is True
+        assert result.guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
+        assert result.asset_type == "TEXTURE"
+        assert result.data is not None
+        assert result.data['importer_type'] == ImporterType.TEXTURE_IMPORTER.value
     
     def test_parse_model_meta_success(self, meta_parser, sample_model_meta_data):
         """测试：成功解析模型Meta文件"""
-        temp_path = self.create_temp_meta_file(sample_model_meta_data)
-        try:
-            result = meta_parser.parse(temp_path)
-            
-            assert result.is_success is True
-            assert result.guid == "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d"
-            assert result.asset_type == "MODEL"
-            assert result.data['user_data'] == "test_data"
-            assert result.data['asset_bundle_name'] == "test_bundle"
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse_stream(self.create_meta_stream(sample_model_meta_data))
+        
+        assert result.is_success is True
+        assert result.guid == "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d"
+        assert result.asset_type == "MODEL"
+        assert result.data['user_data'] == "test_data"
+        assert result.data['asset_bundle_name'] == "test_bundle"
     
     def test_parse_script_meta_success(self, meta_parser, sample_script_meta_data):
         """测试：成功解析脚本Meta文件"""
-        temp_path = self.create_temp_meta_file(sample_script_meta_data)
-        try:
-            result = meta_parser.parse(temp_path)
-            
-            assert result.is_success is True
-            assert result.guid == "6d4e2f1a8b9c0d3e6f2a5b8c1d4e7f0a"
-            assert result.asset_type == "SCRIPT"
-            assert result.data['importer_type'] == ImporterType.MONO_IMPORTER.value
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse_stream(self.create_meta_stream(sample_script_meta_data))
+        
+        assert result.is_success is True
+        assert result.guid == "6d4e2f1a8b9c0d3e6f2a5b8c1d4e7f0a"
+        assert result.asset_type == "SCRIPT"
+        assert result.data['importer_type'] == ImporterType.MONO_IMPORTER.value
     
     def test_parse_invalid_guid_format(self, meta_parser, invalid_meta_data):
         """测试：解析无效GUID格式的Meta文件"""
-        temp_path = self.create_temp_meta_file(invalid_meta_data)
-        try:
-            result = meta_parser.parse(temp_path)
-            
-            assert result.is_failed is True
-            assert "无效的GUID格式" in result.error_message
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse_stream(self.create_meta_stream(invalid_meta_data))
+        
+        assert result.is_failed is True
+        assert "无效的GUID格式" in result.error_message
     
     def test_parse_missing_required_fields(self, meta_parser):
         """测试：解析缺少必需字段的Meta文件"""
@@ -193,31 +213,139 @@ class TestMetaParser:
             "fileFormatVersion": 2
             # 缺少 guid 字段
         }
-        temp_path = self.create_temp_meta_file(incomplete_data)
-        try:
-            result = meta_parser.parse(temp_path)
-            
-            assert result.is_failed is True
-            assert "缺少必需字段" in result.error_message
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse_stream(self.create_meta_stream(incomplete_data))
+        
+        assert result.is_failed is True
+        assert "缺少必需字段" in result.error_message
+    
+    def test_parse_stream_virtual_name(self, meta_parser, sample_texture_meta_data):
+        """测试：内存解析结果使用虚拟文件名"""
+        stream = self.create_meta_stream(sample_texture_meta_data)
+        result = meta_parser.parse_stream(stream, virtual_name="texture.png.meta")
+        
+        assert result.is_success is True
+        assert result.file_path == "texture.png.meta"
     
-    def test_parse_invalid_yaml_format(self, meta_parser):
+    def test_parse_invalid_yaml_format(self, meta_parser, tmp_path):
         """测试：解析无效YAML格式的文件"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.meta', delete=False)
-        temp_path = Path(temp_file.name)
+        temp_path = tmp_path / "invalid.meta"
         
         # 写入无效的YAML内容
-        temp_file.write("invalid: yaml: content:\n  - broken\n    - structure")
-        temp_file.close()
+        temp_path.write_text("invalid: yaml: content:\n  - broken\n    - structure")
         
-        try:
-            result = meta_parser.parse(temp_path)
-            assert result.is_failed is True
-            
-        finally:
-            temp_path.unlink()
+        result = meta_parser.parse(temp_path, use_cache=False)
+        assert result.is_failed is True
+    
+    def test_parse_without_cache_skips_cache_key(self, meta_parser, sample_meta_yaml, monkeypatch):
+        """测试：use_cache=False时不计算缓存键，缓存键使用绝对路径"""
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        key = meta_parser._parse_cache_key(temp_path)
+        assert key[0] == str(temp_path.absolute())
+        assert key[2] == temp_path.stat().st_size
+        
+        def fail_key(file_path):
+            raise AssertionError("跳过缓存时不应计算缓存键")
+        
+        monkeypatch.setattr(meta_parser, "_parse_cache_key", fail_key)
+        assert meta_parser.parse(temp_path, use_cache=False).is_success is True
+    
+    def test_parse_cache(self, meta_parser, sample_meta_yaml, monkeypatch):
+        """测试：未修改的文件命中解析缓存，修改后重新解析"""
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        loads = []
+        load_from_file = meta_parser.yaml_parser.load_from_file
+        monkeypatch.setattr(
+            meta_parser.yaml_parser, "load_from_file",
+            lambda path: loads.append(path) or load_from_file(path)
+        )
+        
+        first = meta_parser.parse(temp_path)
+        assert meta_parser.parse(temp_path) == first
+        assert len(loads) == 1
+        assert meta_parser.parse(temp_path, use_cache=False) == first
+        assert len(loads) == 2
+        
+        meta_parser.clear_cache()
+        meta_parser.parse(temp_path)
+        assert len(loads) == 3
+        
+        temp_path.write_bytes(sample_meta_yaml["model"])
+        updated = meta_parser.parse(temp_path)
+        assert updated.guid == "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d"
+    
+    def test_parse_cache_returns_copies(self, meta_parser, sample_meta_yaml):
+        """测试：修改解析结果不会影响缓存中的结果"""
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        first = meta_parser.parse(temp_path)
+        expected_data = copy.deepcopy(first.data)
+        expected_warnings = list(first.warnings)
+        
+        first.data["injected"] = True
+        first.add_warning("调用方添加的警告")
+        second = meta_parser.parse(temp_path)
+        assert second is not first
+        assert second.data == expected_data
+        assert second.warnings == expected_warnings
+        
+        second.data.clear()
+        second.guid = None
+        third = meta_parser.parse(temp_path)
+        assert third.data == expected_data
+        assert third.guid == first.guid
+    
+    def test_parse_cache_file(self, tmp_path, monkeypatch, sample_meta_yaml):
+        """测试：第二次解析命中缓存文件，不再解析YAML"""
+        cache_dir = tmp_path / "cache"
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        first = MetaParser(cache_dir=cache_dir).parse(temp_path)
+        assert first.is_success is True
+        assert len(list(cache_dir.iterdir())) == 1
+        
+        parser = MetaParser(cache_dir=cache_dir)
+        
+        def fail_load(path):
+            raise AssertionError("缓存命中时不应解析YAML")
+        
+        monkeypatch.setattr(parser.yaml_parser, "load_from_file", fail_load)
+        cached = parser.parse(temp_path)
+        
+        assert cached.is_success is True
+        assert cached.guid == first.guid
+        assert cached.asset_type == first.asset_type
+        assert cached.data == first.data
+        assert cached.warnings == first.warnings
+    
+    def test_parse_cache_file_model_importer(self, tmp_path, monkeypatch):
+        """测试：整数键和日期值经过缓存文件后保持不变"""
+        content = (
+            "fileFormatVersion: 2\n"
+            "guid: 8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d\n"
+            "timeCreated: 2024-01-02\n"
+            "ModelImporter:\n"
+            "  serializedVersion: 21300\n"
+            "  fileIDToRecycleName:\n"
+            "    100000: Root\n"
+            "    400000: //RootNode\n"
+            "  lastImported: 2023-05-06\n"
+        ).encode('utf-8')
+        cache_dir = tmp_path / "cache"
+        temp_path = self.create_temp_meta_file(content)
+        first = MetaParser(cache_dir=cache_dir).parse(temp_path)
+        assert first.is_success is True
+        assert len(list(cache_dir.iterdir())) == 1
+        
+        parser = MetaParser(cache_dir=cache_dir)
+        
+        def fail_load(path):
+            raise AssertionError("缓存命中时不应解析YAML")
+        
+        monkeypatch.setattr(parser.yaml_parser, "load_from_file", fail_load)
+        cached = parser.parse(temp_path)
+        
+        assert cached.data == first.data
+        recycle_names = cached.data['importer_data']['fileIDToRecycleName']
+        assert recycle_names == {100000: 'Root', 400000: '//RootNode'}
+        assert cached.data['importer_data']['lastImported'] == date(2023, 5, 6)
     
     def test_validate_guid_format(self, meta_parser):
         """测试：GUID格式验证"""
@@ -246,6 +374,24 @@ class TestMetaParser:
         for guid in invalid_guids:
             assert meta_parser._validate_guid(guid) is False
     
+    def test_validate_guid_matches_pattern(self, meta_parser):
+        """测试：GUID快速校验与正则表达式结果一致"""
+        guids = [
+            "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",
+            "0123456789abcdef0123456789ABCDEF",
+            "FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF",
+            "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8g",
+            "0x4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",  # 0x前缀
+            "3f4b8c2d_e7a9f6c8d2a4b5e7c9d1f8e",  # 下划线
+            "+f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",  # 正负号
+            " f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",  # 空白
+            "٣f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",  # 非ASCII数字
+        ]
+        
+        for guid in guids:
+            expected = MetaParser.GUID_PATTERN.match(guid) is not None
+            assert meta_parser._validate_guid(guid) is expected, guid
+    
     def test_detect_importer_type(self, meta_parser, sample_texture_meta_data):
         """测试：导入器类型检测"""
         importer_type, importer_data = meta_parser._detect_importer_type(sample_texture_meta_data)
@@ -268,15 +414,53 @@ class TestMetaParser:
         assert importer_type == ImporterType.UNKNOWN
         assert importer_data == {}
     
-    def test_extract_guid_only(self, meta_parser, sample_texture_meta_data):
+    def test_supported_importers_used_for_detection(self, meta_parser, sample_texture_meta_data):
+        """测试：导入器识别以实例的supported_importers为准"""
+        meta_parser.supported_importers.discard("TextureImporter")
+        
+        importer_type, importer_data = meta_parser._detect_importer_type(sample_texture_meta_data)
+        assert importer_type == ImporterType.UNKNOWN
+        assert importer_data == {}
+        
+        _, _, unknown_fields = meta_parser._scan_fields(sample_texture_meta_data)
+        assert unknown_fields == ["TextureImporter"]
+    
+    def test_unknown_importer_logged_once(self, meta_parser, caplog):
+        """测试：解析时只遍历一次字段，未知导入器的日志只记录一次"""
+        stream = self.create_meta_stream({
+            "fileFormatVersion": 2,
+            "guid": "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e",
+            "UnknownImporter": {"someProperty": "someValue"}
+        })
+        
+        with caplog.at_level("WARNING"):
+            result = meta_parser.parse_stream(stream)
+        
+        assert result.is_success is True
+        assert caplog.text.count("未能检测到已知的导入器类型") == 1
+    
+    def test_extract_guid_only(self, meta_parser, sample_meta_yaml):
         """测试：快速提取GUID功能"""
-        temp_path = self.create_temp_meta_file(sample_texture_meta_data)
-        try:
-            guid = meta_parser.extract_guid_only(temp_path)
-            assert guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
-            
-        finally:
-            temp_path.unlink()
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        guid = meta_parser.extract_guid_only(temp_path)
+        assert guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
+    
+    def test_extract_guid_only_full_scan(self, meta_parser, sample_meta_yaml):
+        """测试：完整扫描与头部快速路径结果一致"""
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        assert meta_parser.extract_guid_only(temp_path, full=True) == \
+            meta_parser.extract_guid_only(temp_path)
+    
+    def test_extract_guid_only_beyond_head(self, meta_parser):
+        """测试：guid不在文件头部时回退到逐行扫描"""
+        data = {
+            "fileFormatVersion": 2,
+            "userData": "x" * 1024,
+            "guid": "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
+        }
+        temp_path = self.create_temp_meta_file(data)
+        guid = meta_parser.extract_guid_only(temp_path)
+        assert guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
     
     def test_extract_guid_only_invalid_file(self, meta_parser):
         """测试：从无效文件快速提取GUID"""
@@ -305,6 +489,15 @@ class TestMetaParser:
         assert dict_data["guid"] == meta_info.guid
         assert dict_data["importer_type"] == ImporterType.TEXTURE_IMPORTER.value
         assert dict_data["user_data"] == "test_data"
+        
+        # slots数据类不带实例__dict__
+        assert not hasattr(meta_info, "__dict__")
+        assert MetaFileInfo(
+            guid=meta_info.guid,
+            file_format_version=2,
+            importer_type=ImporterType.TEXTURE_IMPORTER,
+            importer_data={}
+        ).user_data is None
     
     def test_importer_type_enum(self):
         """测试：导入器类型枚举"""
@@ -314,50 +507,100 @@ class TestMetaParser:
         
         unknown_importer = ImporterType.from_string("NonExistentImporter")
         assert unknown_importer == ImporterType.UNKNOWN
+        
+        # 每个成员都能通过自身的值取回
+        for importer_type in ImporterType:
+            assert ImporterType.from_string(importer_type.value) is importer_type
     
-    def test_batch_parsing(self, meta_parser, sample_texture_meta_data, sample_model_meta_data):
+    def test_batch_parsing(self, meta_parser, sample_meta_yaml):
         """测试：批量解析功能"""
-        temp_path1 = self.create_temp_meta_file(sample_texture_meta_data)
-        temp_path2 = self.create_temp_meta_file(sample_model_meta_data)
-        
-        try:
-            results = meta_parser.parse_batch([temp_path1, temp_path2])
-            
-            assert len(results) == 2
-            assert all(result.is_success for result in results)
-            
-            # 验证第一个结果（纹理）
-            assert results[0].asset_type == "TEXTURE"
-            assert results[0].guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
-            
-            # 验证第二个结果（模型）
-            assert results[1].asset_type == "MODEL"
-            assert results[1].guid == "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d"
-            
-        finally:
-            temp_path1.unlink()
-            temp_path2.unlink()
-    
-    def test_strict_mode_behavior(self, strict_meta_parser, sample_texture_meta_data, invalid_meta_data):
+        temp_path1 = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        temp_path2 = self.create_temp_meta_file(sample_meta_yaml["model"])
+        
+        results = meta_parser.parse_batch([temp_path1, temp_path2])
+        
+        assert len(results) == 2
+        assert all(result.is_success for result in results)
+        
+        # 验证第一个结果（纹理）
+        assert results[0].asset_type == "TEXTURE"
+        assert results[0].guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
+        
+        # 验证第二个结果（模型）
+        assert results[1].asset_type == "MODEL"
+        assert results[1].guid == "8a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d"
+    
+    def test_batch_parsing_parallel(self, meta_parser, sample_meta_yaml):
+        """测试：显式开启且超过阈值时使用多进程批量解析，结果顺序与输入一致"""
+        meta_parser.PARALLEL_BATCH_THRESHOLD = 1
+        temp_path1 = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        temp_path2 = self.create_temp_meta_file(sample_meta_yaml["invalid"])
+        temp_path3 = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        
+        results = meta_parser.parse_batch([temp_path1, temp_path2, temp_path3], parallel=True)
+        
+        assert [result.file_path for result in results] == [
+            str(temp_path1), str(temp_path2), str(temp_path3)
+        ]
+        assert results[0].is_success is True
+        assert results[1].is_failed is True
+        assert results[2].guid == "3f4b8c2d1e7a9f6c8d2a4b5e7c9d1f8e"
+    
+    def test_strict_mode_behavior(self, strict_parse_batch, sample_meta_yaml):
         """测试：严格模式行为"""
-        temp_path1 = self.create_temp_meta_file(sample_texture_meta_data)
-        temp_path2 = self.create_temp_meta_file(invalid_meta_data)
-        
-        try:
-            # 严格模式下，遇到错误应该停止
-            results = strict_meta_parser.parse_batch([temp_path1, temp_path2])
-            
-            # 第一个文件应该成功解析
-            assert len(results) >= 1
-            assert results[0].is_success is True
-            
-            # 如果有第二个结果，应该是失败的
-            if len(results) > 1:
-                assert results[1].is_failed is True
-                
-        finally:
-            temp_path1.unlink()
-            temp_path2.unlink()
+        temp_path1 = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        temp_path2 = self.create_temp_meta_file(sample_meta_yaml["invalid"])
+        
+        # 严格模式下，遇到错误应该停止
+        results = strict_parse_batch([temp_path1, temp_path2])
+        
+        # 第一个文件应该成功解析
+        assert len(results) >= 1
+        assert results[0].is_success is True
+        
+        # 如果有第二个结果，应该是失败的
+        if len(results) > 1:
+            assert results[1].is_failed is True
+    
+    def test_batch_parallel_opt_in(self, meta_parser, monkeypatch, sample_meta_yaml):
+        """测试：进程池默认关闭，只有显式开启时才使用"""
+        meta_parser.PARALLEL_BATCH_THRESHOLD = 0
+        assert meta_parser.PARALLEL_BATCH is False
+        
+        def fail_parallel(file_paths):
+            raise AssertionError("未开启时不应并行解析")
+        
+        monkeypatch.setattr(meta_parser, "_parse_batch_parallel", fail_parallel)
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        results = meta_parser.parse_batch([temp_path])
+        assert len(results) == 1
+        assert results[0].is_success is True
+        
+        parallel_calls = []
+        monkeypatch.setattr(
+            meta_parser, "_parse_batch_parallel",
+            lambda file_paths: parallel_calls.append(file_paths) or []
+        )
+        meta_parser.parse_batch([temp_path], parallel=True)
+        assert parallel_calls == []
+        
+        # 至少两个文件才交给进程池
+        meta_parser.parse_batch([temp_path, temp_path], parallel=True)
+        assert parallel_calls == [[temp_path, temp_path]]
+    
+    def test_strict_batch_stays_serial(self, meta_parser, monkeypatch, sample_meta_yaml):
+        """测试：strict参数覆盖解析器设置，严格批量解析不使用进程池"""
+        meta_parser.PARALLEL_BATCH_THRESHOLD = 0
+        
+        def fail_parallel(file_paths):
+            raise AssertionError("严格模式不应并行解析")
+        
+        monkeypatch.setattr(meta_parser, "_parse_batch_parallel", fail_parallel)
+        temp_path = self.create_temp_meta_file(sample_meta_yaml["texture"])
+        results = meta_parser.parse_batch([temp_path], strict=True, parallel=True)
+        assert len(results) == 1
+        assert results[0].is_success is True
+        assert meta_parser.strict_mode is False
     
     def test_check_potential_issues(self, meta_parser):
         """测试：潜在问题检查"""
@@ -384,6 +627,10 @@ class TestMetaParser:
         assert "导入器数据为空" in warning_text
         assert "文件格式版本较旧" in warning_text
         assert "发现未知字段" in warning_text
+        
+        # 相同结构签名复用缓存的警告，返回的列表互不影响
+        warnings.append("extra")
+        assert meta_parser._check_potential_issues(meta_info, raw_data) == warnings[:-1]
     
     def test_get_parser_stats(self, meta_parser):
         """测试：获取解析器统计信息"""
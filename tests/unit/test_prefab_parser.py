@@ -3,12 +3,15 @@
 测试PrefabParser的功能。
 """
 
+import io
+import json
 import pytest
-import tempfile
 from pathlib import Path
 from typing import Dict, List
 
-from src.parsers.prefab_parser import PrefabParser, create_prefab_parser, GameObjectInfo, ReferenceInfo
+from src.parsers.prefab_parser import (
+    PrefabParser, create_prefab_parser, GameObjectInfo, GameObjectTable, ReferenceInfo
+)
 from src.parsers.base_parser import ParseResultType
 
 
@@ -73,14 +76,11 @@ MeshRenderer:
 '''
     
     @pytest.fixture
-    def temp_prefab_file(self, sample_prefab_content):
+    def temp_prefab_file(self, tmp_path, sample_prefab_content):
         """创建临时Prefab文件"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.prefab', delete=False) as f:
-            f.write(sample_prefab_content)
-            temp_path = Path(f.name)
-        
-        yield temp_path
-        temp_path.unlink(missing_ok=True)
+        temp_path = tmp_path / "sample.prefab"
+        temp_path.write_text(sample_prefab_content)
+        return temp_path
     
     def test_parser_initialization(self):
         """测试解析器初始化"""
@@ -136,14 +136,10 @@ MeshRenderer:
         game_objects = data['game_objects']
         assert len(game_objects) > 0
         
-        # 查找测试对象
-        test_obj = None
-        for obj in game_objects:
-            if isinstance(obj, dict) and obj.get('name') == 'TestObject':
-                test_obj = obj
-                break
-        
-        assert test_obj is not None
+        # 通过名称索引查找测试对象
+        test_obj = data['game_objects_by_name']['TestObject'][0]
+        assert isinstance(test_obj, dict)
+        assert data['game_objects_by_file_id']['1234567890'] == test_obj
         assert test_obj['file_id'] == '1234567890'
         assert test_obj['name'] == 'TestObject'
         assert test_obj['tag'] == 'Untagged'
@@ -170,6 +166,109 @@ MeshRenderer:
         assert material_ref['type'] == 2  # Material类型
         assert material_ref['reference_type'] == 'Material'
     
+    def test_parse_stream(self, sample_prefab_content):
+        """测试从内存文件对象解析Prefab内容"""
+        parser = PrefabParser()
+        result = parser.parse_stream(io.StringIO(sample_prefab_content), virtual_name='memory.prefab')
+        
+        assert result.is_success
+        assert result.file_path == 'memory.prefab'
+        assert result.asset_type == "Prefab"
+        assert result.data['total_references'] > 0
+    
+    def test_game_object_indexes(self):
+        """测试重名GameObject在名称索引中都能找到"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &100
+GameObject:
+  m_Name: Dup
+  m_Component: []
+--- !u!1 &200
+GameObject:
+  m_Name: Dup
+  m_Component: []
+"""
+        result = PrefabParser().parse_stream(io.StringIO(content))
+        
+        assert result.is_success
+        duplicates = result.data['game_objects_by_name']['Dup']
+        assert [obj['file_id'] for obj in duplicates] == ['100', '200']
+        assert result.data['game_objects_by_file_id']['200'] is duplicates[1]
+    
+    def test_parse_result_json_serializable(self):
+        """测试Prefab解析结果可以直接JSON序列化"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &100
+GameObject:
+  m_Name: Root
+  m_Component:
+  - component: {fileID: 101}
+--- !u!4 &101
+Transform:
+  m_GameObject: {fileID: 100}
+  m_Father: {fileID: 0}
+  m_Children: []
+"""
+        result = PrefabParser().parse_stream(io.StringIO(content))
+        
+        assert result.is_success
+        dumped = json.loads(json.dumps(result.to_dict()))
+        assert dumped['data']['game_objects'] == result.data['game_objects']
+        assert dumped['data']['game_objects_by_name']['Root'][0]['file_id'] == '100'
+    
+    def test_split_documents(self, sample_prefab_content):
+        """测试按文档头切分而不解析文档内容"""
+        parser = PrefabParser()
+        documents = parser._split_documents(
+            sample_prefab_content + "--- !u!1001 &1234567893 stripped\nPrefabInstance:\n"
+        )
+        
+        assert [(class_id, file_id) for class_id, file_id, _ in documents] == [
+            ('1', '1234567890'),
+            ('4', '1234567891'),
+            ('23', '1234567892'),
+            ('1001', '1234567893'),
+        ]
+        assert documents[0][2].startswith('GameObject:\n')
+        assert documents[-1][2] == 'PrefabInstance:\n'
+    
+    def test_game_object_table(self):
+        """测试GameObject列式存储的读取方式"""
+        table = GameObjectTable.from_objects([
+            GameObjectInfo(file_id='100', name='Parent', components=[], children=['200']),
+            GameObjectInfo(file_id='200', name='Child', components=[], children=[],
+                           parent='100', layer=5, tag='Player', active=False),
+        ])
+        
+        assert len(table) == 2
+        assert [obj['name'] for obj in table] == ['Parent', 'Child']
+        assert table.index_of_name('Missing') == -1
+        
+        child = table.find_by_name('Child')
+        assert child['file_id'] == '200'
+        assert child['parent'] == '100'
+        assert child['layer'] == 5
+        assert child['tag'] == 'Player'
+        assert child['active'] is False
+        assert child.get('missing') is None
+        assert table[-1] == child
+        assert table.to_list()[0] == {
+            'file_id': '100', 'name': 'Parent', 'components': [], 'children': ['200'],
+            'parent': None, 'layer': 0, 'tag': 'Untagged', 'active': True
+        }
+    
+    def test_game_object_table_negative_file_id(self):
+        """测试GameObject表接受负的fileID（剥离对象和Prefab实例对象）"""
+        table = GameObjectTable.from_objects([
+            GameObjectInfo(file_id='-4216859302048453862', name='Stripped', components=[], children=[]),
+            GameObjectInfo(file_id='9223372036854775807', name='Max', components=[], children=[]),
+        ])
+        
+        assert table.find_by_name('Stripped')['file_id'] == '-4216859302048453862'
+        assert table.find_by_name('Max')['file_id'] == '9223372036854775807'
+    
     def test_parse_nonexistent_file(self):
         """测试解析不存在的文件"""
         parser = PrefabParser()
@@ -178,22 +277,17 @@ MeshRenderer:
         assert result.is_failed
         assert "文件路径验证失败" in result.error_message
     
-    def test_parse_invalid_prefab(self):
+    def test_parse_invalid_prefab(self, tmp_path):
         """测试解析无效的Prefab文件"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.prefab', delete=False) as f:
-            f.write("Invalid YAML content {")
-            temp_path = Path(f.name)
-        
-        try:
-            parser = PrefabParser()
-            result = parser.parse(temp_path)
-            
-            # 应该失败但不抛出异常
-            assert result.is_failed
-            assert result.error_message is not None
-            
-        finally:
-            temp_path.unlink(missing_ok=True)
+        temp_path = tmp_path / "invalid.prefab"
+        temp_path.write_text("Invalid YAML content {")
+        
+        parser = PrefabParser()
+        result = parser.parse(temp_path)
+        
+        # 应该失败但不抛出异常
+        assert result.is_failed
+        assert result.error_message is not None
     
     def test_extract_asset_references(self, temp_prefab_file):
         """测试提取资源引用"""
@@ -206,6 +300,51 @@ MeshRenderer:
         # 确保没有包含全零GUID
         assert '00000000000000000000000000000000' not in guids
     
+    def test_extract_asset_references_without_full_parse(self, tmp_path):
+        """测试提取资源引用不依赖完整的YAML解析"""
+        content = (
+            "--- !u!23 &1\n"
+            "MeshRenderer:\n"
+            "  m_Materials:\n"
+            "  - {fileID: 2100000, guid: abcdef1234567890abcdef1234567890, type: 2}\n"
+            "  - {fileID: 2100000, guid: abcdef1234567890abcdef1234567890, type: 2}\n"
+            "  m_Script: {fileID: 11500000, guid: 00000000000000000000000000000000, type: 3}\n"
+            "  broken: {\n"
+        )
+        temp_path = tmp_path / "references.prefab"
+        temp_path.write_text(content)
+        
+        parser = PrefabParser()
+        guids = parser.extract_asset_references(temp_path)
+        
+        assert guids == ['abcdef1234567890abcdef1234567890']
+    
+    def test_extract_asset_references_reference_shape(self, tmp_path):
+        """测试只提取{fileID, guid, type}形式的引用，GUID不区分大小写"""
+        content = (
+            "--- !u!114 &1\n"
+            "MonoBehaviour:\n"
+            "  m_Script: {fileID: 11500000, guid: ABCDEF1234567890ABCDEF1234567890, type: 3}\n"
+            "  assetGuid:\n"
+            "    guid: 0123456789abcdef0123456789abcdef\n"
+            "  bundleGuid: {guid: fedcba9876543210fedcba9876543210}\n"
+        )
+        temp_path = tmp_path / "shapes.prefab"
+        temp_path.write_text(content)
+        
+        parser = PrefabParser()
+        guids = parser.extract_asset_references(temp_path)
+        
+        assert guids == ['ABCDEF1234567890ABCDEF1234567890']
+    
+    def test_extract_asset_references_empty_file(self, tmp_path):
+        """测试空Prefab文件没有资源引用"""
+        temp_path = tmp_path / "empty.prefab"
+        temp_path.touch()
+        
+        parser = PrefabParser()
+        assert parser.extract_asset_references(temp_path) == []
+    
     def test_get_prefab_hierarchy(self, temp_prefab_file):
         """测试获取Prefab层次结构"""
         parser = PrefabParser()
@@ -238,28 +377,23 @@ MeshRenderer:
         assert isinstance(strict_parser, PrefabParser)
         assert strict_parser.strict_mode
     
-    def test_batch_parsing(self, temp_prefab_file):
+    def test_batch_parsing(self, tmp_path, temp_prefab_file):
         """测试批量解析"""
         parser = PrefabParser()
         
         # 创建另一个临时文件
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.prefab', delete=False) as f:
-            f.write("%YAML 1.1\n--- !u!1 &123\nGameObject:\n  m_Name: Simple")
-            temp_path2 = Path(f.name)
-        
-        try:
-            results = parser.parse_batch([temp_prefab_file, temp_path2])
-            
-            assert len(results) == 2
-            assert all(isinstance(result.file_path, str) for result in results)
-            
-            # 第一个文件应该成功解析
-            assert results[0].is_success
-            
-        finally:
-            temp_path2.unlink(missing_ok=True)
+        temp_path2 = tmp_path / "simple.prefab"
+        temp_path2.write_text("%YAML 1.1\n--- !u!1 &123\nGameObject:\n  m_Name: Simple")
+        
+        results = parser.parse_batch([temp_prefab_file, temp_path2])
+        
+        assert len(results) == 2
+        assert all(isinstance(result.file_path, str) for result in results)
+        
+        # 第一个文件应该成功解析
+        assert results[0].is_success
     
-    def test_complex_prefab_structure(self):
+    def test_complex_prefab_structure(self, tmp_path):
         """测试复杂Prefab结构解析"""
         complex_content = '''%YAML 1.1
 %TAG !u! tag:unity3d.com,2011:
@@ -295,46 +429,42 @@ Transform:
   m_Father: {fileID: 101}
 '''
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.prefab', delete=False) as f:
-            f.write(complex_content)
-            temp_path = Path(f.name)
-        
-        try:
-            parser = PrefabParser()
-            result = parser.parse(temp_path)
-            
-            assert result.is_success
-            data = result.data
-            
-            # 验证GameObject数量
-            assert data['total_objects'] == 3
-            
-            # 验证层次结构
-            game_objects = data['game_objects']
-            obj_names = [obj['name'] for obj in game_objects if isinstance(obj, dict)]
-            assert 'Parent' in obj_names
-            assert 'Child1' in obj_names
-            assert 'Child2' in obj_names
-            
-            # 验证组件引用
-            component_refs = data['component_references']
-            assert len(component_refs) > 0
-            
-            # 应该有父子关系
-            parent_relations = [
-                ref for ref in component_refs 
-                if isinstance(ref, dict) and ref.get('relationship') == 'parent'
-            ]
-            child_relations = [
-                ref for ref in component_refs 
-                if isinstance(ref, dict) and ref.get('relationship') == 'child'
-            ]
-            
-            assert len(parent_relations) == 2  # Child1和Child2都有父对象
-            assert len(child_relations) == 2   # Parent有两个子对象
-            
-        finally:
-            temp_path.unlink(missing_ok=True)
+        temp_path = tmp_path / "complex.prefab"
+        temp_path.write_text(complex_content)
+        
+        parser = PrefabParser()
+        result = parser.parse(temp_path)
+        
+        assert result.is_success
+        data = result.data
+        
+        # 验证GameObject数量
+        assert data['total_objects'] == 3
+        
+        # 验证层次结构
+        game_objects = data['game_objects']
+        assert len(game_objects) == 3
+        by_name = data['game_objects_by_name']
+        assert 'Parent' in by_name
+        assert 'Child1' in by_name
+        assert 'Child2' in by_name
+        
+        # 验证组件引用
+        component_refs = data['component_references']
+        assert len(component_refs) > 0
+        
+        # 应该有父子关系
+        parent_relations = [
+            ref for ref in component_refs 
+            if isinstance(ref, dict) and ref.get('relationship') == 'parent'
+        ]
+        child_relations = [
+            ref for ref in component_refs 
+            if isinstance(ref, dict) and ref.get('relationship') == 'child'
+        ]
+        
+        assert len(parent_relations) == 2  # Child1和Child2都有父对象
+        assert len(child_relations) == 2   # Parent有两个子对象
     
     def test_parser_info(self):
         """测试解析器信息"""
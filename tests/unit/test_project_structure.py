@@ -1,5 +1,6 @@
 """测试项目基础架构是否正确搭建"""
 
+import os
 import sys
 from pathlib import Path
 
@@ -9,50 +10,69 @@ import pytest
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
+# 结构检查只涉及三层以内的路径（如src/core/__init__.py）
+_MAX_SCAN_DEPTH = 3
 
-def test_project_structure():
-    """测试项目目录结构是否完整"""
-    project_root = Path(__file__).parent.parent.parent
 
+def _scan_tree(root: Path, max_depth: int) -> set:
+    """用os.scandir收集root下的相对路径（以/分隔），跳过.git目录"""
+    paths = set()
+    pending = [(str(root), "", 1)]
+    while pending:
+        directory, prefix, depth = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative = prefix + entry.name
+                paths.add(relative)
+                if (depth < max_depth and entry.name != ".git"
+                        and entry.is_dir(follow_symlinks=False)):
+                    pending.append((entry.path, relative + "/", depth + 1))
+    return paths
+
+
+@pytest.fixture(scope="module")
+def project_files():
+    """项目根目录下的相对路径集合，每个模块只扫描一次"""
+    return _scan_tree(project_root, _MAX_SCAN_DEPTH)
+
+
+def test_project_structure(project_files):
+    """测试项目目录结构是否完整"""
     # 检查主要目录
-    assert (project_root / "src").exists()
-    assert (project_root / "src" / "core").exists()
-    assert (project_root / "src" / "parsers").exists()
-    assert (project_root / "src" / "models").exists()
-    assert (project_root / "src" / "utils").exists()
-    assert (project_root / "src" / "cli").exists()
-    assert (project_root / "src" / "api").exists()
-
-    assert (project_root / "config").exists()
-    assert (project_root / "tests").exists()
-    assert (project_root / "tests" / "unit").exists()
-    assert (project_root / "tests" / "integration").exists()
-    assert (project_root / "tests" / "fixtures").exists()
-    assert (project_root / "docs").exists()
-
-
-def test_config_files_exist():
+    assert "src" in project_files
+    assert "src/core" in project_files
+    assert "src/parsers" in project_files
+    assert "src/models" in project_files
+    assert "src/utils" in project_files
+    assert "src/cli" in project_files
+    assert "src/api" in project_files
+
+    assert "config" in project_files
+    assert "tests" in project_files
+    assert "tests/unit" in project_files
+    assert "tests/integration" in project_files
+    assert "tests/fixtures" in project_files
+    assert "docs" in project_files
+
+
+def test_config_files_exist(project_files):
     """测试配置文件是否存在"""
-    project_root = Path(__file__).parent.parent.parent
-
-    assert (project_root / "pyproject.toml").exists()
-    assert (project_root / "config" / "default.yaml").exists()
-    assert (project_root / "config" / "schema.json").exists()
-    assert (project_root / ".pre-commit-config.yaml").exists()
-    assert (project_root / "pytest.ini").exists()
+    assert "pyproject.toml" in project_files
+    assert "config/default.yaml" in project_files
+    assert "config/schema.json" in project_files
+    assert ".pre-commit-config.yaml" in project_files
+    assert "pytest.ini" in project_files
 
 
-def test_init_files_exist():
+def test_init_files_exist(project_files):
     """测试__init__.py文件是否存在"""
-    project_root = Path(__file__).parent.parent.parent
-
-    assert (project_root / "src" / "__init__.py").exists()
-    assert (project_root / "src" / "core" / "__init__.py").exists()
-    assert (project_root / "src" / "parsers" / "__init__.py").exists()
-    assert (project_root / "src" / "models" / "__init__.py").exists()
-    assert (project_root / "src" / "utils" / "__init__.py").exists()
-    assert (project_root / "src" / "cli" / "__init__.py").exists()
-    assert (project_root / "src" / "api" / "__init__.py").exists()
+    assert "src/__init__.py" in project_files
+    assert "src/core/__init__.py" in project_files
+    assert "src/parsers/__init__.py" in project_files
+    assert "src/models/__init__.py" in project_files
+    assert "src/utils/__init__.py" in project_files
+    assert "src/cli/__init__.py" in project_files
+    assert "src/api/__init__.py" in project_files
 
 
 def test_module_imports():
@@ -3,22 +3,26 @@
 测试SceneParser的功能。
 """
 
+import dataclasses
+import io
+import pickle
 import pytest
-import tempfile
+import sys
+import yaml
 from pathlib import Path
 from typing import Dict, List
 
-from src.parsers.scene_parser import SceneParser, create_scene_parser, SceneInfo, PrefabInstanceInfo
+from src.parsers.scene_parser import (
+    SceneParser, create_scene_parser, load_scene_documents, select_documents, split_documents,
+    SceneInfo, PrefabInstanceInfo
+)
+from src.parsers import base_parser
 from src.parsers.base_parser import ParseResultType
+from src.parsers.prefab_parser import GameObjectInfo
 
 
-class TestSceneParser:
-    """SceneParser测试类"""
-    
-    @pytest.fixture
-    def sample_scene_content(self):
-        """示例Scene文件内容"""
-        return '''%YAML 1.1
+# 示例Scene文件内容
+SAMPLE_SCENE_CONTENT = '''%YAML 1.1
 %TAG !u! tag:unity3d.com,2011:
 --- !u!29 &1
 OcclusionCullingSettings:
@@ -240,16 +244,33 @@ PrefabInstance:
       objectReference: {fileID: 0}
   m_SourcePrefab: {fileID: 100100000, guid: fedcba0987654321fedcba0987654321, type: 3}
 '''
+
+
+@pytest.fixture(scope="session")
+def sample_scene_bytes():
+    """示例Scene文件的字节内容，整个测试会话共享"""
+    return SAMPLE_SCENE_CONTENT.encode('utf-8')
+
+
+def parse_bytes(parser: SceneParser, data: bytes):
+    """在内存中解析Scene内容，不创建临时文件"""
+    return parser.parse_stream(io.BytesIO(data))
+
+
+class TestSceneParser:
+    """SceneParser测试类"""
     
     @pytest.fixture
-    def temp_scene_file(self, sample_scene_content):
-        """创建临时Scene文件"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.scene', delete=False) as f:
-            f.write(sample_scene_content)
-            temp_path = Path(f.name)
-        
-        yield temp_path
-        temp_path.unlink(missing_ok=True)
+    def sample_scene_content(self):
+        """示例Scene文件内容"""
+        return SAMPLE_SCENE_CONTENT
+    
+    @pytest.fixture
+    def temp_scene_file(self, tmp_path, sample_scene_bytes):
+        """在测试临时目录中创建Scene文件"""
+        temp_path = tmp_path / "test.scene"
+        temp_path.write_bytes(sample_scene_bytes)
+        return temp_path
     
     def test_parser_initialization(self):
         """测试解析器初始化"""
@@ -259,6 +280,9 @@ PrefabInstance:
         
         strict_parser = SceneParser(strict_mode=True)
         assert strict_parser.strict_mode
+        
+        # 正则表达式在模块导入时编译，解析器实例共享
+        assert parser.reference_pattern is strict_parser.reference_pattern
     
     def test_can_parse(self):
         """测试文件类型识别"""
@@ -272,6 +296,9 @@ PrefabInstance:
         assert not parser.can_parse(Path("test.prefab"))
         assert not parser.can_parse(Path("test.meta"))
         assert not parser.can_parse(Path("test.txt"))
+        
+        # 扩展名不区分大小写
+        assert parser.can_parse(Path("Level.UNITY"))
     
     def test_supported_extensions(self):
         """测试支持的扩展名"""
@@ -282,11 +309,12 @@ PrefabInstance:
         assert '.scene' in extensions
         assert '.unity' in extensions
         assert len(extensions) == 2
+        assert extensions == sorted(SceneParser.SUPPORTED_EXTENSIONS)
     
-    def test_parse_valid_scene(self, temp_scene_file):
+    def test_parse_valid_scene(self, sample_scene_bytes):
         """测试解析有效的Scene文件"""
         parser = SceneParser()
-        result = parser.parse(temp_scene_file)
+        result = parse_bytes(parser, sample_scene_bytes)
         
         # 验证解析结果
         assert result.is_success
@@ -342,6 +370,238 @@ PrefabInstance:
         assert stats['total_prefab_instances'] >= 1
         assert stats['total_references'] >= 0
     
+    def test_load_scene_documents(self):
+        """测试事件流解析只保留需要的字段，并处理stripped文档头"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &100
+GameObject:
+  m_Name: Inactive
+  m_LocalRotation: {x: 0, y: 0, z: 0, w: 1}
+  m_IsActive: 0
+--- !u!4 &-200 stripped
+Transform:
+  m_CorrespondingSourceObject: {fileID: 400, guid: abcdef1234567890abcdef1234567890, type: 3}
+  m_Father: {fileID: 0}
+"""
+        documents = load_scene_documents(content)
+        
+        assert documents == [
+            {
+                '_unity_class_id': '1',
+                '_unity_file_id': '100',
+                '_unity_type': 'GameObject',
+                'm_Name': 'Inactive',
+                'm_IsActive': '0',
+            },
+            {
+                '_unity_class_id': '4',
+                '_unity_file_id': '-200',
+                '_unity_type': 'Transform',
+                'm_Father': {'fileID': '0'},
+            },
+        ]
+        
+        game_objects = SceneParser()._extract_scene_objects(documents)[1]
+        assert game_objects[0].active is False
+    
+    def test_load_scene_documents_complex_values(self):
+        """测试引号标量、多行标量和嵌套流式映射，文档顺序保持不变"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &1
+GameObject:
+  m_Name: 'Quoted: name'
+--- !u!1 &2
+GameObject:
+  m_Name: Simple
+  m_Component:
+  - component: {fileID: 3}
+  m_Children: []
+--- !u!1 &4
+GameObject:
+  m_Name: multi
+    line
+--- !u!4 &5
+Transform:
+  m_Father: {fileID: {nested: 1}}
+"""
+        documents = load_scene_documents(content)
+        
+        assert [doc['_unity_file_id'] for doc in documents] == ['1', '2', '4', '5']
+        assert documents[0]['m_Name'] == 'Quoted: name'
+        assert documents[1]['m_Component'] == [{'component': {'fileID': '3'}}]
+        assert documents[1]['m_Children'] == []
+        assert documents[2]['m_Name'] == 'multi line'
+        assert documents[3]['m_Father'] == {'fileID': {'nested': '1'}}
+    
+    def test_load_scene_documents_trailing_space_value(self):
+        """测试值为空、只带行尾空格的字段（如m_EditorClassIdentifier）不会吞掉下一行"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!114 &6
+MonoBehaviour:
+  m_GameObject: {fileID: 1}
+  m_Script: {fileID: 11500000, guid: 0123456789abcdef0123456789abcdef, type: 3}
+  m_Name: 
+  m_EditorClassIdentifier: 
+  speed: 3
+"""
+        document, = load_scene_documents(content)
+        
+        assert document['m_Name'] is None
+        assert document['m_Script']['guid'] == '0123456789abcdef0123456789abcdef'
+    
+    def test_load_scene_documents_rejects_malformed_skipped_field(self):
+        """测试不需要的字段中的非法内容同样抛出YAMLError"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &1
+GameObject:
+  m_Name: Simple
+  speed: [1, 2
+"""
+        with pytest.raises(yaml.YAMLError):
+            load_scene_documents(content)
+    
+    def test_scalars_not_coerced(self):
+        """测试标量保持字符串，不经过resolver/constructor的类型转换"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!1 &1234567890
+GameObject:
+  m_Name: true
+  m_Layer: 0
+  m_TagString: null
+  m_IsActive: 1
+  m_Component: []
+  m_BuildIndex:
+"""
+        document, = load_scene_documents(content)
+        
+        assert document['_unity_file_id'] == '1234567890'
+        assert document['m_Name'] == 'true'
+        assert document['m_Layer'] == '0'
+        assert document['m_TagString'] == 'null'
+        assert document['m_BuildIndex'] is None
+        
+        # 只有需要数值的字段在构建GameObject时转换
+        game_object, = SceneParser()._extract_scene_objects([document])[1]
+        assert game_object.layer == 0
+        assert game_object.active is True
+        assert game_object.file_id == '1234567890'
+    
+    def test_repeated_strings_interned(self):
+        """测试重复出现的短字符串共享同一个对象"""
+        content = """%YAML 1.1
+%TAG !u! tag:unity3d.com,2011:
+--- !u!4 &1
+Transform:
+  m_Father: {fileID: 0}
+--- !u!4 &2
+Transform:
+  m_Father: {fileID: 0}
+--- !u!4 &3
+Transform:
+  m_Father: {fileID: '0'}
+"""
+        first, second, third = load_scene_documents(content)
+        assert first['_unity_type'] is second['_unity_type'] is third['_unity_type']
+        assert first['m_Father']['fileID'] is second['m_Father']['fileID'] is third['m_Father']['fileID']
+    
+    def test_select_documents(self, sample_scene_content):
+        """测试解析前丢弃用不到的设置文档"""
+        class_ids = [class_id for class_id, _, _ in split_documents(sample_scene_content)]
+        assert class_ids == ['29', '104', '157', '196', '1', '4', '108', '1001']
+        
+        selected = select_documents(sample_scene_content, frozenset({'1', '1001'}))
+        assert selected.startswith('%YAML 1.1\n%TAG !u! tag:unity3d.com,2011:\n--- !u!1 &1234567890\n')
+        assert [class_id for class_id, _, _ in split_documents(selected)] == ['1', '1001']
+        assert 'RenderSettings' not in selected
+        
+        # 严格模式下存在无法识别的文档时不做过滤
+        irregular = sample_scene_content + '--- &5\nplain: 1\n'
+        assert select_documents(irregular, frozenset({'1'}), strict=True) == irregular
+        assert select_documents(irregular, frozenset({'1'})) != irregular
+    
+    def test_parse_cache(self, temp_scene_file, sample_scene_content, monkeypatch):
+        """测试未修改的Scene文件命中解析缓存，修改后重新解析"""
+        parser = SceneParser()
+        parses = []
+        parse_from_bytes = parser._parse_from_bytes
+        monkeypatch.setattr(
+            parser, "_parse_from_bytes",
+            lambda data, source: parses.append(source) or parse_from_bytes(data, source)
+        )
+        
+        first = parser.parse(temp_scene_file)
+        assert first.is_success
+        assert parser.parse(temp_scene_file) == first
+        assert len(parses) == 1
+        
+        # 对象列表是元组，结果可以pickle传回主进程
+        assert isinstance(first.data['game_objects'], tuple)
+        assert pickle.loads(pickle.dumps(first)).data == first.data
+        assert parser.parse(temp_scene_file, use_cache=False) == first
+        assert len(parses) == 2
+        
+        parser.clear_cache()
+        parser.parse(temp_scene_file)
+        assert len(parses) == 3
+        
+        temp_scene_file.write_text(sample_scene_content.split('--- !u!1001')[0])
+        updated = parser.parse(temp_scene_file)
+        assert updated.data['statistics']['total_prefab_instances'] == 0
+    
+    def test_parse_cache_isolated_from_mutation(self, temp_scene_file):
+        """测试修改缓存命中返回的结果不会泄漏到下一次解析"""
+        parser = SceneParser()
+        first = parser.parse(temp_scene_file)
+        expected = pickle.loads(pickle.dumps(first))
+        
+        first.data['statistics']['total_objects'] = -1
+        first.data['game_objects'][0]['name'] = 'Mutated'
+        first.add_warning('调用方添加的警告')
+        
+        second = parser.parse(temp_scene_file)
+        assert second == expected
+        
+        second.data['statistics']['total_objects'] = -1
+        second.data['game_objects'][0]['name'] = 'Mutated'
+        second.add_warning('调用方添加的警告')
+        assert parser.parse(temp_scene_file) == expected
+    
+    def test_parse_bytes(self, sample_scene_bytes):
+        """测试直接解析字节内容，不经过路径验证和文件读取"""
+        parser = SceneParser()
+        
+        result = parser.parse_bytes(sample_scene_bytes, source="Assets/Main.unity")
+        assert result.is_success
+        assert result.file_path == "Assets/Main.unity"
+        assert result.data['statistics']['total_prefab_instances'] == 1
+        
+        # 支持memoryview等字节缓冲区，结果与BytesIO入口一致
+        view_result = parser.parse_bytes(memoryview(sample_scene_bytes))
+        assert view_result.file_path == "<bytes>"
+        assert view_result.data == parse_bytes(parser, sample_scene_bytes).data
+        
+        assert parser.parse_bytes(b"\xff\x00\x01").is_failed
+    
+    def test_parse_crlf_scene(self, tmp_path, sample_scene_bytes):
+        """测试Windows换行（\\r\\n）的Scene文件与\\n换行的解析结果一致"""
+        parser = SceneParser()
+        expected = parse_bytes(parser, sample_scene_bytes).data
+        crlf_bytes = sample_scene_bytes.replace(b"\n", b"\r\n")
+        
+        crlf_path = tmp_path / "crlf.unity"
+        crlf_path.write_bytes(crlf_bytes)
+        file_result = parser.parse(crlf_path)
+        assert file_result.is_success
+        assert file_result.data == expected
+        
+        assert parse_bytes(parser, crlf_bytes).data == expected
+        assert parser.parse_stream(io.StringIO(crlf_bytes.decode("utf-8"))).data == expected
+    
     def test_parse_nonexistent_file(self):
         """测试解析不存在的文件"""
         parser = SceneParser()
@@ -352,20 +612,17 @@ PrefabInstance:
     
     def test_parse_invalid_scene(self):
         """测试解析无效的Scene文件"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.scene', delete=False) as f:
-            f.write("Invalid YAML content {")
-            temp_path = Path(f.name)
-        
-        try:
-            parser = SceneParser()
-            result = parser.parse(temp_path)
-            
-            # 应该失败但不抛出异常
-            assert result.is_failed
-            assert result.error_message is not None
-            
-        finally:
-            temp_path.unlink(missing_ok=True)
+        parser = SceneParser()
+        result = parse_bytes(parser, b"Invalid YAML content {")
+        
+        # 应该失败但不抛出异常
+        assert result.is_failed
+        assert result.error_message is not None
+        
+        # 文件头嗅探直接排除二进制内容
+        result = parse_bytes(parser, b"\x00\x01\x02")
+        assert result.is_failed
+        assert "不是YAML格式" in result.error_message
     
     def test_extract_prefab_dependencies(self, temp_scene_file):
         """测试提取Prefab依赖"""
@@ -378,6 +635,50 @@ PrefabInstance:
         # 确保没有包含全零GUID
         assert '00000000000000000000000000000000' not in prefab_guids
     
+    def test_extract_prefab_dependencies_without_full_parse(self, tmp_path):
+        """测试只提取m_SourcePrefab的GUID，不依赖完整的YAML解析"""
+        content = (
+            "--- !u!23 &1\n"
+            "MeshRenderer:\n"
+            "  m_Materials:\n"
+            "  - {fileID: 2100000, guid: abcdef1234567890abcdef1234567890, type: 2}\n"
+            "--- !u!1001 &2\n"
+            "PrefabInstance:\n"
+            "  m_SourcePrefab: {fileID: 100100000, guid: fedcba0987654321fedcba0987654321, type: 3}\n"
+            "--- !u!1001 &3\n"
+            "PrefabInstance:\n"
+            "  m_SourcePrefab: {fileID: 0, guid: 00000000000000000000000000000000, type: 0}\n"
+            "  broken: {\n"
+        )
+        temp_path = tmp_path / "deps.unity"
+        temp_path.write_text(content)
+        
+        parser = SceneParser()
+        assert parser.extract_prefab_dependencies(temp_path) == ['fedcba0987654321fedcba0987654321']
+        
+        empty_path = tmp_path / "empty.unity"
+        empty_path.touch()
+        assert parser.extract_prefab_dependencies(empty_path) == []
+    
+    def test_info_dataclasses_frozen(self):
+        """测试SceneInfo和PrefabInstanceInfo为不可变的slots数据类"""
+        instance = PrefabInstanceInfo(file_id='1', prefab_asset_guid='a' * 32)
+        assert instance.modifications == []
+        assert not hasattr(instance, '__dict__')
+        assert instance.to_dict() == {
+            'file_id': '1',
+            'prefab_asset_guid': 'a' * 32,
+            'source_prefab': None,
+            'modifications': [],
+        }
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            instance.file_id = '2'
+        
+        scene_info = SceneInfo(name='Main')
+        assert scene_info.to_dict()['build_index'] == -1
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            scene_info.name = 'Other'
+    
     def test_create_scene_parser_function(self):
         """测试便捷创建函数"""
         # 默认模式
@@ -390,26 +691,92 @@ PrefabInstance:
         assert isinstance(strict_parser, SceneParser)
         assert strict_parser.strict_mode
     
-    def test_batch_parsing(self, temp_scene_file):
+    def test_batch_parsing(self, temp_scene_file, tmp_path):
         """测试批量解析"""
         parser = SceneParser()
         
         # 创建另一个临时文件
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.scene', delete=False) as f:
-            f.write("%YAML 1.1\n--- !u!1 &123\nGameObject:\n  m_Name: SimpleScene")
-            temp_path2 = Path(f.name)
-        
-        try:
-            results = parser.parse_batch([temp_scene_file, temp_path2])
-            
-            assert len(results) == 2
-            assert all(isinstance(result.file_path, str) for result in results)
-            
-            # 第一个文件应该成功解析
-            assert results[0].is_success
-            
-        finally:
-            temp_path2.unlink(missing_ok=True)
+        temp_path2 = tmp_path / "simple.scene"
+        temp_path2.write_bytes(b"%YAML 1.1\n--- !u!1 &123\nGameObject:\n  m_Name: SimpleScene")
+        
+        results = parser.parse_batch([temp_scene_file, temp_path2])
+        
+        assert len(results) == 2
+        assert all(isinstance(result.file_path, str) for result in results)
+        
+        # 结果顺序与输入一致
+        assert [result.file_path for result in results] == [str(temp_scene_file), str(temp_path2)]
+        
+        # 第一个文件应该成功解析
+        assert results[0].is_success
+    
+    def test_batch_parsing_small_files_stay_serial(self, temp_scene_file, tmp_path, monkeypatch):
+        """测试未命中缓存的文件合计太小时不启动进程池"""
+        temp_path2 = tmp_path / "copy.unity"
+        temp_path2.write_bytes(temp_scene_file.read_bytes())
+        
+        def fail_pool(*args, **kwargs):
+            raise AssertionError("小文件不应启动进程池")
+        
+        monkeypatch.setattr(base_parser, "ProcessPoolExecutor", fail_pool)
+        results = SceneParser().parse_batch([temp_scene_file, temp_path2])
+        assert all(result.is_success for result in results)
+    
+    def test_batch_parsing_single_miss_stays_serial(self, temp_scene_file, tmp_path, monkeypatch):
+        """测试只有一个文件未命中缓存时不启动进程池，即使文件足够大"""
+        parser = SceneParser()
+        parser.PARALLEL_BATCH_MIN_BYTES = 0
+        temp_path2 = tmp_path / "copy.unity"
+        temp_path2.write_bytes(temp_scene_file.read_bytes())
+        parser.parse(temp_scene_file)
+        
+        def fail_pool(*args, **kwargs):
+            raise AssertionError("单个文件不应启动进程池")
+        
+        monkeypatch.setattr(base_parser, "ProcessPoolExecutor", fail_pool)
+        assert all(result.is_success for result in parser.parse_batch([temp_path2]))
+        assert all(result.is_success for result in parser.parse_batch([temp_scene_file, temp_path2]))
+    
+    def test_batch_parsing_strict_mode_stays_serial(self, temp_scene_file, tmp_path, monkeypatch):
+        """测试严格模式的解析器不启动进程池"""
+        parser = SceneParser(strict_mode=True)
+        parser.PARALLEL_BATCH_MIN_BYTES = 0
+        temp_path2 = tmp_path / "copy.unity"
+        temp_path2.write_bytes(temp_scene_file.read_bytes())
+        
+        def fail_pool(*args, **kwargs):
+            raise AssertionError("严格模式不应启动进程池")
+        
+        monkeypatch.setattr(base_parser, "ProcessPoolExecutor", fail_pool)
+        results = parser.parse_batch([temp_scene_file, temp_path2])
+        assert all(result.is_success for result in results)
+        results = parser.parse_batch([temp_scene_file, temp_path2], strict=False, parallel=True)
+        assert all(result.is_success for result in results)
+    
+    def test_batch_parsing_parallel_uses_cache(self, temp_scene_file, tmp_path, monkeypatch):
+        """测试进程池只解析未命中缓存的文件，结果写回当前进程的缓存"""
+        parser = SceneParser()
+        parser.PARALLEL_BATCH_MIN_BYTES = 0
+        temp_path2 = tmp_path / "copy.unity"
+        temp_path2.write_bytes(temp_scene_file.read_bytes())
+        temp_path3 = tmp_path / "third.unity"
+        temp_path3.write_bytes(temp_scene_file.read_bytes())
+        paths = [temp_scene_file, temp_path2, temp_path3]
+        
+        # 第一个文件已在缓存中，只有两个未命中的文件交给进程池
+        parser.parse(temp_scene_file)
+        first = parser.parse_batch(paths)
+        assert [result.file_path for result in first] == [str(path) for path in paths]
+        assert all(result.is_success for result in first)
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("缓存命中时不应重新解析")
+        
+        monkeypatch.setattr(base_parser, "ProcessPoolExecutor", fail)
+        monkeypatch.setattr(parser, "_parse_from_bytes", fail)
+        again = parser.parse_batch(paths)
+        assert again == first
+        assert parser.parse(temp_path3) == first[2]
     
     def test_complex_scene_hierarchy(self):
         """测试复杂场景层次结构解析"""
@@ -466,46 +833,87 @@ PrefabInstance:
   m_SourcePrefab: {fileID: 100100000, guid: abcdef1234567890abcdef1234567890, type: 3}
 '''
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.scene', delete=False) as f:
-            f.write(complex_content)
-            temp_path = Path(f.name)
-        
-        try:
-            parser = SceneParser()
-            result = parser.parse(temp_path)
-            
-            assert result.is_success
-            data = result.data
-            
-            # 验证GameObject数量
-            stats = data['statistics']
-            assert stats['total_objects'] == 3
-            assert stats['total_prefab_instances'] == 1
-            
-            # 验证场景层次结构
-            hierarchy = data['scene_hierarchy']
-            assert 'root_objects' in hierarchy
-            assert 'max_depth' in hierarchy
-            assert 'prefab_guids' in hierarchy
-            
-            # 验证Prefab GUID
-            prefab_guids = hierarchy['prefab_guids']
-            assert 'abcdef1234567890abcdef1234567890' in prefab_guids
-            
-            # 验证组件引用
-            component_refs = data['component_references']
-            assert len(component_refs) > 0
-            
-            # 应该有父子关系
-            parent_relations = [
-                ref for ref in component_refs 
-                if isinstance(ref, dict) and ref.get('relationship') == 'parent'
-            ]
-            
-            assert len(parent_relations) >= 2  # Camera和Lighting都有父对象
-            
-        finally:
-            temp_path.unlink(missing_ok=True)
+        parser = SceneParser()
+        result = parse_bytes(parser, complex_content.encode('utf-8'))
+        
+        assert result.is_success
+        data = result.data
+        
+        # 验证GameObject数量
+        stats = data['statistics']
+        assert stats['total_objects'] == 3
+        assert stats['total_prefab_instances'] == 1
+        
+        # 验证场景层次结构
+        hierarchy = data['scene_hierarchy']
+        assert 'root_objects' in hierarchy
+        assert 'max_depth' in hierarchy
+        assert 'prefab_guids' in hierarchy
+        
+        # 验证Prefab GUID
+        prefab_guids = hierarchy['prefab_guids']
+        assert 'abcdef1234567890abcdef1234567890' in prefab_guids
+        
+        # 验证组件引用
+        component_refs = data['component_references']
+        assert len(component_refs) > 0
+        
+        # 应该有父子关系
+        parent_relations = [
+            ref for ref in component_refs 
+            if isinstance(ref, dict) and ref.get('relationship') == 'parent'
+        ]
+        
+        assert len(parent_relations) >= 2  # Camera和Lighting都有父对象
+    
+    def test_extract_scene_objects_single_pass(self, sample_scene_content):
+        """测试一次遍历同时提取场景信息、GameObject、Prefab实例和组件引用"""
+        parser = SceneParser()
+        documents = load_scene_documents(sample_scene_content)
+        
+        scene_info, game_objects, prefab_instances, component_refs = \
+            parser._extract_scene_objects(documents)
+        
+        # 示例场景没有SceneSettings文档
+        assert scene_info == SceneInfo(name="Unknown Scene")
+        
+        game_object, = game_objects
+        assert game_object.file_id == '1234567890'
+        assert game_object.name == 'TestSceneObject'
+        assert game_object.components == [
+            {'component': {'fileID': '1234567891'}},
+            {'component': {'fileID': '1234567892'}},
+        ]
+        
+        prefab_instance, = prefab_instances
+        assert prefab_instance.file_id == '1234567893'
+        assert prefab_instance.prefab_asset_guid == 'fedcba0987654321fedcba0987654321'
+        assert len(prefab_instance.modifications) == 2
+        
+        assert component_refs == [{
+            'source_file_id': '1234567891',
+            'target_file_id': '0',
+            'relationship': 'parent',
+            'component_type': 'Transform'
+        }]
+    
+    def test_deep_scene_hierarchy(self):
+        """测试深层级场景按层遍历计算深度，不受递归深度限制"""
+        count = sys.getrecursionlimit() * 2
+        game_objects = [
+            GameObjectInfo(
+                file_id=str(index), name=f"Node{index}", components=[],
+                children=[str(index + 1)] if index + 1 < count else []
+            )
+            for index in range(count)
+        ]
+        # 循环引用不会导致死循环
+        game_objects[-1].children.append('1')
+        
+        hierarchy = SceneParser()._build_scene_hierarchy(game_objects, [])
+        
+        assert hierarchy['root_objects'] == ['0']
+        assert hierarchy['max_depth'] == count
     
     def test_get_scene_objects_by_type(self, temp_scene_file):
         """测试按类型获取场景对象"""
@@ -535,19 +943,11 @@ GameObject:
   m_IsActive: 1
 '''
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.unity', delete=False) as f:
-            f.write(unity_content)
-            temp_path = Path(f.name)
-        
-        try:
-            parser = SceneParser()
-            
-            # 应该能识别.unity文件
-            assert parser.can_parse(temp_path)
-            
-            # 应该能解析.unity文件
-            result = parser.parse(temp_path)
-            assert result.is_success or result.is_failed  # 至少不会抛出异常
-            
-        finally:
-            temp_path.unlink(missing_ok=True)
+        parser = SceneParser()
+        
+        # 应该能识别.unity文件
+        assert parser.can_parse(Path("level.unity"))
+        
+        # 应该能解析.unity文件
+        result = parse_bytes(parser, unity_content.encode('utf-8'))
+        assert result.is_success or result.is_failed  # 至少不会抛出异常